@@ -1,13 +1,10 @@
-from functools import lru_cache
-
-
 from django_filters import rest_framework as filters
 from django.utils.translation import gettext_lazy as _
 
-from shapely.wkt import loads
 from shapely.geometry import Point
 
 from farm_management.models import FarmParcel
+from farm_management.spatial_index import parcel_spatial_index
 from farm_activities.models import (
     FarmCalendarActivity,
     Alert,
@@ -27,17 +24,6 @@ from farm_activities.models import (
 )
 
 
-@lru_cache(maxsize=10)
-def is_point_in_geometry(geometry_wkt, point):
-    """Check if point is contained in geometry WKT"""
-    if not geometry_wkt:
-        return False
-    try:
-        return loads(geometry_wkt).contains(point)
-    except:
-        return False
-
-
 class FarmParcelFilter(filters.FilterSet):
     contains_point = filters.CharFilter(
         label=_("Contains point (lat,lon)"),
@@ -58,14 +44,7 @@ class FarmParcelFilter(filters.FilterSet):
         try:
             lat, lon  = map(float, value.split(','))
             point = Point(lon, lat)
-
-            query_set_values = queryset.values_list('id', 'geometry')
-
-            matching_ids = [
-                parcel_id for parcel_id, geometry in query_set_values
-                if is_point_in_geometry(geometry, point)
-            ]
-
+            matching_ids = parcel_spatial_index.get_parcel_ids_containing(point)
             return queryset.filter(id__in=matching_ids)
 
         except (ValueError, TypeError, AttributeError):
@@ -102,37 +81,44 @@ class CropProtectionOperationFilter(BaseCalendarActivityFilter):
         model = CropProtectionOperation
         fields = ['title', 'activity_type', 'parcel', 'responsible_agent']
 
-class ObservationFilter(BaseCalendarActivityFilter):
+class BaseObservationFilter(BaseCalendarActivityFilter):
+    # on the numeric value of the observations, so those whose value is not a number never match
+    value__gt = filters.NumberFilter(field_name='numeric_value', lookup_expr='gt')
+    value__gte = filters.NumberFilter(field_name='numeric_value', lookup_expr='gte')
+    value__lt = filters.NumberFilter(field_name='numeric_value', lookup_expr='lt')
+    value__lte = filters.NumberFilter(field_name='numeric_value', lookup_expr='lte')
+
+class ObservationFilter(BaseObservationFilter):
     class Meta(BaseCalendarActivityFilter.Meta):
         model = Observation
         fields = ['title', 'activity_type', 'parcel']
 
-class CropStressIndicatorObservationFilter(BaseCalendarActivityFilter):
+class CropStressIndicatorObservationFilter(BaseObservationFilter):
     class Meta(BaseCalendarActivityFilter.Meta):
         model = CropStressIndicatorObservation
         fields = ['title', 'activity_type', 'parcel', 'responsible_agent']
 
-class CropGrowthStageObservationFilter(BaseCalendarActivityFilter):
+class CropGrowthStageObservationFilter(BaseObservationFilter):
     class Meta(BaseCalendarActivityFilter.Meta):
         model = CropGrowthStageObservation
         fields = ['title', 'activity_type', 'parcel', 'responsible_agent']
 
-class YieldPredictionObservationFilter(BaseCalendarActivityFilter):
+class YieldPredictionObservationFilter(BaseObservationFilter):
     class Meta(BaseCalendarActivityFilter.Meta):
         model = YieldPredictionObservation
         fields = ['title', 'activity_type', 'parcel']
 
-class DiseaseDetectionObservationFilter(BaseCalendarActivityFilter):
+class DiseaseDetectionObservationFilter(BaseObservationFilter):
     class Meta(BaseCalendarActivityFilter.Meta):
         model = DiseaseDetectionObservation
         fields = ['title', 'activity_type', 'parcel']
 
-class VigorEstimationObservationFilter(BaseCalendarActivityFilter):
+class VigorEstimationObservationFilter(BaseObservationFilter):
     class Meta(BaseCalendarActivityFilter.Meta):
         model = VigorEstimationObservation
         fields = ['title', 'activity_type', 'parcel']
 
-class SprayingRecommendationObservationFilter(BaseCalendarActivityFilter):
+class SprayingRecommendationObservationFilter(BaseObservationFilter):
     class Meta(BaseCalendarActivityFilter.Meta):
         model = SprayingRecommendationObservation
         fields = ['title', 'activity_type', 'parcel']
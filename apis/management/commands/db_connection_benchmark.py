@@ -0,0 +1,69 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connection
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apis.views import FarmParcelViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the latency of a small API GET (listing the farm parcels) with a new database "
+        "connection per request (CONN_MAX_AGE=0) and with the configured persistent connections."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Number of requests per run.')
+
+    def run_requests(self, count, conn_max_age):
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+        view = FarmParcelViewSet.as_view({'get': 'list'})
+        factory = APIRequestFactory()
+        # not saved, only used to pass the permission checks
+        user = get_user_model()(username='benchmark')
+
+        latencies = []
+        for _ in range(count):
+            # a host that is always allowed, since the paginated response has absolute links
+            request = factory.get('/api/v1/FarmParcels/?page_size=1', HTTP_HOST='127.0.0.1')
+            force_authenticate(request, user=user)
+            start = time.perf_counter()
+            # the signals that open/close the connections, as done by the WSGI handler
+            request_started.send(sender=BaseHandler, environ=request.META)
+            response = view(request, version=settings.SHORT_API_VERSION)
+            response.render()
+            request_finished.send(sender=BaseHandler)
+            latencies.append(time.perf_counter() - start)
+        connection.close()
+        return latencies
+
+    def handle(self, *args, **options):
+        conn_max_age = settings.DATABASES['default']['CONN_MAX_AGE']
+        if not conn_max_age and conn_max_age is not None:
+            self.stdout.write(self.style.WARNING('CONN_MAX_AGE is 0, so both runs use a new connection per request'))
+
+        try:
+            count = options['requests']
+            # warm up (e.g., imports and caches)
+            self.run_requests(10, conn_max_age)
+            results = [
+                ('new connection', self.run_requests(count, 0)),
+                (f'CONN_MAX_AGE={conn_max_age}', self.run_requests(count, conn_max_age)),
+            ]
+        finally:
+            connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+
+        self.stdout.write(f'{count} requests of GET /api/v1/FarmParcels/?page_size=1 per run:')
+        medians = []
+        for label, latencies in results:
+            median = statistics.median(latencies) * 1000
+            medians.append(median)
+            self.stdout.write(f'  {label:<20} mean {statistics.mean(latencies) * 1000:7.2f} ms   median {median:7.2f} ms')
+        self.stdout.write(self.style.SUCCESS(f'Saved {medians[0] - medians[1]:.2f} ms per request (median)'))
@@ -0,0 +1,111 @@
+import datetime
+import decimal
+import json
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework import serializers
+
+from apis.schemas import generate_hashed_urn, generate_urn
+from apis.serializers import (
+    ObservationSerializer,
+    CropStressIndicatorObservationSerializer,
+    FertilizationOperationSerializer,
+    IrrigationOperationSerializer,
+)
+from farm_activities.models import Observation
+from farm_management.models import AgriculturalMachine
+
+
+def get_reference_representation(serializer, instance):
+    """
+    The JSON-LD representation built with DRF's generic `to_representation`,
+    as the activity serializers did before using their representation plan.
+    """
+    representation = serializers.ModelSerializer.to_representation(serializer, instance)
+    return {
+        '@type': serializer.json_ld_type,
+        '@id': generate_urn(instance.__class__.__name__, obj_id=representation.pop('id')),
+        **representation
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the serialization of in-memory activities (rows/sec) with the activity serializers "
+        "against DRF's generic serialization, checking that both outputs are the same."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Number of rows serialized per serializer.')
+        parser.add_argument('--repeat', type=int, default=2, help='Number of runs (the best one is reported).')
+
+    def build_instances(self, serializer_class, rows):
+        model = serializer_class.Meta.model
+        start = timezone.now()
+        activity_type_id = uuid.uuid4()
+        parcel_ids = [uuid.uuid4() for _ in range(10)]
+        instances = []
+        for i in range(rows):
+            activity_id = uuid.uuid4()
+            instance = model(
+                id=activity_id, activity_type_id=activity_type_id, parcel_id=parcel_ids[i % len(parcel_ids)],
+                title=f'Activity {i}', details='', start_datetime=start - datetime.timedelta(minutes=i),
+            )
+            if isinstance(instance, Observation):
+                instance.value = str(i % 40)
+                instance.value_unit = 'celsius'
+                instance.observed_property = 'temperature'
+                instance.sensor_id = f'sensor-{i % 5}'
+            else:
+                instance.applied_amount = decimal.Decimal(i % 100) / 4
+                instance.applied_amount_unit = 'litre'
+            if hasattr(instance, 'crop_id'):
+                instance.crop_id = parcel_ids[0]
+            # as if it was saved and its relations prefetched
+            instance.farmcalendaractivity_ptr_id = activity_id
+            if hasattr(instance, 'observation_ptr_id'):
+                instance.observation_ptr_id = activity_id
+            instance._prefetched_objects_cache = {'agricultural_machinery': AgriculturalMachine.objects.none()}
+            instances.append(instance)
+        return instances
+
+    def benchmark(self, label, serialize, instances, repeat):
+        # warm up (e.g., the related managers created on first use)
+        serialize(instances[:100])
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = serialize(instances)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        self.stdout.write(f'  {label:<10} {len(instances) / best:12.0f} rows/s')
+        return data, best
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        serializer_classes = [
+            ObservationSerializer,
+            CropStressIndicatorObservationSerializer,
+            FertilizationOperationSerializer,
+            IrrigationOperationSerializer,
+        ]
+        for serializer_class in serializer_classes:
+            instances = self.build_instances(serializer_class, rows)
+            self.stdout.write(f'{serializer_class.__name__} ({rows} rows):')
+            serializer = serializer_class()
+            reference_data, reference_time = self.benchmark(
+                'generic', lambda rows: [get_reference_representation(serializer, instance) for instance in rows],
+                instances, options['repeat'],
+            )
+            data, plan_time = self.benchmark(
+                'plan', lambda rows: serializer_class(rows, many=True).data, instances, options['repeat']
+            )
+            if json.dumps(data, default=str) != json.dumps(reference_data, default=str):
+                raise CommandError(f'{serializer_class.__name__} output is not the same as the generic one')
+            self.stdout.write(self.style.SUCCESS(f'  same output, {reference_time / plan_time:.1f}x faster'))
+
+        cache_info = generate_hashed_urn.cache_info()
+        self.stdout.write(f'Hashed URNs (e.g., of quantity values): {cache_info.hits} hits, {cache_info.misses} misses')
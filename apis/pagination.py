@@ -0,0 +1,167 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in keyset (cursor) pagination.
+
+    Requests that do not send a `cursor` nor a `page_size` query parameter are
+    left unpaginated, so existing clients still receive the whole list.
+    Otherwise the results are ordered by the view `keyset_ordering` (by default
+    `-start_datetime, -id`), and the `next` cursor encodes the ordering values of
+    the last returned row. Following pages are then fetched with a plain indexed
+    range condition on those values, instead of an OFFSET scan.
+    """
+    cursor_query_param = 'cursor'
+    cursor_query_description = _('The pagination cursor value.')
+    page_size_query_param = 'page_size'
+    page_size_query_description = _('Number of results to return per page.')
+    page_size = 100
+    max_page_size = 1000
+    ordering = ('-start_datetime', '-id')
+    invalid_cursor_message = _('Invalid cursor')
+
+    def is_paginated_request(self, request):
+        return (
+            self.cursor_query_param in request.query_params or
+            self.page_size_query_param in request.query_params
+        )
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, 'keyset_ordering', self.ordering))
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, values):
+        values = [v.isoformat() if hasattr(v, 'isoformat') else str(v) for v in values]
+        return base64.urlsafe_b64encode(json.dumps(values).encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+        except (TypeError, ValueError, binascii.Error, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering_fields):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def get_keyset_filter(self, values):
+        """
+        Builds the condition for rows strictly after `values` in the ordering, i.e.,
+        (a > x) OR (a = x AND b > y) ..., with the comparison reversed on descending fields.
+        """
+        keyset_filter = Q()
+        equal_filter = {}
+        for ordering_field, value in zip(self.ordering, values):
+            field_name = ordering_field.lstrip('-')
+            lookup = 'lt' if ordering_field.startswith('-') else 'gt'
+            keyset_filter |= Q(**equal_filter, **{f'{field_name}__{lookup}': value})
+            equal_filter[field_name] = value
+        return keyset_filter
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_paginated_request(request):
+            return None
+
+        self.request = request
+        self.ordering = self.get_ordering(view)
+        self.ordering_fields = [f.lstrip('-') for f in self.ordering]
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+
+        queryset = queryset.order_by(*self.ordering)
+        cursor_values = self.decode_cursor(request)
+        if cursor_values is not None:
+            try:
+                queryset = queryset.filter(self.get_keyset_filter(cursor_values))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last_item = self.page[-1]
+        cursor = self.encode_cursor([getattr(last_item, field) for field in self.ordering_fields])
+        url = replace_query_param(self.base_url, self.cursor_query_param, cursor)
+        return replace_query_param(url, self.page_size_query_param, self.page_size)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', None),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        # unpaginated requests still get the plain list back
+        return {
+            'oneOf': [
+                schema,
+                {
+                    'type': 'object',
+                    'required': ['results'],
+                    'properties': {
+                        'next': {
+                            'type': 'string',
+                            'nullable': True,
+                            'format': 'uri',
+                        },
+                        'previous': {
+                            'type': 'string',
+                            'nullable': True,
+                            'format': 'uri',
+                        },
+                        'results': schema,
+                    },
+                },
+            ],
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': str(self.cursor_query_description),
+                'schema': {
+                    'type': 'string',
+                },
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': str(self.page_size_query_description),
+                'schema': {
+                    'type': 'integer',
+                },
+            },
+        ]
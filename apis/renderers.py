@@ -43,4 +43,19 @@ class JSONLDRenderer(JSONRenderer):
                 "@context": ocsm_context,
                 "@graph": [data]  # Wrap single item in a list
             }
-        return super().render(context, accepted_media_type, renderer_context)
\ No newline at end of file
+        return super().render(context, accepted_media_type, renderer_context)
+
+    def render_stream(self, items, accepted_media_type=None, renderer_context=None):
+        """
+        Lazily renders an iterable of already serialized items as a JSON-LD
+        document, yielding each `@graph` element as soon as it is produced.
+        """
+        ocsm_context = settings.OCSM_JSONLD_CONTEXT['@context'].copy()
+        context_data = super().render(ocsm_context, accepted_media_type, renderer_context)
+        yield b'{"@context":' + context_data + b',"@graph":['
+
+        for index, item in enumerate(items):
+            item_data = super().render(item, accepted_media_type, renderer_context)
+            yield item_data if index == 0 else b',' + item_data
+
+        yield b']}'
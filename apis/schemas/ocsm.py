@@ -1,3 +1,8 @@
+import uuid
+from functools import lru_cache
+
+from django.conf import settings
+
 
 URN_BASE_NAMESPACE = 'urn:farmcalendar'
 
@@ -11,3 +16,14 @@ def generate_urn(*class_names, obj_id):
 
 
 OCSM_SCHEMA = {}
+
+
+@lru_cache(maxsize=settings.HASHED_URN_CACHE_SIZE)
+def generate_hashed_urn(class_name, name):
+    """
+    URN of an object without an id of its own (e.g., a quantity value, an address or a sensor),
+    identified by a (deterministic) UUID5 of the `name` derived from its values.
+    Memoized, since the same few values (units, sensors, species...) repeat across the rows of a list;
+    `generate_hashed_urn.cache_info()` has the hits and misses of the memo.
+    """
+    return generate_urn(class_name, obj_id=uuid.uuid5(uuid.NAMESPACE_DNS, name))
@@ -1,10 +1,16 @@
+import datetime
+from functools import lru_cache
+from operator import attrgetter
 from uuid import UUID
 
+from django.core.exceptions import FieldDoesNotExist
 from django.db.models.fields.related import ForeignKey, OneToOneField, ManyToManyField
+from django.utils.functional import cached_property
 
-from rest_framework.relations import PrimaryKeyRelatedField, PKOnlyObject
-from rest_framework.relations import PrimaryKeyRelatedField, PKOnlyObject
-from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PrimaryKeyRelatedField, PKOnlyObject, RelatedField, ManyRelatedField
+from rest_framework.settings import api_settings
+from rest_framework import serializers, ISO_8601
 
 from ..schemas import OCSM_SCHEMA, generate_urn_prefix
 
@@ -74,6 +80,9 @@ class URNRelatedField(PrimaryKeyRelatedField):
             class_names = ['{class_name}']
         self.class_name = class_names[0]
         self.urn_prefix = generate_urn_prefix(class_names)
+        # related instances already fetched by this field, as the same objects
+        # (e.g., activity type or parcel) are usually referenced by every item of a bulk request
+        self._related_instances = {}
         super().__init__(**kwargs)
 
     def to_representation(self, value):
@@ -119,7 +128,12 @@ class URNRelatedField(PrimaryKeyRelatedField):
             raise serializers.ValidationError("Invalid ID in URN.")
 
         # Fetch the related instance
-        return super().to_internal_value(raw_id)
+        if raw_id not in self._related_instances:
+            self._related_instances[raw_id] = self.get_related_instance(raw_id)
+        return self._related_instances[raw_id]
+
+    def get_related_instance(self, pk):
+        return super().to_internal_value(pk)
 
     def get_choices(self, cutoff=None):
         """
@@ -170,4 +184,200 @@ class JSONLDSerializer(serializers.ModelSerializer):
             return super().to_representation(instance)
         representation = self._prepare_represetation(instance)
         json_ld_representation = ClassSchema().dump(representation)
-        return json_ld_representation
\ No newline at end of file
+        return json_ld_representation
+
+
+def _get_relation_field(model, attr):
+    """
+    Returns the relation field of `model` reached through the `attr` attribute,
+    which can also be a reverse relation accessor (e.g., `something_set`).
+    """
+    try:
+        field = model._meta.get_field(attr)
+    except FieldDoesNotExist:
+        field = None
+        for candidate in model._meta.get_fields():
+            if candidate.auto_created and not candidate.concrete and candidate.get_accessor_name() == attr:
+                field = candidate
+                break
+    if field is None or not field.is_relation:
+        return None
+    return field
+
+
+def _get_relation_lookup(model, attrs):
+    """
+    Walks `attrs` from `model` for as long as they are relations, returning the
+    equivalent queryset lookup, and if any step in it is a *-to-many relation.
+    """
+    lookups = []
+    is_many = False
+    for attr in attrs:
+        field = _get_relation_field(model, attr)
+        if field is None:
+            break
+        lookups.append(attr)
+        is_many = is_many or field.many_to_many or field.one_to_many
+        model = field.related_model
+    return '__'.join(lookups), is_many
+
+
+def _collect_eager_loading_lookups(serializer, model, prefix_attrs, select_related, prefetch_related):
+    def add_lookup(attrs):
+        lookup, is_many = _get_relation_lookup(model, attrs)
+        if not lookup:
+            return
+        if is_many:
+            prefetch_related.add(lookup)
+        else:
+            select_related.add(lookup)
+
+    for extra_lookup in getattr(serializer, 'related_lookups', []):
+        add_lookup(prefix_attrs + extra_lookup.split('__'))
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+        attrs = prefix_attrs + field.source_attrs
+
+        if isinstance(field, serializers.ListSerializer):
+            add_lookup(attrs)
+            _collect_eager_loading_lookups(field.child, model, attrs, select_related, prefetch_related)
+        elif isinstance(field, serializers.BaseSerializer):
+            add_lookup(attrs)
+            _collect_eager_loading_lookups(field, model, attrs, select_related, prefetch_related)
+        elif isinstance(field, ManyRelatedField):
+            add_lookup(attrs)
+        elif isinstance(field, RelatedField) and field.use_pk_only_optimization():
+            # only the pk is used, and that is already in the row of the related object owner
+            add_lookup(attrs[:-1])
+        else:
+            add_lookup(attrs)
+
+
+@lru_cache(maxsize=None)
+def get_eager_loading_plan(serializer_class):
+    """
+    Computes which relations should be loaded with `select_related` and `prefetch_related`
+    for serializing a queryset of `serializer_class.Meta.model`, based on the relations
+    declared in the serializer fields (including the ones from nested serializers).
+    Field serializers that access relations in a custom `to_representation` should list
+    them (relative to their own source) in a `related_lookups` attribute.
+    """
+    select_related = set()
+    prefetch_related = set()
+    _collect_eager_loading_lookups(
+        serializer_class(), serializer_class.Meta.model, [], select_related, prefetch_related
+    )
+    return sorted(select_related), sorted(prefetch_related)
+
+
+def _get_identity(instance):
+    return instance
+
+
+def _get_datetime_to_representation(field):
+    """
+    Same as `field.to_representation` for aware datetimes in ISO 8601, but with
+    the field options (e.g., the current timezone) resolved only once.
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def to_representation(value):
+        if value.__class__ is not datetime.datetime or value.utcoffset() is None:
+            return field.to_representation(value)
+        try:
+            value = value.astimezone(field_timezone).isoformat()
+        except OverflowError:
+            return field.to_representation(value)
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return to_representation
+
+
+def _get_urn_to_representation(field):
+    urn_type = field.class_name
+    urn_prefix = field.urn_prefix
+
+    def to_representation(pk):
+        return {
+            "@type": urn_type,
+            "@id": f"{urn_prefix}:{pk}",
+        }
+    return to_representation
+
+
+def _get_field_plan(field, model):
+    """
+    Returns how to get the attribute of `field` from an instance of `model` and how to represent it,
+    using the cheapest equivalent of DRF's `field.get_attribute` and `field.to_representation`.
+    """
+    getter = field.get_attribute
+    to_representation = field.to_representation
+    model_field = None
+    if len(field.source_attrs) == 1:
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            pass
+    # only concrete fields, whose attributes are always there (unlike properties or reverse relations)
+    if model_field is not None and not model_field.concrete:
+        model_field = None
+
+    if not field.source_attrs:
+        getter = _get_identity
+    elif isinstance(field, RelatedField):
+        if model_field is not None and model_field.many_to_one and field.use_pk_only_optimization():
+            # the same as DRF's PKOnlyObject optimization, but reading the fk column value directly
+            getter = attrgetter(model_field.attname)
+            if type(field).to_representation is URNRelatedField.to_representation:
+                to_representation = _get_urn_to_representation(field)
+            else:
+                to_representation = lambda pk: field.to_representation(PKOnlyObject(pk=pk))
+    elif model_field is not None and not model_field.is_relation:
+        getter = attrgetter(model_field.attname)
+
+    if type(field) is serializers.CharField:
+        to_representation = str
+    elif type(field) is serializers.DateTimeField:
+        to_representation = _get_datetime_to_representation(field)
+    return field.field_name, getter, to_representation
+
+
+# Faster `to_representation` for (model) serializers that are used for many rows, with the same output.
+# The fields are read and represented following a plan (see `_get_field_plan`) made once per
+# serializer instance, that is, once for all the rows of a list, and can be added to an existing dict
+# (e.g., that starts with the JSON-LD '@type' and '@id') without building intermediate dicts.
+# The fields in `representation_plan_exclude` are left out (e.g., the id, when already in the '@id').
+# (not a docstring, since the schema would use it as the description of the serializers)
+class CompiledRepresentationMixin:
+    representation_plan_exclude = ()
+
+    @cached_property
+    def representation_plan(self):
+        model = self.Meta.model
+        return [
+            _get_field_plan(field, model) for field in self._readable_fields
+            if field.field_name not in self.representation_plan_exclude
+        ]
+
+    def add_fields_representation(self, instance, representation):
+        for field_name, getter, to_representation in self.representation_plan:
+            try:
+                attribute = getter(instance)
+            except SkipField:
+                continue
+
+            check_for_none = attribute.pk if attribute.__class__ is PKOnlyObject else attribute
+            if check_for_none is None:
+                representation[field_name] = None
+            else:
+                representation[field_name] = to_representation(attribute)
+        return representation
+
+    def to_representation(self, instance):
+        return self.add_fields_representation(instance, {})
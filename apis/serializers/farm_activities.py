@@ -1,11 +1,12 @@
-import uuid
+from functools import lru_cache
 
 from django.conf import settings
 from django.apps import apps
-from django.core.exceptions import ObjectDoesNotExist
-from django.urls import reverse
+from django.utils.functional import cached_property
 from rest_framework import serializers
 
+from farm_calendar.utils.url_templates import cached_reverse
+
 from farm_management.models import (
     Fertilizer,
     Pesticide,
@@ -15,6 +16,7 @@ from farm_management.models import (
     AgriculturalMachine
 )
 
+from farm_activities.cache import activity_type_cache
 from farm_activities.models import (
     FarmCalendarActivityType,
     FarmCalendarActivity,
@@ -34,8 +36,8 @@ from farm_activities.models import (
     CompostTurningOperation,
 )
 
-from .base import URNRelatedField, URNCharField
-from ..schemas import generate_urn
+from .base import CompiledRepresentationMixin, URNRelatedField, URNCharField
+from ..schemas import generate_hashed_urn, generate_urn, generate_urn_prefix
 
 
 def quantity_value_serializer_factory(unit_field, value_field):
@@ -52,9 +54,8 @@ def quantity_value_serializer_factory(unit_field, value_field):
                 str(getattr(instance, unit_field, '')),
                 str(getattr(instance, value_field, ''),)
             ])
-            hash_uuid = str(uuid.uuid5(uuid.NAMESPACE_DNS, uuid_orig_str))
             return {
-                '@id': generate_urn('QuantityValue',obj_id=hash_uuid),
+                '@id': generate_hashed_urn('QuantityValue', uuid_orig_str),
                 '@type': 'QuantityValue',
                 'unit': unit,
                 'hasValue': value,
@@ -68,6 +69,8 @@ def observation_ref_quantity_value_serializer_factory(unit_field, value_field):
         unit = serializers.CharField(allow_null=True, read_only=True, required=False)
         hasValue = serializers.CharField(allow_null=True, read_only=True, required=False)
 
+        related_lookups = ['observation']
+
 
         def to_representation(self, instance):
             instanced_observation = None
@@ -82,9 +85,8 @@ def observation_ref_quantity_value_serializer_factory(unit_field, value_field):
                 str(getattr(instanced_observation, unit_field, '')),
                 str(getattr(instanced_observation, value_field, ''),)
             ])
-            hash_uuid = str(uuid.uuid5(uuid.NAMESPACE_DNS, uuid_orig_str))
             return {
-                '@id': generate_urn('QuantityValue',obj_id=hash_uuid),
+                '@id': generate_hashed_urn('QuantityValue', uuid_orig_str),
                 '@type': 'QuantityValue',
                 'unit': unit,
                 'hasValue': value,
@@ -92,8 +94,37 @@ def observation_ref_quantity_value_serializer_factory(unit_field, value_field):
     return ObservationQuantityValueFieldSerializer
 
 
-class FarmCalendarActivitySerializer(serializers.ModelSerializer):
-    activityType = URNRelatedField(class_names=['FarmCalendarActivityType'], source='activity_type', queryset=FarmCalendarActivityType.objects.all())
+class FarmCalendarActivityTypeURNRelatedField(URNRelatedField):
+    """
+    Reads the activity types from the process-wide cache instead of querying them.
+    """
+
+    def get_related_instance(self, pk):
+        activity_type = activity_type_cache.get_by_id(pk)
+        if activity_type is None:
+            return super().get_related_instance(pk)
+        return activity_type
+
+
+class FarmCalendarActivityListSerializer(serializers.ListSerializer):
+    """
+    Creates all the (already validated) activities with a single bulk insert per table,
+    instead of saving them one by one.
+    """
+
+    def create(self, validated_data):
+        ModelClass = self.child.Meta.model
+        instances = [ModelClass(**self.child.get_create_attrs(attrs)) for attrs in validated_data]
+        return ModelClass.objects.bulk_create_activities(instances)
+
+
+@lru_cache(maxsize=None)
+def get_activity_urn_prefix(class_name):
+    return generate_urn_prefix([class_name])
+
+
+class FarmCalendarActivitySerializer(CompiledRepresentationMixin, serializers.ModelSerializer):
+    activityType = FarmCalendarActivityTypeURNRelatedField(class_names=['FarmCalendarActivityType'], source='activity_type', queryset=FarmCalendarActivityType.objects.all())
     hasStartDatetime = serializers.DateTimeField(source='start_datetime')
     hasEndDatetime = serializers.DateTimeField(source='end_datetime', allow_null=True, required=False)
 
@@ -116,6 +147,10 @@ class FarmCalendarActivitySerializer(serializers.ModelSerializer):
         required=False
     )
 
+    json_ld_type = 'FarmCalendarActivity'
+    # it is the '@id' instead
+    representation_plan_exclude = ('id',)
+
     class Meta:
         model = FarmCalendarActivity
         fields = [
@@ -127,16 +162,34 @@ class FarmCalendarActivitySerializer(serializers.ModelSerializer):
             'isPartOfActivity'
         ]
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
+    def get_create_attrs(self, validated_data):
+        """
+        Model attributes for creating a new instance from `validated_data`.
+        """
+        return validated_data
 
+    def to_representation(self, instance):
         json_ld_representation = {
-            '@type': 'FarmCalendarActivity',
-            '@id': generate_urn(instance.__class__.__name__, obj_id=representation.pop('id')),
-            **representation
+            '@type': self.json_ld_type,
+            '@id': f'{get_activity_urn_prefix(instance.__class__.__name__)}:{instance.id}',
         }
+        return self.add_fields_representation(instance, json_ld_representation)
 
-        return json_ld_representation
+
+@lru_cache(maxsize=None)
+def get_built_in_activity_type_model_names():
+    """
+    Maps the id of each built-in activity type to the model name of its built-in class.
+    """
+    model_names = {}
+    for activity_type in settings.DEFAULT_CALENDAR_ACTIVITY_TYPES.values():
+        built_in_class = activity_type.get('built_in_class')
+        if built_in_class is None:
+            continue
+        app_label, model_name = built_in_class.split('.')
+        built_in_model = apps.get_model(app_label=app_label, model_name=model_name)
+        model_names[str(activity_type['id'])] = built_in_model._meta.model_name
+    return model_names
 
 
 class FarmCalendarActivityTypeSerializer(serializers.ModelSerializer):
@@ -157,14 +210,10 @@ class FarmCalendarActivityTypeSerializer(serializers.ModelSerializer):
         ]
 
     def _get_reverse_for_built_in_activity(self, obj):
-        for key, val in settings.DEFAULT_CALENDAR_ACTIVITY_TYPES.items():
-            if str(obj.pk) == str(val['id']):
-                built_in_class = val.get('built_in_class')
-                app_label, model_name = built_in_class.split('.')
-                built_in_model = apps.get_model(app_label=app_label, model_name=model_name)
-                model_name = built_in_model._meta.model_name
-                return reverse(f'{model_name}-list', args=[settings.SHORT_API_VERSION])
-        return None
+        model_name = get_built_in_activity_type_model_names().get(str(obj.pk))
+        if model_name is None:
+            return None
+        return cached_reverse(f'{model_name}-list', args=[settings.SHORT_API_VERSION])
 
     def get_activity_endpoint(self, obj):
         built_in_reverse = self._get_reverse_for_built_in_activity(obj)
@@ -172,13 +221,13 @@ class FarmCalendarActivityTypeSerializer(serializers.ModelSerializer):
             return built_in_reverse
 
         if obj.category == FarmCalendarActivityType.ActivityCategoryChoices.ACTIVITY:
-            return reverse('farmcalendaractivity-list', args=[settings.SHORT_API_VERSION])
+            return cached_reverse('farmcalendaractivity-list', args=[settings.SHORT_API_VERSION])
         elif obj.category == FarmCalendarActivityType.ActivityCategoryChoices.OBSERVATION:
-            return reverse('observation-list', args=[settings.SHORT_API_VERSION])
+            return cached_reverse('observation-list', args=[settings.SHORT_API_VERSION])
         elif obj.category == FarmCalendarActivityType.ActivityCategoryChoices.ALERT:
-            return reverse('alert-list', args=[settings.SHORT_API_VERSION])
+            return cached_reverse('alert-list', args=[settings.SHORT_API_VERSION])
 
-        return reverse('farmcalendaractivity-list', args=[settings.SHORT_API_VERSION])
+        return cached_reverse('farmcalendaractivity-list', args=[settings.SHORT_API_VERSION])
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
@@ -202,9 +251,8 @@ class AppliedAmmountFieldSerializer(serializers.Serializer):
             str(getattr(instance, 'applied_amount_unit', '')),
             str(getattr(instance, 'applied_amount', ''),)
         ])
-        hash_uuid = str(uuid.uuid5(uuid.NAMESPACE_DNS, uuid_orig_str))
         return {
-            '@id': generate_urn('QuantityValue',obj_id=hash_uuid),
+            '@id': generate_hashed_urn('QuantityValue', uuid_orig_str),
             '@type': 'QuantityValue',
             'unit': instance.applied_amount_unit,
             'numericValue': instance.applied_amount,
@@ -227,6 +275,8 @@ class FertilizationOperationSerializer(GenericOperationSerializer):
         allow_null=True
     )
     hasApplicationMethod = serializers.CharField(source='application_method', allow_null=True)
+    json_ld_type = 'FertilizationOperation'
+
     class Meta:
         model = FertilizationOperation
 
@@ -240,13 +290,6 @@ class FertilizationOperationSerializer(GenericOperationSerializer):
             'isPartOfActivity',
         ]
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation.update({'@type': 'FertilizationOperation'})
-        json_ld_representation = representation
-
-        return json_ld_representation
-
 
 class IrrigationOperationSerializer(GenericOperationSerializer):
     usesIrrigationSystem = serializers.ChoiceField(
@@ -254,6 +297,8 @@ class IrrigationOperationSerializer(GenericOperationSerializer):
         source='irrigation_system'
     )
 
+    json_ld_type = 'IrrigationOperation'
+
     class Meta:
         model = IrrigationOperation
 
@@ -267,15 +312,6 @@ class IrrigationOperationSerializer(GenericOperationSerializer):
             'isPartOfActivity',
         ]
 
-
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation.update({'@type': 'IrrigationOperation'})
-        json_ld_representation = representation
-
-        return json_ld_representation
-
-
     def create(self, validated_data):
         if self.context['view'].kwargs.get('compost_operation_pk'):
             validated_data['parent_activity'] = CompostOperation.objects.get(pk=self.context['view'].kwargs.get('compost_operation_pk'))
@@ -290,6 +326,8 @@ class CropProtectionOperationSerializer(GenericOperationSerializer):
         source='pesticide',
         allow_null=True
     )
+    json_ld_type = 'CropProtectionOperation'
+
     class Meta:
         model = CropProtectionOperation
         fields = [
@@ -303,13 +341,6 @@ class CropProtectionOperationSerializer(GenericOperationSerializer):
         ]
 
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation.update({'@type': 'CropProtectionOperation'})
-        json_ld_representation = representation
-
-        return json_ld_representation
-
 
 class MadeBySensorFieldSerializer(serializers.Serializer):
     name = serializers.CharField(source='sensor_id', allow_null=True)
@@ -318,9 +349,8 @@ class MadeBySensorFieldSerializer(serializers.Serializer):
         uuid_orig_str = getattr(instance, 'sensor_id', '')
         if uuid_orig_str is None or uuid_orig_str == '':
             return {}
-        hash_uuid = str(uuid.uuid5(uuid.NAMESPACE_DNS, uuid_orig_str))
         return {
-            '@id': generate_urn('Sensor',obj_id=hash_uuid),
+            '@id': generate_hashed_urn('Sensor', uuid_orig_str),
             '@type': 'Sensor',
             'name': instance.sensor_id,
         }
@@ -331,6 +361,8 @@ class ObservationSerializer(FarmCalendarActivitySerializer):
     hasResult = quantity_value_serializer_factory('value_unit', 'value')(source='*')
     madeBySensor = MadeBySensorFieldSerializer(source='*', allow_null=True, required=False)
 
+    json_ld_type = 'Observation'
+
     class Meta:
         model = Observation
         fields = [
@@ -346,21 +378,23 @@ class ObservationSerializer(FarmCalendarActivitySerializer):
             'observedProperty',
             'isPartOfActivity',
         ]
+        list_serializer_class = FarmCalendarActivityListSerializer
 
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation.update({'@type': 'Observation'})
-        json_ld_representation = representation
-
-        return json_ld_representation
+    @cached_property
+    def compost_operation(self):
+        compost_operation_pk = self.context['view'].kwargs.get('compost_operation_pk')
+        if compost_operation_pk:
+            return CompostOperation.objects.get(pk=compost_operation_pk)
+        return None
 
+    def get_create_attrs(self, validated_data):
+        if self.compost_operation is not None:
+            validated_data['parent_activity'] = self.compost_operation
+        return validated_data
 
     def create(self, validated_data):
-        if self.context['view'].kwargs.get('compost_operation_pk'):
-            validated_data['parent_activity'] = CompostOperation.objects.get(pk=self.context['view'].kwargs.get('compost_operation_pk'))
-
-        return super().create(validated_data)
+        return super().create(self.get_create_attrs(validated_data))
 
 
 
@@ -377,6 +411,8 @@ class AlertSerializer(FarmCalendarActivitySerializer):
     )
     quantityValue = observation_ref_quantity_value_serializer_factory('value_unit', 'value')(source='parent_activity', required=False)
 
+    json_ld_type = 'Alert'
+
     class Meta:
         model = Alert
         fields = [
@@ -392,12 +428,6 @@ class AlertSerializer(FarmCalendarActivitySerializer):
             'relatedObservation',
         ]
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation.update({'@type': 'Alert'})
-        json_ld_representation = representation
-        return json_ld_representation
-
 
 class CropStressIndicatorObservationSerializer(ObservationSerializer):
     hasAgriCrop = URNRelatedField(
@@ -405,6 +435,8 @@ class CropStressIndicatorObservationSerializer(ObservationSerializer):
         queryset=FarmCrop.objects.all(),
         source='crop'
     )
+    json_ld_type = 'CropStressIndicatorObservation'
+
     class Meta:
         model = CropStressIndicatorObservation
         fields = [
@@ -420,13 +452,7 @@ class CropStressIndicatorObservationSerializer(ObservationSerializer):
             'observedProperty',
             'isPartOfActivity',
         ]
-
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation.update({'@type': 'CropStressIndicatorObservation'})
-        json_ld_representation = representation
-
-        return json_ld_representation
+        list_serializer_class = FarmCalendarActivityListSerializer
 
 
 class CropGrowthStageObservationSerializer(ObservationSerializer):
@@ -435,6 +461,8 @@ class CropGrowthStageObservationSerializer(ObservationSerializer):
         queryset=FarmCrop.objects.all(),
         source='crop'
     )
+    json_ld_type = 'CropGrowthStageObservation'
+
     class Meta:
         model = CropGrowthStageObservation
         fields = [
@@ -451,13 +479,6 @@ class CropGrowthStageObservationSerializer(ObservationSerializer):
             'isPartOfActivity',
         ]
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation.update({'@type': 'CropGrowthStageObservation'})
-        json_ld_representation = representation
-
-        return json_ld_representation
-
 
 
 class BaseParcelAreaObservationSerializer(ObservationSerializer):
@@ -479,40 +500,25 @@ class BaseParcelAreaObservationSerializer(ObservationSerializer):
 
 
 class YieldPredictionObservationSerializer(BaseParcelAreaObservationSerializer):
+    json_ld_type = 'YieldPrediction'
+
     class Meta(BaseParcelAreaObservationSerializer.Meta):
         model = YieldPredictionObservation
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation.update({'@type': 'YieldPrediction'})
-        json_ld_representation = representation
-
-        return json_ld_representation
-
 
 class DiseaseDetectionObservationSerializer(BaseParcelAreaObservationSerializer):
+    json_ld_type = 'DiseaseDetection'
+
     class Meta(BaseParcelAreaObservationSerializer.Meta):
         model = DiseaseDetectionObservation
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation.update({'@type': 'DiseaseDetection'})
-        json_ld_representation = representation
-
-        return json_ld_representation
-
 
 class VigorEstimationObservationSerializer(BaseParcelAreaObservationSerializer):
+    json_ld_type = 'VigorEstimation'
+
     class Meta(BaseParcelAreaObservationSerializer.Meta):
         model = VigorEstimationObservation
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation.update({'@type': 'VigorEstimation'})
-        json_ld_representation = representation
-
-        return json_ld_representation
-
 
 class SprayingRecommendationObservationSerializer(BaseParcelAreaObservationSerializer):
     usesPesticide = URNRelatedField(
@@ -521,17 +527,12 @@ class SprayingRecommendationObservationSerializer(BaseParcelAreaObservationSeria
         source='pesticide',
         allow_null=True
     )
+    json_ld_type = 'SprayingRecommendation'
+
     class Meta(BaseParcelAreaObservationSerializer.Meta):
         model = SprayingRecommendationObservation
         fields = BaseParcelAreaObservationSerializer.Meta.fields + ['usesPesticide']
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation.update({'@type': 'SprayingRecommendation'})
-        json_ld_representation = representation
-
-        return json_ld_representation
-
 
 class AddRawMaterialCompostQuantitySerializer(serializers.ModelSerializer):
     quantityValue = AppliedAmmountFieldSerializer(source='*')
@@ -558,6 +559,8 @@ class AddRawMaterialCompostQuantitySerializer(serializers.ModelSerializer):
 class AddRawMaterialOperationSerializer(GenericOperationSerializer):
     hasCompostMaterial = AddRawMaterialCompostQuantitySerializer(source='addrawmaterialcompostquantity_set', many=True)
 
+    json_ld_type = 'AddRawMaterialOperation'
+
     class Meta:
         model = AddRawMaterialOperation
 
@@ -571,15 +574,6 @@ class AddRawMaterialOperationSerializer(GenericOperationSerializer):
             'isPartOfActivity',
         ]
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation.update({'@type': 'AddRawMaterialOperation'})
-        json_ld_representation = representation
-
-        return json_ld_representation
-
-
-
     def create(self, validated_data):
         if self.context['view'].kwargs.get('compost_operation_pk'):
             validated_data['parent_activity'] = CompostOperation.objects.get(pk=self.context['view'].kwargs.get('compost_operation_pk'))
@@ -608,6 +602,8 @@ class AddRawMaterialOperationSerializer(GenericOperationSerializer):
 
 class CompostTurningOperationSerializer(GenericOperationSerializer):
 
+    json_ld_type = 'CompostTurningOperation'
+
     class Meta:
         model = CompostTurningOperation
 
@@ -620,13 +616,6 @@ class CompostTurningOperationSerializer(GenericOperationSerializer):
             'isPartOfActivity',
         ]
 
-    def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation.update({'@type': 'CompostTurningOperation'})
-        json_ld_representation = representation
-
-        return json_ld_representation
-
     def create(self, validated_data):
         if self.context['view'].kwargs.get('compost_operation_pk'):
             validated_data['parent_activity'] = CompostOperation.objects.get(pk=self.context['view'].kwargs.get('compost_operation_pk'))
@@ -651,6 +640,11 @@ class CompostOperationSerializer(FarmCalendarActivitySerializer):
         settings.DEFAULT_CALENDAR_ACTIVITY_TYPES['irrigation']['name'],
         settings.DEFAULT_CALENDAR_ACTIVITY_TYPES['add_raw_material_operation']['name']
     ]
+    NESTED_OPERATION_MODELS = [
+        AddRawMaterialOperation,
+        IrrigationOperation,
+        CompostTurningOperation,
+    ]
 
     hasNestedOperation = URNRelatedField(
         class_names=None, source='nested_activities', many=True,
@@ -667,6 +661,8 @@ class CompostOperationSerializer(FarmCalendarActivitySerializer):
     isOperatedOn = URNCharField(
         class_names=['CompostPile'], source='compost_pile_id', read_only=False
     )
+    json_ld_type = 'CompostOperation'
+
     class Meta:
         model = CompostOperation
 
@@ -682,9 +678,7 @@ class CompostOperationSerializer(FarmCalendarActivitySerializer):
         ]
 
     def to_representation(self, instance):
-        representation = super().to_representation(instance)
-        representation.update({'@type': 'CompostOperation'})
-        json_ld_representation = representation
+        json_ld_representation = super().to_representation(instance)
         clean_nested_activities = []
         clean_nested_obs = []
         json_and_instances_list = zip(
@@ -693,12 +687,8 @@ class CompostOperationSerializer(FarmCalendarActivitySerializer):
         )
         for json_activity, nested_activity in json_and_instances_list:
             class_name = 'Observation'
-            for field in ['addrawmaterialoperation', 'irrigationoperation', 'compostturningoperation']:
-                try:
-                    class_name = getattr(nested_activity, field).__class__.__name__
-                    break
-                except ObjectDoesNotExist as e:
-                    continue
+            if nested_activity.concrete_model in self.NESTED_OPERATION_MODELS:
+                class_name = nested_activity.concrete_model.__name__
 
             fixed_id = json_activity['@id'].format(class_name=class_name)
             fixed_type = json_activity['@type'].format(class_name=class_name)
@@ -712,3 +702,62 @@ class CompostOperationSerializer(FarmCalendarActivitySerializer):
         json_ld_representation['hasNestedOperation'] = clean_nested_activities
         json_ld_representation['hasMeasurement'] = clean_nested_obs
         return json_ld_representation
+
+
+class ObservationAggregationQuerySerializer(serializers.Serializer):
+    """
+    Query parameters of the observations aggregation: the time bucket size and the
+    (comma separated) fields each bucket is also grouped by.
+    """
+    GROUP_BY_FIELDS = {
+        'observedProperty': 'observed_property',
+        'madeBySensor': 'sensor_id',
+        'hasAgriParcel': 'parcel_id',
+    }
+
+    interval = serializers.ChoiceField(choices=['hour', 'day', 'week'], default='day')
+    groupBy = serializers.CharField(
+        default='observedProperty',
+        help_text=f"Comma separated list of: {', '.join(GROUP_BY_FIELDS)}.",
+    )
+
+    def validate_groupBy(self, value):
+        group_by = [name.strip() for name in value.split(',') if name.strip()]
+        invalid_names = [name for name in group_by if name not in self.GROUP_BY_FIELDS]
+        if invalid_names:
+            raise serializers.ValidationError(
+                f"Unknown fields: {', '.join(invalid_names)}. Expected any of: {', '.join(self.GROUP_BY_FIELDS)}."
+            )
+        return list(dict.fromkeys(group_by))
+
+
+class ObservationAggregationSerializer(serializers.Serializer):
+    """
+    Aggregated numeric values of the observations of a time bucket (and group).
+    Only the fields in the `groupBy` parameter are included, besides the unit.
+    """
+    phenomenonTime = serializers.DateTimeField(help_text='Start of the time bucket.')
+    observedProperty = serializers.CharField(required=False)
+    madeBySensor = serializers.CharField(required=False, allow_null=True)
+    hasAgriParcel = serializers.CharField(required=False, allow_null=True, help_text='@id of the parcel.')
+    unit = serializers.CharField(allow_null=True)
+    min = serializers.FloatField()
+    max = serializers.FloatField()
+    mean = serializers.FloatField()
+    count = serializers.IntegerField()
+
+    def to_representation(self, instance):
+        representation = {'phenomenonTime': serializers.DateTimeField().to_representation(instance['bucket'])}
+        for name, field_name in ObservationAggregationQuerySerializer.GROUP_BY_FIELDS.items():
+            if field_name in instance:
+                representation[name] = instance[field_name]
+        if representation.get('hasAgriParcel') is not None:
+            representation['hasAgriParcel'] = generate_urn('FarmParcel', obj_id=representation['hasAgriParcel'])
+        representation.update({
+            'unit': instance['value_unit'],
+            'min': instance['min'],
+            'max': instance['max'],
+            'mean': instance['mean'],
+            'count': instance['count'],
+        })
+        return representation
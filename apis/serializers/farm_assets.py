@@ -1,8 +1,6 @@
-import uuid
-
 from rest_framework import serializers
 
-from ..schemas import generate_urn
+from ..schemas import generate_hashed_urn, generate_urn
 from .base import URNRelatedField
 
 from farm_management.models import (
@@ -65,9 +63,8 @@ class CropSpeciesSerializerField(serializers.Serializer):
             getattr(instance, 'species', ''),
             variety,
         ])
-        hash_uuid = str(uuid.uuid5(uuid.NAMESPACE_DNS, uuid_orig_str))
         return {
-            '@id': generate_urn('CropType', obj_id=hash_uuid),
+            '@id': generate_hashed_urn('CropType', uuid_orig_str),
             '@type': 'CropType',
             'name': getattr(instance, 'species', ''),
             'variety': getattr(instance, 'species', ''),
@@ -104,9 +101,8 @@ class FarmAnimalGroupSerializerField(serializers.Serializer):
         uuid_orig_str = getattr(instance, 'animal_group', '')
         if uuid_orig_str is None or uuid_orig_str is '':
             return {}
-        hash_uuid = str(uuid.uuid5(uuid.NAMESPACE_DNS, uuid_orig_str))
         return {
-            '@id': generate_urn('AnimalGroup', obj_id=hash_uuid),
+            '@id': generate_hashed_urn('AnimalGroup', uuid_orig_str),
             '@type': 'AnimalGroup',
             'hasName': uuid_orig_str
         }
@@ -1,11 +1,11 @@
-import uuid
+import numpy as np
 
 from rest_framework import serializers
 
 from farm_management.models import Farm, FarmParcel
 from .base import JSONLDSerializer, URNRelatedField
 
-from ..schemas import URN_BASE_NAMESPACE, generate_urn
+from ..schemas import URN_BASE_NAMESPACE, generate_hashed_urn, generate_urn
 
 
 def snake_to_camel_lower(snake_str):
@@ -20,11 +20,11 @@ class ContactPersonField(serializers.Serializer):
         # Construct the @id for the contact person
         if instance.contact_person_firstname is None or instance.contact_person_lastname is None:
             return {}
-        contact_person_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, instance.contact_person_firstname + instance.contact_person_lastname))
+        contact_person_name = instance.contact_person_firstname + instance.contact_person_lastname
         return {
             'firstname': instance.contact_person_firstname,
             'lastname': instance.contact_person_lastname,
-            '@id': generate_urn('ContactPerson', obj_id=contact_person_id),
+            '@id': generate_hashed_urn('ContactPerson', contact_person_name),
             '@type': 'Person'
         }
 
@@ -52,9 +52,8 @@ class AddressField(serializers.Serializer):
             self._get_none_attr_as_empty_str(instance, 'community'),
             self._get_none_attr_as_empty_str(instance, 'locator_name'),
         ])
-        address_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, address_str))
         return {
-            '@id': generate_urn('Address', obj_id=address_id),
+            '@id': generate_hashed_urn('Address', address_str),
             '@type': 'Address',
             'adminUnitL1': getattr(instance, 'admin_unit_l1'),
             'adminUnitL2': getattr(instance, 'admin_unit_l2'),
@@ -165,4 +164,32 @@ class FarmParcelSerializer(serializers.ModelSerializer):
             **representation
         }
 
-        return json_ld_representation
\ No newline at end of file
+        return json_ld_representation
+
+class FarmParcelPointsLookupSerializer(serializers.Serializer):
+    """
+    Many points (EPSG:4326), as a list of [latitude, longitude] pairs, to look up
+    the parcels containing each one.
+    """
+    max_points = 100000
+
+    points = serializers.ListField(
+        help_text="List of [latitude, longitude] pairs (EPSG:4326).",
+        allow_empty=False,
+    )
+
+    def validate_points(self, value):
+        if len(value) > self.max_points:
+            raise serializers.ValidationError(f'Expected at most {self.max_points} points, received {len(value)}.')
+        try:
+            points = np.asarray(value, dtype=float)
+        except (TypeError, ValueError):
+            raise serializers.ValidationError('Expected a list of [latitude, longitude] pairs.')
+        if points.ndim != 2 or points.shape[1] != 2 or not np.isfinite(points).all():
+            raise serializers.ValidationError('Expected a list of [latitude, longitude] pairs.')
+        return points
+
+
+class FarmParcelPointsLookupResultSerializer(serializers.Serializer):
+    point = serializers.ListField(child=serializers.FloatField(), help_text="[latitude, longitude] of the point.")
+    parcels = serializers.ListField(child=serializers.CharField(), help_text="@id of the parcels containing the point.")
@@ -1,3 +1,668 @@
+import datetime
+import json
+import time
+import uuid
+from unittest import mock
+
+import jwt
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.utils.encoders import JSONEncoder
+
+from farm_activities.models import (
+    FarmCalendarActivityType,
+    FarmCalendarActivity,
+    Observation,
+    Alert,
+    FertilizationOperation,
+    CropStressIndicatorObservation,
+    AddRawMaterialOperation,
+    AddRawMaterialCompostQuantity,
+    CompostOperation,
+    IrrigationOperation,
+)
+from farm_management.models import (
+    Farm,
+    FarmParcel,
+    FarmCrop,
+    AgriculturalMachine,
+    Fertilizer,
+    CompostMaterial,
+)
+from farm_calendar.utils.jwt_utils import verified_token_cache
+from farm_activities.cache import activity_type_cache
+from apis.schemas import generate_hashed_urn, generate_urn
+from apis.serializers import (
+    FarmCalendarActivitySerializer,
+    ObservationSerializer,
+    AlertSerializer,
+    FertilizationOperationSerializer,
+    IrrigationOperationSerializer,
+    CropStressIndicatorObservationSerializer,
+)
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.login(username='testuser', password='testpass')
+
+        self.activity_type = FarmCalendarActivityType.objects.create(name='Some Observation', category='observation')
+        start = timezone.now()
+        for i in range(5):
+            # two observations per timestamp, to exercise the id tie-breaker
+            Observation.objects.create(
+                activity_type=self.activity_type,
+                start_datetime=start - datetime.timedelta(hours=i // 2),
+                value=str(i), observed_property='temperature',
+            )
+        self.url = reverse('observation-list', kwargs={'version': 'v1'})
+
+    def test_list_is_unpaginated_by_default(self):
+        response = self.client.get(self.url, {'format': 'json'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.json(), list)
+        self.assertEqual(len(response.json()), 5)
+
+    def test_following_next_cursor_returns_every_row_once(self):
+        response = self.client.get(self.url, {'format': 'json', 'page_size': 2})
+        pages = []
+        while True:
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            pages.append([obs['@id'] for obs in data['results']])
+            if data['next'] is None:
+                break
+            response = self.client.get(data['next'])
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        expected_ids = [
+            f'urn:farmcalendar:Observation:{pk}'
+            for pk in Observation.objects.order_by('-start_datetime', '-id').values_list('pk', flat=True)
+        ]
+        self.assertEqual(sum(pages, []), expected_ids)
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(self.url, {'format': 'json', 'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, 404)
+
+
+class StreamingJSONLDListTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.login(username='testuser', password='testpass')
+
+        activity_type = FarmCalendarActivityType.objects.create(name='Some Observation', category='observation')
+        for i in range(3):
+            Observation.objects.create(
+                activity_type=activity_type,
+                start_datetime=timezone.now() - datetime.timedelta(hours=i),
+                value=str(i), value_unit='C', observed_property='temperature',
+            )
+        self.url = reverse('observation-list', kwargs={'version': 'v1'})
+
+    def test_streamed_list_matches_regular_list(self):
+        regular_response = self.client.get(self.url)
+        streamed_response = self.client.get(self.url, {'stream': 'true'})
+
+        self.assertEqual(streamed_response.status_code, 200)
+        self.assertTrue(streamed_response.streaming)
+        self.assertEqual(streamed_response['Content-Type'], 'application/ld+json')
+        self.assertEqual(b''.join(streamed_response.streaming_content), regular_response.content)
+
+    def test_stream_is_ignored_for_non_jsonld_renderers(self):
+        response = self.client.get(self.url, {'stream': 'true', 'format': 'json'})
+
+        self.assertFalse(response.streaming)
+        self.assertEqual(len(response.json()), 3)
+
+
+class ListEndpointQueryCountTests(TestCase):
+    """
+    The number of queries of a list endpoint should not depend on how many rows it returns.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.login(username='testuser', password='testpass')
+
+        self.activity_type = FarmCalendarActivityType.objects.create(name='Some Activity')
+        self.farm = Farm.objects.create(name='Farm')
+        self.parcel = FarmParcel.objects.create(identifier='parcel-1', farm=self.farm, parcel_type='vineyard')
+        self.crop = FarmCrop.objects.create(name='Crop', species='grape', parcel=self.parcel)
+        self.machine = AgriculturalMachine.objects.create(
+            name='Tractor', purchase_date=datetime.date.today(),
+            manufacturer='Some', model='T1', seria_number='123',
+        )
+        self.fertilizer = Fertilizer.objects.create(
+            name='Fertilizer', cost=1, price_unit='kg', active_substance='N',
+            targeted_towards='grape', nutrient_concentration=1,
+        )
+        self.material = CompostMaterial.objects.create(name='Straw')
+
+    def assertListQueriesDoNotGrow(self, url_name, create_row):
+        url = reverse(url_name, kwargs={'version': 'v1'})
+        create_row()
+        with CaptureQueriesContext(connection) as single_row_queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        for _ in range(4):
+            create_row()
+        with CaptureQueriesContext(connection) as many_rows_queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.assertEqual(len(single_row_queries), len(many_rows_queries))
+
+    def _create_activity(self):
+        activity = FarmCalendarActivity.objects.create(
+            activity_type=self.activity_type, parcel=self.parcel,
+            start_datetime=timezone.now(),
+        )
+        activity.agricultural_machinery.add(self.machine)
+        return activity
+
+    def _create_observation(self):
+        return Observation.objects.create(
+            activity_type=self.activity_type, parcel=self.parcel,
+            start_datetime=timezone.now(), parent_activity=self._create_activity(),
+            value='10', value_unit='C', observed_property='temperature', sensor_id='sensor-1',
+        )
+
+    def test_farm_calendar_activities(self):
+        self.assertListQueriesDoNotGrow('farmcalendaractivity-list', self._create_activity)
+
+    def test_observations(self):
+        self.assertListQueriesDoNotGrow('observation-list', self._create_observation)
+
+    def test_alerts(self):
+        def create_alert():
+            Alert.objects.create(
+                activity_type=self.activity_type, start_datetime=timezone.now(),
+                end_datetime=timezone.now(), parent_activity=self._create_observation(),
+            )
+        self.assertListQueriesDoNotGrow('alert-list', create_alert)
+
+    def test_fertilization_operations(self):
+        def create_operation():
+            operation = FertilizationOperation.objects.create(
+                activity_type=self.activity_type, parcel=self.parcel, start_datetime=timezone.now(),
+                applied_amount=1, applied_amount_unit='kg', fertilizer=self.fertilizer,
+            )
+            operation.agricultural_machinery.add(self.machine)
+        self.assertListQueriesDoNotGrow('fertilizationoperation-list', create_operation)
+
+    def test_crop_stress_indicator_observations(self):
+        def create_observation():
+            CropStressIndicatorObservation.objects.create(
+                activity_type=self.activity_type, parcel=self.parcel, start_datetime=timezone.now(),
+                value='1', observed_property='stress', crop=self.crop,
+            )
+        self.assertListQueriesDoNotGrow('cropstressindicatorobservation-list', create_observation)
+
+    def test_add_raw_material_operations(self):
+        def create_operation():
+            operation = AddRawMaterialOperation.objects.create(
+                activity_type=self.activity_type, parcel=self.parcel, start_datetime=timezone.now(),
+            )
+            AddRawMaterialCompostQuantity.objects.create(
+                operation=operation, material=self.material, applied_amount=1, applied_amount_unit='kg',
+            )
+        self.assertListQueriesDoNotGrow('addrawmaterialoperation-list', create_operation)
+
+    def test_farm_parcels(self):
+        def create_parcel():
+            parcel = FarmParcel.objects.create(
+                identifier=f'parcel-{FarmParcel.objects.count() + 1}', farm=self.farm, parcel_type='vineyard',
+            )
+            FarmCrop.objects.create(name='Crop', species='grape', parcel=parcel)
+        self.assertListQueriesDoNotGrow('farmparcel-list', create_parcel)
+
+    def test_compost_operation_nested_activities(self):
+        url = reverse('compostoperation-detail', kwargs={'version': 'v1', 'pk': CompostOperation.objects.create(
+            activity_type=self.activity_type, compost_pile_id='pile-1',
+        ).pk})
+        compost_operation = CompostOperation.objects.get()
+
+        def add_nested_activities():
+            IrrigationOperation.objects.create(
+                activity_type=self.activity_type, parent_activity=compost_operation,
+                applied_amount=1, applied_amount_unit='L',
+            )
+            Observation.objects.create(
+                activity_type=self.activity_type, parent_activity=compost_operation,
+                value='50', observed_property='temperature',
+            )
+
+        add_nested_activities()
+        with CaptureQueriesContext(connection) as few_nested_queries:
+            response = self.client.get(url, {'format': 'json'})
+        for _ in range(4):
+            add_nested_activities()
+        with CaptureQueriesContext(connection) as many_nested_queries:
+            response = self.client.get(url, {'format': 'json'})
+
+        self.assertEqual(len(few_nested_queries), len(many_nested_queries))
+        data = response.json()
+        self.assertEqual(len(data['hasNestedOperation']), 5)
+        self.assertEqual(len(data['hasMeasurement']), 5)
+        self.assertEqual(
+            {nested['@type'] for nested in data['hasNestedOperation']}, {'IrrigationOperation'}
+        )
+        self.assertEqual(
+            {nested['@type'] for nested in data['hasMeasurement']}, {'Observation'}
+        )
+
+
+class ObservationAggregationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.login(username='testuser', password='testpass')
+
+        self.activity_type = FarmCalendarActivityType.objects.create(name='Sensor Reading', category='observation')
+        self.parcel = FarmParcel.objects.create(identifier='parcel-1', farm=Farm.objects.create(name='Farm'), parcel_type='vineyard')
+        start = datetime.datetime(2024, 5, 1, tzinfo=datetime.timezone.utc)
+        # a reading every 30 minutes for two days, by two sensors
+        Observation.objects.bulk_create_activities([
+            Observation(
+                activity_type=self.activity_type, parcel=self.parcel,
+                start_datetime=start + datetime.timedelta(minutes=30 * i),
+                observed_property='temperature', value=str(i), value_unit='C', sensor_id=sensor_id,
+            )
+            for i in range(96) for sensor_id in ['sensor-1', 'sensor-2']
+        ])
+        Observation.objects.create(
+            activity_type=self.activity_type, start_datetime=start, observed_property='temperature', value='n/a',
+        )
+
+    def test_aggregate_per_day(self):
+        url = reverse('observation-aggregate', kwargs={'version': 'v1'})
+        response = self.client.get(url, {'interval': 'day', 'groupBy': 'observedProperty,hasAgriParcel'})
+
+        self.assertEqual(response.status_code, 200)
+        buckets = response.json()['@graph']
+        self.assertEqual(buckets, [
+            {
+                'phenomenonTime': '2024-05-01T00:00:00Z', 'observedProperty': 'temperature',
+                'hasAgriParcel': f'urn:farmcalendar:FarmParcel:{self.parcel.pk}',
+                'unit': 'C', 'min': 0, 'max': 47, 'mean': 23.5, 'count': 96,
+            },
+            {
+                'phenomenonTime': '2024-05-02T00:00:00Z', 'observedProperty': 'temperature',
+                'hasAgriParcel': f'urn:farmcalendar:FarmParcel:{self.parcel.pk}',
+                'unit': 'C', 'min': 48, 'max': 95, 'mean': 71.5, 'count': 96,
+            },
+        ])
+
+    def test_aggregate_per_hour_and_sensor_with_filters(self):
+        url = reverse('observation-aggregate', kwargs={'version': 'v1'})
+        response = self.client.get(url, {
+            'interval': 'hour', 'groupBy': 'madeBySensor', 'fromDate': '2024-05-01T00:00:00Z', 'toDate': '2024-05-01T01:59:00Z',
+        })
+
+        self.assertEqual(response.status_code, 200)
+        buckets = response.json()['@graph']
+        self.assertEqual(
+            [(bucket['madeBySensor'], bucket['phenomenonTime'], bucket['mean'], bucket['count']) for bucket in buckets],
+            [
+                ('sensor-1', '2024-05-01T00:00:00Z', 0.5, 2), ('sensor-1', '2024-05-01T01:00:00Z', 2.5, 2),
+                ('sensor-2', '2024-05-01T00:00:00Z', 0.5, 2), ('sensor-2', '2024-05-01T01:00:00Z', 2.5, 2),
+            ]
+        )
+
+    def test_value_range_filter(self):
+        url = reverse('observation-list', kwargs={'version': 'v1'})
+        response = self.client.get(url, {'format': 'json', 'value__gte': '90', 'value__lt': '92'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(result['hasResult']['hasValue'] for result in response.json()),
+            ['90', '90', '91', '91'],
+        )
+
+    def test_updating_value_updates_numeric_value(self):
+        observation = Observation.objects.filter(sensor_id='sensor-1').order_by('start_datetime').first()
+        url = reverse('observation-detail', kwargs={'version': 'v1', 'pk': observation.pk})
+        response = self.client.patch(
+            url, {'hasResult': {'unit': 'C', 'hasValue': '-3.5'}}, content_type='application/json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        observation.refresh_from_db()
+        self.assertEqual(observation.numeric_value, -3.5)
+
+    def test_aggregate_invalid_parameters(self):
+        url = reverse('observation-aggregate', kwargs={'version': 'v1'})
+        response = self.client.get(url, {'interval': 'month', 'groupBy': 'title'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()['@graph'][0]), {'interval', 'groupBy'})
+
+
+class ActivityRepresentationPlanTests(TestCase):
+    """
+    The activity serializers representation plan should give the same output as DRF's generic serialization.
+    """
+
+    def setUp(self):
+        self.activity_type = FarmCalendarActivityType.objects.create(name='Some Activity')
+        self.parcel = FarmParcel.objects.create(identifier='parcel-1', farm=Farm.objects.create(name='Farm'), parcel_type='vineyard')
+        self.crop = FarmCrop.objects.create(name='Crop', species='grape', parcel=self.parcel)
+        self.machine = AgriculturalMachine.objects.create(
+            name='Tractor', purchase_date=datetime.date.today(),
+            manufacturer='Some', model='T1', seria_number='123',
+        )
+
+    def assertSameAsGenericRepresentation(self, serializer_class, instance):
+        serializer = serializer_class()
+        generic_representation = serializers.ModelSerializer.to_representation(serializer, instance)
+        expected = {
+            '@type': serializer.json_ld_type,
+            '@id': generate_urn(instance.__class__.__name__, obj_id=generic_representation.pop('id')),
+            **generic_representation
+        }
+        self.assertEqual(
+            json.dumps(serializer_class(instance).data, cls=JSONEncoder), json.dumps(expected, cls=JSONEncoder)
+        )
+
+    def test_activity_serializers(self):
+        activity = FarmCalendarActivity.objects.create(
+            activity_type=self.activity_type, parcel=self.parcel, title='Activity', start_datetime=timezone.now(),
+        )
+        activity.agricultural_machinery.add(self.machine)
+        observation = Observation.objects.create(
+            activity_type=self.activity_type, start_datetime=timezone.now(), parent_activity=activity,
+            value='10', value_unit='C', observed_property='temperature', sensor_id='sensor-1',
+        )
+        instances = [
+            (FarmCalendarActivitySerializer, activity),
+            (ObservationSerializer, observation),
+            (AlertSerializer, Alert.objects.create(
+                activity_type=self.activity_type, start_datetime=timezone.now(),
+                end_datetime=timezone.now(), parent_activity=observation, severity='minor',
+            )),
+            (FertilizationOperationSerializer, FertilizationOperation.objects.create(
+                activity_type=self.activity_type, parcel=self.parcel, start_datetime=timezone.now(),
+                end_datetime=timezone.now(), applied_amount='1.5', applied_amount_unit='kg',
+            )),
+            (IrrigationOperationSerializer, IrrigationOperation.objects.create(
+                activity_type=self.activity_type, start_datetime=timezone.now(),
+                applied_amount=1, applied_amount_unit='L',
+            )),
+            (CropStressIndicatorObservationSerializer, CropStressIndicatorObservation.objects.create(
+                activity_type=self.activity_type, parcel=self.parcel, start_datetime=timezone.now(),
+                value='1', observed_property='stress', crop=self.crop,
+            )),
+        ]
+        for serializer_class, instance in instances:
+            with self.subTest(serializer_class.__name__):
+                # as returned by the API, from a fresh queryset
+                instance = type(instance).objects.get(pk=instance.pk)
+                self.assertSameAsGenericRepresentation(serializer_class, instance)
+
+
+class BulkCreateObservationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.login(username='testuser', password='testpass')
+
+        self.activity_type = FarmCalendarActivityType.objects.create(name='Sensor Reading', category='observation')
+        farm = Farm.objects.create(name='Farm')
+        self.parcel = FarmParcel.objects.create(identifier='parcel-1', farm=farm, parcel_type='vineyard')
+        self.crop = FarmCrop.objects.create(name='Crop', species='grape', parcel=self.parcel)
+
+    def _observation_data(self, value, **extra):
+        return {
+            'activityType': f'urn:farmcalendar:FarmCalendarActivityType:{self.activity_type.pk}',
+            'phenomenonTime': '2024-05-01T10:00:00Z',
+            'hasAgriParcel': f'urn:farmcalendar:Parcel:{self.parcel.pk}',
+            'observedProperty': 'temperature',
+            'hasResult': {'unit': 'C', 'hasValue': value},
+            **extra,
+        }
+
+    def test_bulk_create_observations_from_graph(self):
+        url = reverse('observation-bulk-create', kwargs={'version': 'v1'})
+        graph = [self._observation_data(str(i)) for i in range(20)]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                url, {'@graph': graph}, content_type='application/ld+json', HTTP_ACCEPT='application/json',
+            )
+
+        self.assertEqual(response.status_code, 201)
+        results = response.json()
+        self.assertEqual([result['status'] for result in results], [201] * 20)
+        observations = Observation.objects.order_by('value')
+        self.assertEqual(
+            sorted(result['@id'] for result in results),
+            sorted(f'urn:farmcalendar:Observation:{pk}' for pk in observations.values_list('pk', flat=True)),
+        )
+        self.assertEqual(observations[0].title, 'Sensor Reading')
+        self.assertEqual(observations[0].concrete_model, Observation)
+        self.assertEqual(observations[0].parcel, self.parcel)
+        self.assertEqual(observations[0].numeric_value, 0)
+        # related objects are looked up once, and each table is inserted at once
+        self.assertLess(len(queries), 15)
+
+    def test_bulk_create_queries_do_not_grow_with_items(self):
+        url = reverse('observation-bulk-create', kwargs={'version': 'v1'})
+
+        def count_queries(items_count):
+            # a cold activity types cache, which is not kept within the transaction of the test
+            activity_type_cache.clear()
+            graph = [self._observation_data(str(i)) for i in range(items_count)]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(url, graph, content_type='application/json', HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 201)
+            return len(queries)
+
+        self.assertEqual(count_queries(5), count_queries(50))
+
+    def test_bulk_create_returns_result_per_item(self):
+        url = reverse('cropstressindicatorobservation-bulk-create', kwargs={'version': 'v1'})
+        crop_urn = f'urn:farmcalendar:FarmCrop:{self.crop.pk}'
+        graph = [
+            self._observation_data('1', hasAgriCrop=crop_urn),
+            self._observation_data('2'),
+            self._observation_data('3', hasAgriCrop=crop_urn),
+        ]
+
+        response = self.client.post(url, graph, content_type='application/json', HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.status_code, 207)
+        results = response.json()
+        self.assertEqual([result['status'] for result in results], [201, 400, 201])
+        self.assertIn('hasAgriCrop', results[1]['errors'])
+        observation = CropStressIndicatorObservation.objects.get(value='3')
+        self.assertEqual(results[2]['@id'], f'urn:farmcalendar:CropStressIndicatorObservation:{observation.pk}')
+        self.assertEqual(observation.crop, self.crop)
+        self.assertEqual(Observation.objects.get(pk=observation.pk).concrete_model, CropStressIndicatorObservation)
+        self.assertEqual(FarmCalendarActivity.objects.count(), 2)
+
+
+class FarmParcelContainsPointFilterTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.login(username='testuser', password='testpass')
+        farm = Farm.objects.create(name='Farm')
+
+        def create_parcel(identifier, geometry):
+            return FarmParcel.objects.create(identifier=identifier, farm=farm, parcel_type='vineyard', geometry=geometry)
+
+        self.west_parcel = create_parcel('west', 'POLYGON ((0 0, 2 0, 2 2, 0 2, 0 0))')
+        self.east_parcel = create_parcel('east', 'POLYGON ((1 0, 4 0, 4 2, 1 2, 1 0))')
+        # bounding box contains (0.5, 3.5), but the polygon does not
+        self.triangle_parcel = create_parcel('triangle', 'POLYGON ((0 3, 3 3, 3 6, 0 3))')
+        create_parcel('no-geometry', None)
+        create_parcel('invalid-geometry', 'not a wkt')
+        self.url = reverse('farmparcel-list', kwargs={'version': 'v1'})
+
+    def get_matching_identifiers(self, contains_point):
+        response = self.client.get(self.url, {'format': 'json', 'contains_point': contains_point})
+        self.assertEqual(response.status_code, 200)
+        return sorted(parcel['identifier'] for parcel in response.json())
+
+    def test_contains_point(self):
+        # the format is 'latitude,longitude', i.e., 'y,x'
+        self.assertEqual(self.get_matching_identifiers('1,0.5'), ['west'])
+        self.assertEqual(self.get_matching_identifiers('1,1.5'), ['east', 'west'])
+        self.assertEqual(self.get_matching_identifiers('4,2'), ['triangle'])
+        self.assertEqual(self.get_matching_identifiers('3.5,0.5'), [])
+        self.assertEqual(self.get_matching_identifiers('not-a-point'), [])
+
+    def test_index_follows_parcel_changes(self):
+        self.assertEqual(self.get_matching_identifiers('1,3'), ['east'])
+
+        self.east_parcel.geometry = 'POLYGON ((10 10, 11 10, 11 11, 10 11, 10 10))'
+        self.east_parcel.save()
+
+        self.assertEqual(self.get_matching_identifiers('1,3'), [])
+        self.assertEqual(self.get_matching_identifiers('10.5,10.5'), ['east'])
+
+    def test_contains_points_resolves_many_points_at_once(self):
+        url = reverse('farmparcel-contains-points', kwargs={'version': 'v1'})
+        points = [[1, 0.5], [1, 1.5], [4, 2], [3.5, 0.5], [1, 3]]
+
+        # session, user, spatial index version, parcel geometries for the spatial index
+        # and the ids of the (filtered) parcels
+        with self.assertNumQueries(5):
+            response = self.client.post(url, {'points': points}, content_type='application/json', HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual([result['point'] for result in results], points)
+        urn = lambda parcel: f'urn:farmcalendar:FarmParcel:{parcel.pk}'
+        self.assertEqual(
+            [sorted(result['parcels']) for result in results],
+            [
+                [urn(self.west_parcel)],
+                sorted([urn(self.west_parcel), urn(self.east_parcel)]),
+                [urn(self.triangle_parcel)],
+                [],
+                [urn(self.east_parcel)],
+            ],
+        )
+
+    def test_contains_points_respects_parcel_filters(self):
+        url = reverse('farmparcel-contains-points', kwargs={'version': 'v1'})
+
+        response = self.client.post(
+            f'{url}?identifier=east', {'points': [[1, 1.5]]}, content_type='application/json', HTTP_ACCEPT='application/json',
+        )
+
+        self.assertEqual(response.json()['results'][0]['parcels'], [f'urn:farmcalendar:FarmParcel:{self.east_parcel.pk}'])
+
+    def test_contains_points_with_invalid_points_returns_400(self):
+        url = reverse('farmparcel-contains-points', kwargs={'version': 'v1'})
+
+        for points in ([[1, 2, 3]], [['a', 'b']], 'not-a-list', []):
+            response = self.client.post(url, {'points': points}, content_type='application/json', HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 400)
+
+
+
+class HashedURNTests(TestCase):
+
+    def test_hashed_urn_is_memoized_uuid5(self):
+        generate_hashed_urn.cache_clear()
+        self.assertEqual(
+            generate_hashed_urn('Sensor', 'sensor-1'),
+            f'urn:farmcalendar:Sensor:{uuid.uuid5(uuid.NAMESPACE_DNS, "sensor-1")}'
+        )
+        self.assertEqual(generate_hashed_urn('Sensor', 'sensor-1'), generate_hashed_urn('Sensor', 'sensor-1'))
+        # the same name of another class has another URN
+        self.assertNotEqual(generate_hashed_urn('Address', 'sensor-1'), generate_hashed_urn('Sensor', 'sensor-1'))
+        cache_info = generate_hashed_urn.cache_info()
+        self.assertEqual((cache_info.hits, cache_info.misses), (3, 2))
+
+
+class JWTAuthenticationTests(TestCase):
+
+    def setUp(self):
+        verified_token_cache.clear()
+        self.addCleanup(verified_token_cache.clear)
+        self.user = User.objects.create_user(username='gatekeeper-user-1')
+        self.url = reverse('farmparcel-list', kwargs={'version': 'v1'})
+
+    def get_token(self, **claims):
+        claims = {settings.JWT_USER_ID_FIELD: self.user.username, 'exp': int(time.time()) + 60, **claims}
+        return jwt.encode(claims, settings.JWT_SIGNING_KEY, algorithm=settings.JWT_ALG)
+
+    def test_token_is_only_decoded_once(self):
+        token = self.get_token()
+
+        with mock.patch('farm_calendar.utils.jwt_utils.jwt.decode', wraps=jwt.decode) as decode:
+            for _ in range(3):
+                response = self.client.get(self.url, HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_ACCEPT='application/json')
+                self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(decode.call_count, 1)
+        self.assertEqual(verified_token_cache.get(token)['user'], self.user)
+
+    def test_request_is_authenticated_once(self):
+        token = self.get_token()
+
+        with mock.patch('farm_calendar.utils.jwt_utils.jwt.decode', wraps=jwt.decode) as decode:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.url, HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_ACCEPT='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(decode.call_count, 1)
+        user_queries = [query for query in queries if 'FROM "auth_user"' in query['sql']]
+        self.assertEqual(len(user_queries), 1)
+
+    def test_user_is_cached_with_the_token(self):
+        token = self.get_token()
+        self.client.get(self.url, HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_ACCEPT='application/json')
+
+        def count_user_queries():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.url, HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_ACCEPT='application/json')
+            self.assertEqual(response.status_code, 200)
+            return len([query for query in queries if 'FROM "auth_user"' in query['sql']])
+
+        self.assertEqual(count_user_queries(), 0)
+        # e.g., deactivated, it is read again
+        self.user.first_name = 'Changed'
+        self.user.save()
+        self.assertIsNone(verified_token_cache.get(token)['user'])
+        self.assertEqual(count_user_queries(), 1)
+        self.assertEqual(verified_token_cache.get(token)['user'].first_name, 'Changed')
+
+    def test_token_is_not_decoded_when_the_user_is_not_used(self):
+        token = self.get_token()
+
+        with mock.patch('farm_calendar.utils.jwt_utils.jwt.decode', wraps=jwt.decode) as decode:
+            response = self.client.get('/static/missing.css', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(decode.call_count, 0)
+
+    def test_cached_token_expires_with_the_token(self):
+        token = self.get_token(exp=int(time.time()) + 1)
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNotNone(verified_token_cache.get(token))
+
+        with mock.patch('farm_calendar.utils.jwt_utils.time.time', return_value=time.time() + 2):
+            self.assertIsNone(verified_token_cache.get(token))
+
+    def test_invalid_token_is_rejected(self):
+        token = jwt.encode({settings.JWT_USER_ID_FIELD: self.user.username}, 'another-key', algorithm=settings.JWT_ALG)
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=f'Bearer {token}', HTTP_ACCEPT='application/json')
 
-# Create your tests here.
+        self.assertIn(response.status_code, (401, 403))
+        self.assertIsNone(verified_token_cache.get(token))
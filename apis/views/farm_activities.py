@@ -54,19 +54,21 @@ from ..filters import (
     AddRawMaterialOperationFilter,
     CompostTurningOperationFilter
 )
+from .mixins import EagerLoadingMixin, StreamingListModelMixin, BulkCreateModelMixin, ObservationAggregationMixin
 
 
-class FarmCalendarActivityTypeViewSet(viewsets.ModelViewSet):
+class FarmCalendarActivityTypeViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows FarmCalendarActivityType to be viewed or edited.
     """
     queryset = FarmCalendarActivityType.objects.all().order_by('-name')
+    keyset_ordering = ('-name', '-id')
     serializer_class = FarmCalendarActivityTypeSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['name', 'category']
 
 
-class FarmCalendarActivityViewSet(viewsets.ModelViewSet):
+class FarmCalendarActivityViewSet(EagerLoadingMixin, StreamingListModelMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows FarmCalendarActivity to be viewed or edited.
     """
@@ -77,7 +79,7 @@ class FarmCalendarActivityViewSet(viewsets.ModelViewSet):
     filterset_class = FarmCalendarActivityFilter
 
 
-class AlertViewSet(viewsets.ModelViewSet):
+class AlertViewSet(EagerLoadingMixin, StreamingListModelMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows Alert to be viewed or edited.
     """
@@ -89,7 +91,7 @@ class AlertViewSet(viewsets.ModelViewSet):
     filterset_class = AlertFilter
 
 
-class FertilizationOperationViewSet(viewsets.ModelViewSet):
+class FertilizationOperationViewSet(EagerLoadingMixin, StreamingListModelMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows FertilizationOperation to be viewed or edited.
     """
@@ -99,7 +101,7 @@ class FertilizationOperationViewSet(viewsets.ModelViewSet):
     filterset_class = FertilizationOperationFilter
 
 
-class IrrigationOperationViewSet(viewsets.ModelViewSet):
+class IrrigationOperationViewSet(EagerLoadingMixin, StreamingListModelMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows IrrigationOperation to be viewed or edited.
     """
@@ -115,7 +117,7 @@ class IrrigationOperationViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class CropProtectionOperationViewSet(viewsets.ModelViewSet):
+class CropProtectionOperationViewSet(EagerLoadingMixin, StreamingListModelMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows CropProtectionOperation to be viewed or edited.
     """
@@ -125,7 +127,7 @@ class CropProtectionOperationViewSet(viewsets.ModelViewSet):
     filterset_class = CropProtectionOperationFilter
 
 
-class ObservationViewSet(viewsets.ModelViewSet):
+class ObservationViewSet(EagerLoadingMixin, StreamingListModelMixin, ObservationAggregationMixin, BulkCreateModelMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows Observation to be viewed or edited.
     """
@@ -141,7 +143,7 @@ class ObservationViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class CropStressIndicatorObservationViewSet(viewsets.ModelViewSet):
+class CropStressIndicatorObservationViewSet(EagerLoadingMixin, StreamingListModelMixin, ObservationAggregationMixin, BulkCreateModelMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows CropStressIndicator to be viewed or edited.
     """
@@ -151,7 +153,7 @@ class CropStressIndicatorObservationViewSet(viewsets.ModelViewSet):
     filterset_class = CropStressIndicatorObservationFilter
 
 
-class CropGrowthStageObservationViewSet(viewsets.ModelViewSet):
+class CropGrowthStageObservationViewSet(EagerLoadingMixin, StreamingListModelMixin, ObservationAggregationMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows CropGrowthStageObservation to be viewed or edited.
     """
@@ -161,7 +163,7 @@ class CropGrowthStageObservationViewSet(viewsets.ModelViewSet):
     filterset_class = CropGrowthStageObservationFilter
 
 
-class YieldPredictionObservationViewSet(viewsets.ModelViewSet):
+class YieldPredictionObservationViewSet(EagerLoadingMixin, StreamingListModelMixin, ObservationAggregationMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows YieldPrediction to be viewed or edited.
     """
@@ -171,7 +173,7 @@ class YieldPredictionObservationViewSet(viewsets.ModelViewSet):
     filterset_class = YieldPredictionObservationFilter
 
 
-class DiseaseDetectionObservationViewSet(viewsets.ModelViewSet):
+class DiseaseDetectionObservationViewSet(EagerLoadingMixin, StreamingListModelMixin, ObservationAggregationMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows DiseaseDetection to be viewed or edited.
     """
@@ -181,7 +183,7 @@ class DiseaseDetectionObservationViewSet(viewsets.ModelViewSet):
     filterset_class = DiseaseDetectionObservationFilter
 
 
-class VigorEstimationObservationViewSet(viewsets.ModelViewSet):
+class VigorEstimationObservationViewSet(EagerLoadingMixin, StreamingListModelMixin, ObservationAggregationMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows VigorEstimation to be viewed or edited.
     """
@@ -191,7 +193,7 @@ class VigorEstimationObservationViewSet(viewsets.ModelViewSet):
     filterset_class = VigorEstimationObservationFilter
 
 
-class SprayingRecommendationObservationViewSet(viewsets.ModelViewSet):
+class SprayingRecommendationObservationViewSet(EagerLoadingMixin, StreamingListModelMixin, ObservationAggregationMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows SprayingRecommendation to be viewed or edited.
     """
@@ -201,17 +203,17 @@ class SprayingRecommendationObservationViewSet(viewsets.ModelViewSet):
     filterset_class = SprayingRecommendationObservationFilter
 
 
-class CompostOperationViewSet(viewsets.ModelViewSet):
+class CompostOperationViewSet(EagerLoadingMixin, StreamingListModelMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows CompostOperation to be viewed or edited.
     """
-    queryset = CompostOperation.objects.all().prefetch_related('nested_activities').order_by('-start_datetime')
+    queryset = CompostOperation.objects.all().order_by('-start_datetime')
     serializer_class = CompostOperationSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_class = CompostOperationFilter
 
 
-class AddRawMaterialOperationViewSet(viewsets.ModelViewSet):
+class AddRawMaterialOperationViewSet(EagerLoadingMixin, StreamingListModelMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows AddRawMaterialOperation to be viewed or edited.
     """
@@ -227,7 +229,7 @@ class AddRawMaterialOperationViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class CompostTurningOperationViewSet(viewsets.ModelViewSet):
+class CompostTurningOperationViewSet(EagerLoadingMixin, StreamingListModelMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows CompostTurningOperation to be viewed or edited.
     """
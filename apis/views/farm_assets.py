@@ -12,44 +12,49 @@ from ..serializers import (
     FarmAnimalSerializer,
     AgriculturalMachineSerializer,
 )
+from .mixins import EagerLoadingMixin
 
 
 
-class GenericFarmAssetSerializerViewSet(viewsets.ModelViewSet):
+class GenericFarmAssetSerializerViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows GenericFarmAsset to be viewed or edited.
     """
     queryset = GenericFarmAsset.objects.all().order_by('-created_at')
+    keyset_ordering = ('-created_at', '-id')
     serializer_class = GenericFarmAssetSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['name', 'parcel', 'status']
 
 
-class FarmCropViewSet(viewsets.ModelViewSet):
+class FarmCropViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows FarmCrop to be viewed or edited.
     """
     queryset = FarmCrop.objects.all().order_by('-created_at')
+    keyset_ordering = ('-created_at', '-id')
     serializer_class = FarmCropSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['name', 'parcel', 'species', 'variety', 'growth_stage', 'status']
 
 
-class FarmAnimalViewSet(viewsets.ModelViewSet):
+class FarmAnimalViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows FarmAnimal to be viewed or edited.
     """
     queryset = FarmAnimal.objects.all().order_by('-created_at')
+    keyset_ordering = ('-created_at', '-id')
     serializer_class = FarmAnimalSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['name', 'parcel', 'animal_group', 'status']
 
 
-class AgriculturalMachineViewSet(viewsets.ModelViewSet):
+class AgriculturalMachineViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows AgriculturalMachine to be viewed or edited.
     """
     queryset = AgriculturalMachine.objects.all().order_by('-created_at')
+    keyset_ordering = ('-created_at', '-id')
     serializer_class = AgriculturalMachineSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['name', 'parcel', 'status']
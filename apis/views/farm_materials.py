@@ -8,24 +8,27 @@ from ..serializers import (
     FertilizerSerializer,
     PesticideSerializer
 )
+from .mixins import EagerLoadingMixin
 
 
-class FertilizerViewSet(viewsets.ModelViewSet):
+class FertilizerViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows Fertilizer to be viewed or edited.
     """
     queryset = Fertilizer.objects.all().order_by('-created_at')
+    keyset_ordering = ('-created_at', '-id')
     serializer_class = FertilizerSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['name', 'status']
 
 
 
-class PesticideViewSet(viewsets.ModelViewSet):
+class PesticideViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows Pesticide to be viewed or edited.
     """
     queryset = Pesticide.objects.all().order_by('-created_at')
+    keyset_ordering = ('-created_at', '-id')
     serializer_class = PesticideSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['name', 'status']
@@ -1,34 +1,76 @@
+from drf_spectacular.utils import extend_schema, inline_serializer
 from rest_framework import permissions, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
 from farm_management.models import (
     Farm,
     FarmParcel,
 )
+from farm_management.spatial_index import parcel_spatial_index
+from ..schemas import generate_urn
 from ..serializers import (
     FarmSerializer,
     FarmParcelSerializer,
+    FarmParcelPointsLookupSerializer,
+    FarmParcelPointsLookupResultSerializer,
 )
 
 from ..filters import FarmParcelFilter
+from .mixins import EagerLoadingMixin
 
 
-class FarmViewSet(viewsets.ModelViewSet):
+class FarmViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows Farm to be viewed or edited.
     """
-    queryset = Farm.objects.all().prefetch_related('farm_parcels').order_by('-created_at')
+    queryset = Farm.objects.all().order_by('-created_at')
+    keyset_ordering = ('-created_at', '-id')
     serializer_class = FarmSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_fields = ['name', 'status']
 
 
-class FarmParcelViewSet(viewsets.ModelViewSet):
+class FarmParcelViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows FarmParcel to be viewed or edited.
     """
-    queryset = FarmParcel.objects.all().prefetch_related('farmcrops').order_by('-created_at')
+    queryset = FarmParcel.objects.all().order_by('-created_at')
+    keyset_ordering = ('-created_at', '-id')
     serializer_class = FarmParcelSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     filterset_class = FarmParcelFilter
 
+    @extend_schema(
+        description=(
+            'Finds the parcels containing each one of the given points (e.g., a machinery track), '
+            'in a single request. Results are in the same order as the points. '
+            'The usual parcel filters can be used to restrict which parcels are considered.'
+        ),
+        request=FarmParcelPointsLookupSerializer,
+        responses=inline_serializer('FarmParcelPointsLookupResults', fields={
+            'results': FarmParcelPointsLookupResultSerializer(many=True),
+        }),
+    )
+    @action(detail=False, methods=['post'], url_path='contains-points', pagination_class=None)
+    def contains_points(self, request, *args, **kwargs):
+        serializer = FarmParcelPointsLookupSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        points = serializer.validated_data['points']
+
+        latitudes, longitudes = points[:, 0], points[:, 1]
+        parcel_ids_by_point = parcel_spatial_index.get_parcel_ids_containing_points(longitudes, latitudes)
+        allowed_parcel_ids = set(self.filter_queryset(self.get_queryset()).order_by().values_list('id', flat=True))
 
+        results = [
+            {
+                'point': [latitude, longitude],
+                'parcels': [
+                    generate_urn('FarmParcel', obj_id=parcel_id)
+                    for parcel_id in parcel_ids if parcel_id in allowed_parcel_ids
+                ],
+            }
+            for latitude, longitude, parcel_ids in zip(latitudes.tolist(), longitudes.tolist(), parcel_ids_by_point)
+        ]
+        return Response({'results': results})
@@ -0,0 +1,187 @@
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Min
+from django.db.models.functions import Trunc
+from django.http import StreamingHttpResponse
+
+from drf_spectacular.utils import extend_schema, OpenApiParameter, inline_serializer
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+
+from farm_activities.cache import activity_type_cache
+
+from ..parsers import JSONLDParser
+from ..schemas import generate_urn
+from ..serializers import ObservationAggregationQuerySerializer, ObservationAggregationSerializer
+from ..serializers.base import get_eager_loading_plan
+
+
+class EagerLoadingMixin:
+    """
+    Applies to the view queryset the `select_related` and `prefetch_related` lookups needed
+    by the relations declared in the view serializer, so that serializing a list of objects
+    costs a constant number of queries, instead of a few more queries per object.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        select_related, prefetch_related = get_eager_loading_plan(self.get_serializer_class())
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+
+class StreamingListModelMixin:
+    """
+    Allows list responses to be streamed when the client asks for it with `?stream=true`.
+    Rows are read from the database in chunks (`stream_chunk_size`), serialized one by one
+    and written to the response as they are produced, so memory stays flat regardless of how
+    many rows match. Only used for renderers that support it (i.e., JSON-LD), any other
+    renderer or request falls back to the regular list response. Streamed responses are
+    never paginated.
+    """
+    stream_query_param = 'stream'
+    stream_chunk_size = 2000
+
+    def is_streaming_request(self, request):
+        stream_value = request.query_params.get(self.stream_query_param, '')
+        return (
+            stream_value.lower() in ('1', 'true', 'yes') and
+            hasattr(request.accepted_renderer, 'render_stream')
+        )
+
+    @extend_schema(parameters=[
+        OpenApiParameter(
+            'stream', bool,
+            description='Stream the whole (filtered) list in a single JSON-LD response, ignoring pagination.'
+        ),
+    ])
+    def list(self, request, *args, **kwargs):
+        if not self.is_streaming_request(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer(many=True).child
+        serialized_items = (
+            serializer.to_representation(instance)
+            for instance in queryset.iterator(chunk_size=self.stream_chunk_size)
+        )
+
+        renderer = request.accepted_renderer
+        stream = renderer.render_stream(serialized_items, request.accepted_media_type, self.get_renderer_context())
+        return StreamingHttpResponse(stream, content_type=renderer.media_type)
+
+
+BULK_CREATE_RESULTS_SCHEMA = inline_serializer('BulkCreateItemResult', many=True, fields={
+    '@id': serializers.CharField(required=False),
+    'status': serializers.IntegerField(),
+    'errors': serializers.DictField(required=False),
+})
+
+
+class BulkCreateModelMixin:
+    """
+    Adds a `bulk` action to create many objects in a single request, e.g., a JSON-LD
+    `@graph` array (which is unwrapped by the JSON-LD parser).
+    Each item is validated on its own, and all the valid ones are then created together in a
+    single transaction by the serializer `ListSerializer.create` (which should do a bulk insert).
+    The response lists the result of each item, in the same order as the request:
+    its `@id` if it was created, or its validation errors otherwise.
+    """
+    bulk_max_items = 10000
+
+    def get_serializer(self, *args, **kwargs):
+        if getattr(self, 'action', None) == 'bulk_create':
+            kwargs.setdefault('many', True)
+        return super().get_serializer(*args, **kwargs)
+
+    @extend_schema(
+        description='Creates many objects at once, and returns the result of each of them.',
+        responses={
+            (status.HTTP_201_CREATED, 'application/ld+json'): BULK_CREATE_RESULTS_SCHEMA,
+            (status.HTTP_207_MULTI_STATUS, 'application/ld+json'): BULK_CREATE_RESULTS_SCHEMA,
+        },
+    )
+    @action(
+        detail=False, methods=['post'], url_path='bulk',
+        parser_classes=[JSONLDParser, JSONParser], filter_backends=[], pagination_class=None,
+    )
+    def bulk_create(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError('Expected a list of items.')
+        if len(items) > self.bulk_max_items:
+            raise ValidationError(f'Expected at most {self.bulk_max_items} items, received {len(items)}.')
+
+        serializer = self.get_serializer()
+        results = []
+        valid_items = []
+        # the activity types are read once for all the items, instead of checking the cache for each one
+        with activity_type_cache.snapshot():
+            for item in items:
+                try:
+                    valid_items.append(serializer.child.run_validation(item))
+                    results.append(None)
+                except ValidationError as exc:
+                    results.append({'status': status.HTTP_400_BAD_REQUEST, 'errors': exc.detail})
+
+            with transaction.atomic():
+                instances = iter(self.perform_bulk_create(serializer, valid_items))
+
+        for index, result in enumerate(results):
+            if result is None:
+                instance = next(instances)
+                results[index] = {
+                    '@id': generate_urn(instance.__class__.__name__, obj_id=instance.pk),
+                    'status': status.HTTP_201_CREATED,
+                }
+
+        response_status = status.HTTP_201_CREATED if len(valid_items) == len(items) else status.HTTP_207_MULTI_STATUS
+        return Response(results, status=response_status)
+
+    def perform_bulk_create(self, serializer, validated_items):
+        if not validated_items:
+            return []
+        return serializer.create(validated_items)
+
+
+class ObservationAggregationMixin:
+    """
+    Adds an `aggregate` action that returns the min, max, mean and count of the numeric values
+    of the (filtered) observations per time bucket (`interval`), also grouped by the `groupBy`
+    fields and the value unit. It is computed in the database, so plotting a long series
+    only transfers one row per bucket, instead of every observation.
+    Observations whose value is not a number are left out.
+    """
+
+    @extend_schema(
+        description=(
+            'Returns the min, max, mean and count of the numeric observation values per time bucket '
+            '(and per each of the `groupBy` fields and unit). The usual filters can be used as well.'
+        ),
+        parameters=[ObservationAggregationQuerySerializer],
+        responses=ObservationAggregationSerializer(many=True),
+    )
+    @action(detail=False, methods=['get'], url_path='aggregate', pagination_class=None)
+    def aggregate(self, request, *args, **kwargs):
+        query_serializer = ObservationAggregationQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        group_fields = [
+            ObservationAggregationQuerySerializer.GROUP_BY_FIELDS[name]
+            for name in query_serializer.validated_data['groupBy']
+        ]
+
+        queryset = self.filter_queryset(self.get_queryset()).filter(numeric_value__isnull=False)
+        buckets = queryset.prefetch_related(None).order_by().annotate(
+            bucket=Trunc('start_datetime', query_serializer.validated_data['interval']),
+        ).values(*group_fields, 'value_unit', 'bucket').annotate(
+            min=Min('numeric_value'),
+            max=Max('numeric_value'),
+            mean=Avg('numeric_value'),
+            count=Count('pk'),
+        ).order_by(*group_fields, 'value_unit', 'bucket')
+        return Response(ObservationAggregationSerializer(buckets, many=True).data)
@@ -3,18 +3,19 @@
 # Exit script on error
 set -e
 
-# re-generating schema.yml
-echo "re-generating and validating schema.yml"
-python3 manage.py spectacular --validate --color --file schema.yml
+# re-generating schema.yml, registering the endpoints in gatekeeper, migrations, collectstatic
+# and initial data, in a single process (skipping the steps whose inputs did not change)
+echo "Running startup steps"
+python3 manage.py startup
 
-# registrating endpoints
-echo "running service registration"
-python3 manage.py service_registration
+# geo ids of new geometries are registered in the background, by the agstack_registration_worker
+# command, that runs in its own container (the registration-worker service of docker-compose.yml)
 
-# Run initial_setup file
-echo "Running initial setup"
-python3 manage.py initial_setup
-
-# Start the Django app with waitress
-echo "Starting Django server with Waitress..."
-exec python3 run_waitress.py
+# Start the Django app with gunicorn (multiple worker processes, see gunicorn.conf.py),
+# or with waitress (a single process) if APP_SERVER=waitress
+if [ "${APP_SERVER:-gunicorn}" = "waitress" ]; then
+    echo "Starting Django server with Waitress..."
+    exec python3 run_waitress.py
+fi
+echo "Starting Django server with Gunicorn..."
+exec gunicorn --config gunicorn.conf.py
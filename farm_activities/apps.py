@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class FarmActivitiesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'farm_activities'
+
+    def ready(self):
+        from . import signals  # noqa: F401
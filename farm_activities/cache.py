@@ -0,0 +1,41 @@
+from django.apps import apps
+
+from farm_calendar.utils.process_cache import ProcessLocalCache
+
+
+class FarmCalendarActivityTypeCache(ProcessLocalCache):
+    """
+    Process-local cache of every FarmCalendarActivityType, by id and by name.
+    These are very few rows that almost never change, but are needed for creating
+    most activities. It is invalidated whenever an activity type is saved or deleted
+    (see signals.py), in every process.
+    The cached instances are shared, so they should not be modified.
+    """
+    version_model = 'farm_management.ProcessCacheVersion'
+    version_key = 'farm_activity_types'
+
+    def load(self):
+        FarmCalendarActivityType = apps.get_model('farm_activities', 'FarmCalendarActivityType')
+        activity_types = list(FarmCalendarActivityType.objects.all())
+        return (
+            {activity_type.pk: activity_type for activity_type in activity_types},
+            {activity_type.name: activity_type for activity_type in activity_types},
+        )
+
+    def get_by_id(self, pk):
+        by_id, _ = self.get()
+        return by_id.get(pk)
+
+    def get_by_name(self, name):
+        _, by_name = self.get()
+        return by_name.get(name)
+
+    def get_or_create_by_name(self, name):
+        activity_type = self.get_by_name(name)
+        if activity_type is None:
+            FarmCalendarActivityType = apps.get_model('farm_activities', 'FarmCalendarActivityType')
+            activity_type, _ = FarmCalendarActivityType.objects.get_or_create(name=name)
+        return activity_type
+
+
+activity_type_cache = FarmCalendarActivityTypeCache()
@@ -1,6 +1,23 @@
 from django.conf import settings
 
-from ..models import FarmCalendarActivityType
+from ..cache import activity_type_cache
+from ..models import (
+    FarmCalendarActivityType,
+    Observation,
+    Alert,
+    FertilizationOperation,
+    IrrigationOperation,
+    CropProtectionOperation,
+    CropStressIndicatorObservation,
+    CropGrowthStageObservation,
+    YieldPredictionObservation,
+    DiseaseDetectionObservation,
+    VigorEstimationObservation,
+    SprayingRecommendationObservation,
+    CompostOperation,
+    AddRawMaterialOperation,
+    CompostTurningOperation,
+)
 from .base import *
 from .builtin_activities import *
 
@@ -21,7 +38,7 @@ def get_generic_farm_calendar_activity_form(activity_type):
         settings.DEFAULT_CALENDAR_ACTIVITY_TYPES['compost_turning_operation']['name']: CompostTurningOperationForm,
     }
 
-    activity_type_instance = FarmCalendarActivityType.objects.filter(name=activity_type).first()
+    activity_type_instance = activity_type_cache.get_by_name(activity_type)
     if activity_type_instance is None:
         return None
     is_observation = activity_type_instance.category == FarmCalendarActivityType.ActivityCategoryChoices.OBSERVATION
@@ -37,3 +54,29 @@ def get_generic_farm_calendar_activity_form(activity_type):
             ActivityModelForm = FarmCalendarActivityForm
 
     return ActivityModelForm
+
+
+
+def get_farm_calendar_activity_form_for_model(activity_model):
+    """
+    Same as get_generic_farm_calendar_activity_form, but based on the concrete model of an
+    existing activity (see FarmCalendarActivity.concrete_model_label), which avoids
+    querying its activity type.
+    """
+    model_modelform_map = {
+        FertilizationOperation: FertilizationOperationForm,
+        IrrigationOperation: IrrigationOperationForm,
+        CropProtectionOperation: CropProtectionOperationForm,
+        CropStressIndicatorObservation: CropStressIndicatorObservationForm,
+        CropGrowthStageObservation: CropGrowthStageObservationForm,
+        YieldPredictionObservation: YieldPredictionObservationForm,
+        DiseaseDetectionObservation: DiseaseDetectionObservationForm,
+        VigorEstimationObservation: VigorEstimationObservationForm,
+        SprayingRecommendationObservation: SprayingRecommendationObservationForm,
+        CompostOperation: CompostOperationForm,
+        AddRawMaterialOperation: AddRawMaterialOperationForm,
+        CompostTurningOperation: CompostTurningOperationForm,
+        Observation: ObservationForm,
+        Alert: AlertForm,
+    }
+    return model_modelform_map.get(activity_model, FarmCalendarActivityForm)
@@ -57,8 +57,10 @@ class ParentActivityForm(FarmCalendarActivityForm):
         super().__init__(*args, **kwargs)
 
         if self.instance and self.instance.pk:
-            self.fields['nested_activities'].queryset = self.instance.nested_activities.all()
-            self.initial['nested_activities'] = self.instance.nested_activities.all()
+            # only read when rendered (by the widget, which just needs their titles)
+            nested_activities = self.instance.nested_activities.all()
+            self.fields['nested_activities'].queryset = nested_activities
+            self.initial['nested_activities'] = nested_activities
 
 
 class NestedActivityForm(FarmCalendarActivityForm):
@@ -0,0 +1,124 @@
+import datetime
+import random
+import re
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from farm_activities.models import FarmCalendarActivity, FarmCalendarActivityType
+from farm_management.models import Farm, FarmParcel
+
+
+# the composite indexes that are benchmarked (they are dropped for the "before" run)
+BENCHMARKED_INDEX_NAMES = ['farm_activity_parcel_start_idx', 'farm_activity_type_start_idx']
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds many farm activities and shows the query plans and timings of the API filter queries "
+        "(parcel or activity type with a period, nested activities) before and after the composite "
+        "indexes on the farm activities table. Everything runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200000, help='Number of seeded activities.')
+        parser.add_argument('--parcels', type=int, default=100, help='Number of seeded parcels.')
+        parser.add_argument('--activity-types', type=int, default=20, help='Number of seeded activity types.')
+        parser.add_argument('--repeat', type=int, default=5, help='Number of runs per query (the best one is reported).')
+        parser.add_argument('--plans', action='store_true', help='Print the whole query plans.')
+
+    def seed(self, rows, parcels_count, activity_types_count):
+        farm = Farm.objects.create(name='Benchmark farm')
+        parcels = FarmParcel.objects.bulk_create([
+            FarmParcel(identifier=f'benchmark-parcel-{uuid.uuid4()}', farm=farm, parcel_type='benchmark')
+            for _ in range(parcels_count)
+        ])
+        activity_types = FarmCalendarActivityType.objects.bulk_create([
+            FarmCalendarActivityType(name=f'Benchmark activity {uuid.uuid4()}')
+            for _ in range(activity_types_count)
+        ])
+
+        # about two years of activities, some of them nested in one of the first ones
+        random.seed(0)
+        end = timezone.now()
+        period_seconds = int(datetime.timedelta(days=730).total_seconds())
+        parents = []
+        activities = []
+        for index in range(rows):
+            activity = FarmCalendarActivity(
+                activity_type=random.choice(activity_types),
+                parcel=random.choice(parcels),
+                title='Benchmark',
+                start_datetime=end - datetime.timedelta(seconds=random.randrange(period_seconds)),
+            )
+            if index < 1000:
+                parents.append(activity)
+            elif random.random() < 0.1:
+                activity.parent_activity = random.choice(parents)
+            activities.append(activity)
+        FarmCalendarActivity.objects.bulk_create_activities(activities, batch_size=5000)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {FarmCalendarActivity._meta.db_table}')
+        return parcels[0], activity_types[0], parents[0], end
+
+    def get_queries(self, parcel, activity_type, parent, end):
+        # as done by the API filters (fromDate/toDate) and viewsets ordering
+        period = {'start_datetime__gte': end - datetime.timedelta(days=30), 'start_datetime__lte': end}
+        activities = FarmCalendarActivity.objects.order_by('-start_datetime')
+        return [
+            ('parcel + period', activities.filter(parcel=parcel, **period)),
+            ('activity type + period', activities.filter(activity_type=activity_type, **period)),
+            ('parcel, latest 50', activities.filter(parcel=parcel)[:50]),
+            ('nested activities', activities.filter(parent_activity=parent)),
+        ]
+
+    def run_queries(self, queries, repeat):
+        results = {}
+        for label, queryset in queries:
+            best = None
+            for _ in range(repeat):
+                plan = queryset.explain(analyze=True)
+                execution_time = float(re.search(r'Execution Time: ([\d.]+) ms', plan).group(1))
+                best = execution_time if best is None else min(best, execution_time)
+            results[label] = (best, plan)
+        return results
+
+    def drop_benchmarked_indexes(self):
+        indexes = [index for index in FarmCalendarActivity._meta.indexes if index.name in BENCHMARKED_INDEX_NAMES]
+        with connection.schema_editor(atomic=False) as schema_editor:
+            for index in indexes:
+                schema_editor.remove_index(FarmCalendarActivity, index)
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {FarmCalendarActivity._meta.db_table}')
+
+    def write_plan(self, plan):
+        for line in plan.splitlines():
+            self.stdout.write(f'      {line}')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.stdout.write(f"Seeding {options['rows']} activities...")
+            queries = self.get_queries(*self.seed(options['rows'], options['parcels'], options['activity_types']))
+            after = self.run_queries(queries, options['repeat'])
+            self.drop_benchmarked_indexes()
+            before = self.run_queries(queries, options['repeat'])
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'query':<24} {'before':>10} {'after':>10}")
+        for label, _ in queries:
+            before_time, before_plan = before[label]
+            after_time, after_plan = after[label]
+            self.stdout.write(f'{label:<24} {before_time:7.2f} ms {after_time:7.2f} ms')
+            if options['plans']:
+                self.stdout.write('    before:')
+                self.write_plan(before_plan)
+                self.stdout.write('    after:')
+                self.write_plan(after_plan)
+            else:
+                # only the scans, i.e., how the rows are found
+                for name, plan in [('before', before_plan), ('after', after_plan)]:
+                    scans = [re.sub(r'\s+\(cost=.*', '', line).strip(' ->') for line in plan.splitlines() if 'Scan' in line]
+                    self.stdout.write(f"    {name + ':':<8}{'; '.join(scans)}")
@@ -0,0 +1,54 @@
+import timeit
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from farm_calendar.utils.url_templates import cached_reverse, get_url_template
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark of the URL reversing done for each row of the calendar feed and activity types API."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Number of reversed URLs per run.')
+        parser.add_argument('--repeat', type=int, default=5, help='Number of runs (the best one is reported).')
+
+    def benchmark(self, label, run, rows, repeat):
+        best = min(timeit.repeat(run, number=1, repeat=repeat))
+        per_row_us = best / rows * 1e6
+        self.stdout.write(f'{label:<16} {best * 1000:10.1f} ms total {per_row_us:10.2f} us/row')
+        return best
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        repeat = options['repeat']
+        pks = [uuid.uuid4() for _ in range(rows)]
+        version_args = [settings.SHORT_API_VERSION]
+
+        def run_reverse():
+            for pk in pks:
+                reverse('calendar_activity_edit', kwargs={'pk': pk})
+                reverse('observation-list', args=version_args)
+
+        def run_cached_reverse():
+            for pk in pks:
+                cached_reverse('calendar_activity_edit', kwargs={'pk': pk})
+                cached_reverse('observation-list', args=version_args)
+
+        def run_url_template():
+            detail_url_template = get_url_template('calendar_activity_edit', kwarg_names=['pk'])
+            list_url = get_url_template('observation-list', args=version_args)
+            for pk in pks:
+                detail_url_template.format(pk=pk)
+                list_url.format()
+
+        self.stdout.write(f'Reversing 2 URLs per row, for {rows} rows (best of {repeat} runs):')
+        reverse_time = self.benchmark('reverse', run_reverse, rows, repeat)
+        cached_time = self.benchmark('cached_reverse', run_cached_reverse, rows, repeat)
+        template_time = self.benchmark('url template', run_url_template, rows, repeat)
+        self.stdout.write(self.style.SUCCESS(
+            f'cached_reverse is {reverse_time / cached_time:.1f}x faster, '
+            f'formatting a url template is {reverse_time / template_time:.1f}x faster'
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-16 22:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farm_activities', '0014_alter_farmcalendaractivity_start_datetime'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='farmcalendaractivity',
+            name='concrete_model_label',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=100),
+        ),
+    ]
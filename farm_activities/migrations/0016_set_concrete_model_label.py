@@ -0,0 +1,46 @@
+from django.db import migrations
+
+
+# most specialized models first, so each activity gets labeled with its concrete model
+ACTIVITY_MODELS_BY_SPECIALIZATION = [
+    'CropStressIndicatorObservation',
+    'CropGrowthStageObservation',
+    'YieldPredictionObservation',
+    'DiseaseDetectionObservation',
+    'VigorEstimationObservation',
+    'SprayingRecommendationObservation',
+    'Observation',
+    'Alert',
+    'FertilizationOperation',
+    'IrrigationOperation',
+    'CropProtectionOperation',
+    'CompostOperation',
+    'CompostTurningOperation',
+    'AddRawMaterialOperation',
+    'FarmCalendarActivity',
+]
+
+
+def operation(apps, schema_editor):
+    FarmCalendarActivity = apps.get_model('farm_activities', 'FarmCalendarActivity')
+    for model_name in ACTIVITY_MODELS_BY_SPECIALIZATION:
+        ActivityModel = apps.get_model('farm_activities', model_name)
+        FarmCalendarActivity.objects.filter(
+            concrete_model_label='', pk__in=ActivityModel.objects.values('pk')
+        ).update(concrete_model_label=f'farm_activities.{model_name.lower()}')
+
+
+def reverse_op(apps, schema_editor):
+    FarmCalendarActivity = apps.get_model('farm_activities', 'FarmCalendarActivity')
+    FarmCalendarActivity.objects.update(concrete_model_label='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farm_activities', '0015_farmcalendaractivity_concrete_model_label'),
+    ]
+
+    operations = [
+        migrations.RunPython(operation, reverse_op),
+    ]
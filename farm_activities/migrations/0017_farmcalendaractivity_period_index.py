@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-16 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farm_activities', '0016_set_concrete_model_label'),
+        ('farm_management', '0007_alter_farmparcel_geo_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='farmcalendaractivity',
+            index=models.Index(fields=['start_datetime', 'end_datetime'], name='farm_activity_period_idx'),
+        ),
+    ]
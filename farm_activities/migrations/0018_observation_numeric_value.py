@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-16 23:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farm_activities', '0017_farmcalendaractivity_period_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='observation',
+            name='numeric_value',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+    ]
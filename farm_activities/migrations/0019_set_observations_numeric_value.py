@@ -0,0 +1,56 @@
+import math
+
+from django.db import migrations, transaction
+
+
+BATCH_SIZE = 2000
+
+
+def parse_numeric_value(value):
+    try:
+        number = float(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(number):
+        return None
+    return number
+
+
+def operation(apps, schema_editor):
+    """
+    Sets the numeric value of the existing observations, in batches (each one committed on its own),
+    so that it can be resumed if interrupted: the observations already set are skipped.
+    """
+    Observation = apps.get_model('farm_activities', 'Observation')
+    observations = Observation.objects.filter(numeric_value__isnull=True).order_by('pk')
+    last_pk = None
+    while True:
+        batch = observations if last_pk is None else observations.filter(pk__gt=last_pk)
+        batch = list(batch.values_list('pk', 'value')[:BATCH_SIZE])
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+        updated_observations = [
+            Observation(pk=pk, numeric_value=numeric_value)
+            for pk, value in batch
+            if (numeric_value := parse_numeric_value(value)) is not None
+        ]
+        with transaction.atomic():
+            Observation.objects.bulk_update(updated_observations, ['numeric_value'])
+
+
+def reverse_op(apps, schema_editor):
+    Observation = apps.get_model('farm_activities', 'Observation')
+    Observation.objects.update(numeric_value=None)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('farm_activities', '0018_observation_numeric_value'),
+    ]
+
+    operations = [
+        migrations.RunPython(operation, reverse_op),
+    ]
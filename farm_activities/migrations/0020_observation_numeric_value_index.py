@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-16 23:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farm_activities', '0019_set_observations_numeric_value'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='observation',
+            name='numeric_value',
+            field=models.FloatField(blank=True, db_index=True, editable=False, null=True),
+        ),
+    ]
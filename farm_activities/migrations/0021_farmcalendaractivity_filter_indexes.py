@@ -0,0 +1,22 @@
+# Generated by Django 5.1.2 on 2026-10-16 23:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farm_activities', '0020_observation_numeric_value_index'),
+        ('farm_management', '0010_geo_id_registration'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='farmcalendaractivity',
+            index=models.Index(fields=['parcel', 'start_datetime'], name='farm_activity_parcel_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='farmcalendaractivity',
+            index=models.Index(fields=['activity_type', 'start_datetime'], name='farm_activity_type_start_idx'),
+        ),
+    ]
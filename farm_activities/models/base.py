@@ -1,10 +1,15 @@
+import math
 import uuid
 import datetime
-from django.db import models
+
+from django.apps import apps
+from django.db import models, transaction
 from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import RegexValidator
 
+from ..cache import activity_type_cache
+
 
 
 class FarmCalendarActivityType(models.Model):
@@ -52,6 +57,94 @@ class FarmCalendarActivityType(models.Model):
         return self.name
 
 
+def parse_numeric_value(value):
+    """
+    Returns the (finite) number in the `value` string, or None if it is not a number.
+    """
+    try:
+        number = float(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(number):
+        return None
+    return number
+
+
+class FarmCalendarActivityQuerySet(models.QuerySet):
+
+    def resolve_concrete_models(self):
+        """
+        Returns a dict mapping the pk of each activity to its most specialized model class,
+        read from the `concrete_model_label` discriminator (no child tables are queried).
+        """
+        return {
+            pk: apps.get_model(label) if label else FarmCalendarActivity
+            for pk, label in self.values_list('pk', 'concrete_model_label')
+        }
+
+    def bulk_create_activities(self, objs, batch_size=None):
+        """
+        Inserts many (unsaved) activities of this queryset model at once.
+        Django's `bulk_create` does not support multi-table inherited models, so this
+        inserts the rows of each table of the model inheritance chain (base table first),
+        with one bulk insert per table, inside a transaction.
+        It fills in the same defaults as `FarmCalendarActivity.save` (derived fields, such as the
+        concrete model label, activity type and title), but does not save many-to-many relations nor send signals.
+        """
+        objs = list(objs)
+        if not objs:
+            return objs
+
+        # looked up once per built-in activity type, not for each object
+        default_activity_types = {
+            obj.ACTIVITY_NAME: None for obj in objs if obj.activity_type_id is None and obj.ACTIVITY_NAME is not None
+        }
+        for name in default_activity_types:
+            default_activity_types[name] = activity_type_cache.get_or_create_by_name(name)
+
+        for obj in objs:
+            obj._set_derived_fields()
+            if obj.activity_type_id is None and obj.ACTIVITY_NAME is not None:
+                obj.activity_type = default_activity_types[obj.ACTIVITY_NAME]
+            if obj.title is None or obj.title == '':
+                obj.title = obj.activity_type.name
+
+        # ancestors are listed from the closest to the base model
+        table_models = [*reversed(self.model._meta.get_parent_list()), self.model]
+        with transaction.atomic(using=self.db, savepoint=False):
+            for table_model in table_models:
+                for parent_link in table_model._meta.parents.values():
+                    for obj in objs:
+                        setattr(obj, parent_link.attname, obj.id)
+                fields = [field for field in table_model._meta.local_concrete_fields if not field.generated]
+                # the private bulk insert of bulk_create, which (unlike it) can insert into a single table
+                # of an inherited model. Its signature is the one of Django 5.1 (pinned in requirements.txt),
+                # checked by FarmCalendarActivityQuerySetTests, so it should be reviewed when upgrading Django
+                table_model._base_manager.using(self.db)._batched_insert(
+                    objs=objs, fields=fields, batch_size=batch_size,
+                )
+
+        for obj in objs:
+            obj._state.adding = False
+            obj._state.db = self.db
+        return objs
+
+    def overlapping(self, start=None, end=None):
+        """
+        Filters the activities that happen (at least partially) within [start, end).
+        Activities without an end datetime are treated as instant ones.
+        Either bound can be left as None for an open-ended period.
+        """
+        queryset = self
+        if end is not None:
+            queryset = queryset.filter(start_datetime__lt=end)
+        if start is not None:
+            queryset = queryset.filter(
+                Q(end_datetime__gt=start) | Q(end_datetime__isnull=True, start_datetime__gte=start)
+            )
+        return queryset
+
+
 class FarmCalendarActivity(models.Model):
     """
     An occurrence of some farm activity on the calendar.
@@ -61,9 +154,17 @@ class FarmCalendarActivity(models.Model):
     class Meta:
         verbose_name = "Farm Activity"
         verbose_name_plural = "Farm Activities"
+        indexes = [
+            models.Index(fields=['start_datetime', 'end_datetime'], name='farm_activity_period_idx'),
+            # the API filters by these along with a start datetime range, and orders by start datetime
+            models.Index(fields=['parcel', 'start_datetime'], name='farm_activity_parcel_start_idx'),
+            models.Index(fields=['activity_type', 'start_datetime'], name='farm_activity_type_start_idx'),
+        ]
 
     ACTIVITY_NAME = None
 
+    objects = FarmCalendarActivityQuerySet.as_manager()
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, db_index=True, editable=False, unique=True,
                           blank=False, null=False, verbose_name='ID')
 
@@ -96,12 +197,36 @@ class FarmCalendarActivity(models.Model):
         blank=True
     )
 
+    # label of the most specialized model of this activity (e.g., 'farm_activities.irrigationoperation'),
+    # so that finding out the subclass of an activity does not require checking every child table.
+    # It is set on save (and by bulk_create_activities), so it must be set explicitly when using bulk_create.
+    concrete_model_label = models.CharField(max_length=100, blank=True, default='', editable=False, db_index=True)
+
     def __str__(self):
         return f"{self.title} ({self.start_datetime.strftime('%Y-%m-%d %H:%M')})"
 
+    @property
+    def concrete_model(self):
+        if not self.concrete_model_label:
+            return self.__class__
+        return apps.get_model(self.concrete_model_label)
+
+    def _set_concrete_model_label(self):
+        # saving an activity through one of its parent models must not lose its more specialized model
+        if not self.concrete_model_label or issubclass(self.__class__, self.concrete_model):
+            self.concrete_model_label = self._meta.label_lower
+
+    def _set_derived_fields(self):
+        """
+        Sets the fields that are computed from the others, before saving.
+        """
+        self._set_concrete_model_label()
+
     def save(self, *args, **kwargs):
-        if self.activity_type is None and self.ACTIVITY_NAME is not None:
-            self.activity_type, _ = FarmCalendarActivityType.objects.get_or_create(name=self.ACTIVITY_NAME)
+        self._set_derived_fields()
+
+        if self.activity_type_id is None and self.ACTIVITY_NAME is not None:
+            self.activity_type = activity_type_cache.get_or_create_by_name(self.ACTIVITY_NAME)
 
         if self.title is None or self.title == '':
             self.title = self.activity_type.name
@@ -119,6 +244,19 @@ class Observation(FarmCalendarActivity):
     value = models.CharField(max_length=255)
     value_unit = models.CharField(max_length=255, blank=True, null=True)
     observed_property = models.CharField(max_length=255)
+    # the `value` as a number (if it is one), set on save, so that it can be filtered, sorted
+    # and aggregated in the database
+    numeric_value = models.FloatField(blank=True, null=True, editable=False, db_index=True)
+
+    def _set_derived_fields(self):
+        super()._set_derived_fields()
+        self.numeric_value = parse_numeric_value(self.value)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'value' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'numeric_value'}
+        super().save(*args, **kwargs)
 
 
 class Alert(FarmCalendarActivity):
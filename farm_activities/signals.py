@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .cache import activity_type_cache
+from .models import FarmCalendarActivityType
+
+
+@receiver(post_save, sender=FarmCalendarActivityType)
+@receiver(post_delete, sender=FarmCalendarActivityType)
+def invalidate_activity_type_cache(sender, **kwargs):
+    activity_type_cache.invalidate()
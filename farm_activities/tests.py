@@ -1,7 +1,27 @@
-from django.test import TestCase
+import datetime
+import inspect
+from unittest import mock
+
+from django.db import connection, transaction
+from django.db.models.query import QuerySet
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth.models import User
 
+from .models import (
+    FarmCalendarActivity,
+    FarmCalendarActivityType,
+    Observation,
+    IrrigationOperation,
+    CropStressIndicatorObservation,
+    CompostOperation,
+    CompostTurningOperation,
+)
+from .cache import activity_type_cache
+from .forms import CompostOperationForm, IrrigationOperationForm, ObservationForm
+from farm_management.models import Farm, FarmParcel, FarmCrop, ProcessCacheVersion
+
 class FarmActivitiesTests(TestCase):
 
     def setUp(self):
@@ -20,3 +40,260 @@ class FarmActivitiesTests(TestCase):
 
         # Assert that the response status code is 200 (OK)
         self.assertEqual(response.status_code, 200)
+
+    def test_calendar_activity_list_only_returns_activities_overlapping_period(self):
+        self.client.login(username='testuser', password='testpass')
+        activity_type = FarmCalendarActivityType.objects.create(name='Some Activity')
+
+        def create_activity(title, start, end=None):
+            FarmCalendarActivity.objects.create(
+                activity_type=activity_type, title=title,
+                start_datetime=datetime.datetime.fromisoformat(start),
+                end_datetime=datetime.datetime.fromisoformat(end) if end else None,
+            )
+
+        create_activity('before', '2024-01-20T10:00:00+00:00', '2024-01-31T23:00:00+00:00')
+        create_activity('started before', '2024-01-25T10:00:00+00:00', '2024-02-02T10:00:00+00:00')
+        create_activity('instant', '2024-02-10T10:00:00+00:00')
+        create_activity('ends after', '2024-02-28T10:00:00+00:00', '2024-03-05T10:00:00+00:00')
+        create_activity('spans period', '2024-01-01T10:00:00+00:00', '2024-04-01T10:00:00+00:00')
+        create_activity('after', '2024-03-01T00:00:00+00:00')
+
+        response = self.client.get(reverse('calendar_activity_list'), {
+            'start': '2024-02-01T00:00:00+00:00', 'end': '2024-03-01T00:00:00+00:00',
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(activity['title'] for activity in response.json()),
+            ['ends after', 'instant', 'spans period', 'started before'],
+        )
+
+    def test_calendar_activity_list_detail_url(self):
+        self.client.login(username='testuser', password='testpass')
+        activity = FarmCalendarActivity.objects.create(
+            activity_type=FarmCalendarActivityType.objects.create(name='Some Activity'),
+        )
+
+        response = self.client.get(reverse('calendar_activity_list'))
+
+        self.assertEqual(
+            response.json()[0]['detail_url'], reverse('calendar_activity_edit', kwargs={'pk': activity.pk})
+        )
+
+    def test_calendar_activity_list_with_invalid_period_returns_400(self):
+        self.client.login(username='testuser', password='testpass')
+
+        response = self.client.get(reverse('calendar_activity_list'), {'start': 'not-a-date'})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_activity_edit_uses_concrete_activity_form(self):
+        self.client.login(username='testuser', password='testpass')
+        activity_type = FarmCalendarActivityType.objects.create(name='Some Irrigation')
+        irrigation = IrrigationOperation.objects.create(
+            activity_type=activity_type, applied_amount=1, applied_amount_unit='L',
+        )
+
+        response = self.client.get(reverse('calendar_activity_edit', kwargs={'pk': irrigation.pk}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.context['form'], IrrigationOperationForm)
+        self.assertEqual(response.context['form'].instance, irrigation)
+
+
+class FarmCalendarActivityQuerySetTests(TestCase):
+
+    def test_resolve_concrete_models_returns_most_specialized_model(self):
+        activity_type = FarmCalendarActivityType.objects.create(name='Some Activity')
+        farm = Farm.objects.create(name='Farm')
+        crop = FarmCrop.objects.create(
+            name='Crop', species='grape',
+            parcel=FarmParcel.objects.create(identifier='parcel-1', farm=farm, parcel_type='vineyard'),
+        )
+        activity = FarmCalendarActivity.objects.create(activity_type=activity_type)
+        irrigation = IrrigationOperation.objects.create(
+            activity_type=activity_type, applied_amount=1, applied_amount_unit='L',
+        )
+        stress_observation = CropStressIndicatorObservation.objects.create(
+            activity_type=activity_type, value='1', observed_property='stress', crop=crop,
+        )
+
+        with self.assertNumQueries(1):
+            concrete_models = FarmCalendarActivity.objects.resolve_concrete_models()
+
+        self.assertEqual(concrete_models, {
+            activity.pk: FarmCalendarActivity,
+            irrigation.pk: IrrigationOperation,
+            stress_observation.pk: CropStressIndicatorObservation,
+        })
+
+    def test_parent_activity_form_reads_nested_activities_when_rendered(self):
+        activity_type = FarmCalendarActivityType.objects.create(name='Some Activity')
+        compost_operation = CompostOperation.objects.create(activity_type=activity_type, compost_pile_id='pile-1')
+        turning = CompostTurningOperation.objects.create(
+            activity_type=activity_type, title='Turning', parent_activity=compost_operation,
+        )
+        observation = Observation.objects.create(
+            activity_type=activity_type, title='Reading', value='1', observed_property='temperature',
+            parent_activity=compost_operation,
+        )
+
+        # only the agricultural machinery initial value
+        with self.assertNumQueries(1):
+            form = CompostOperationForm(instance=compost_operation)
+
+        rendered = str(form['nested_activities'])
+        self.assertIn(str(turning), rendered)
+        self.assertIn(str(observation), rendered)
+
+    def test_saving_through_parent_model_keeps_concrete_model(self):
+        activity_type = FarmCalendarActivityType.objects.create(name='Some Observation')
+        observation = Observation.objects.create(activity_type=activity_type, value='1', observed_property='stress')
+
+        activity = FarmCalendarActivity.objects.get(pk=observation.pk)
+        activity.title = 'Renamed'
+        activity.save()
+
+        activity.refresh_from_db()
+        self.assertEqual(activity.concrete_model_label, 'farm_activities.observation')
+        self.assertIs(activity.concrete_model, Observation)
+
+
+    def test_bulk_create_activities_inserts_every_table(self):
+        activity_type = FarmCalendarActivityType.objects.create(name='Some Activity')
+        crop = FarmCrop.objects.create(
+            name='Crop', species='grape',
+            parcel=FarmParcel.objects.create(
+                identifier='parcel-1', farm=Farm.objects.create(name='Farm'), parcel_type='vineyard',
+            ),
+        )
+
+        observations = CropStressIndicatorObservation.objects.bulk_create_activities([
+            CropStressIndicatorObservation(activity_type=activity_type, value=str(i), observed_property='stress', crop=crop)
+            for i in range(3)
+        ])
+
+        self.assertEqual(
+            sorted(CropStressIndicatorObservation.objects.values_list('pk', 'value', 'crop', 'title')),
+            sorted((observation.pk, observation.value, crop.pk, 'Some Activity') for observation in observations),
+        )
+        self.assertEqual(Observation.objects.count(), 3)
+        self.assertEqual(FarmCalendarActivity.objects.resolve_concrete_models(), {
+            observation.pk: CropStressIndicatorObservation for observation in observations
+        })
+
+    def test_bulk_create_activities_private_insert_is_supported(self):
+        # bulk_create_activities relies on this private method, whose signature changed between Django releases
+        parameters = inspect.signature(QuerySet._batched_insert).parameters
+        self.assertEqual(
+            list(parameters)[:4], ['self', 'objs', 'fields', 'batch_size'],
+            'QuerySet._batched_insert changed, bulk_create_activities must be updated for this Django version',
+        )
+        self.assertTrue(
+            all(parameter.default is not inspect.Parameter.empty for parameter in list(parameters.values())[4:]),
+            'QuerySet._batched_insert has new required arguments, bulk_create_activities must be updated',
+        )
+
+
+class FarmCalendarActivityTypeCacheTests(TransactionTestCase):
+
+    def setUp(self):
+        activity_type_cache.clear()
+        self.addCleanup(activity_type_cache.clear)
+
+    def test_built_in_activity_type_is_only_queried_once(self):
+        activity_type = FarmCalendarActivityType.objects.create(name=IrrigationOperation.ACTIVITY_NAME)
+        IrrigationOperation.objects.create(applied_amount=1, applied_amount_unit='L')
+
+        with CaptureQueriesContext(connection) as queries:
+            irrigation = IrrigationOperation(applied_amount=2, applied_amount_unit='L')
+            irrigation.save()
+
+        self.assertEqual(irrigation.activity_type, activity_type)
+        # only the transaction and the inserts on the activity and irrigation tables
+        self.assertEqual(len(queries), 4)
+        self.assertFalse([
+            query for query in queries
+            if 'farm_activities_farmcalendaractivitytype' in query['sql'] or 'processcacheversion' in query['sql']
+        ])
+
+    def test_bulk_create_reads_built_in_activity_type_once(self):
+        FarmCalendarActivityType.objects.create(name=IrrigationOperation.ACTIVITY_NAME)
+
+        def count_queries(objs_count):
+            # within a transaction, where the cache does not keep what it loads
+            with transaction.atomic(), CaptureQueriesContext(connection) as queries:
+                IrrigationOperation.objects.bulk_create_activities([
+                    IrrigationOperation(applied_amount=i, applied_amount_unit='L') for i in range(objs_count)
+                ])
+            return len(queries)
+
+        self.assertEqual(count_queries(2), count_queries(20))
+
+    def test_snapshot_is_read_once(self):
+        activity_type = FarmCalendarActivityType.objects.create(name='Some Type')
+
+        with transaction.atomic(), activity_type_cache.snapshot():
+            with self.assertNumQueries(0):
+                self.assertEqual(activity_type_cache.get_by_name('Some Type'), activity_type)
+                self.assertEqual(activity_type_cache.get_by_id(activity_type.pk), activity_type)
+
+    def test_cache_is_refreshed_when_activity_types_change(self):
+        activity_type = FarmCalendarActivityType.objects.create(name='Old Name')
+        self.assertEqual(activity_type_cache.get_by_name('Old Name'), activity_type)
+
+        activity_type.name = 'New Name'
+        activity_type.save()
+        self.assertIsNone(activity_type_cache.get_by_name('Old Name'))
+        self.assertEqual(activity_type_cache.get_by_id(activity_type.pk).name, 'New Name')
+
+        activity_type.delete()
+        self.assertIsNone(activity_type_cache.get_by_name('New Name'))
+
+    def test_cache_is_refreshed_when_invalidated_by_another_process(self):
+        activity_type = FarmCalendarActivityType.objects.create(name='Old Name')
+        self.assertEqual(activity_type_cache.get_by_name('Old Name'), activity_type)
+
+        # as done by another process, whose signals do not clear this process cache
+        FarmCalendarActivityType.objects.filter(pk=activity_type.pk).update(name='New Name')
+        self.assertIsNotNone(activity_type_cache.get_by_name('Old Name'))
+        ProcessCacheVersion.increase(activity_type_cache.version_key)
+        # the version was just checked
+        self.assertIsNotNone(activity_type_cache.get_by_name('Old Name'))
+
+        with mock.patch.object(activity_type_cache, 'version_check_interval', 0):
+            self.assertIsNone(activity_type_cache.get_by_name('Old Name'))
+        self.assertEqual(activity_type_cache.get_by_name('New Name'), activity_type)
+
+
+class ObservationNumericValueTests(TestCase):
+
+    def setUp(self):
+        self.activity_type = FarmCalendarActivityType.objects.create(name='Some Observation', category='observation')
+
+    def test_form_sets_numeric_value(self):
+        form = ObservationForm(data={
+            'activity_type': self.activity_type.pk, 'title': 'Reading', 'start_datetime': '2024-05-01T10:00',
+            'value': ' 12.5 ', 'observed_property': 'temperature',
+        })
+        self.assertTrue(form.is_valid(), form.errors)
+        observation = form.save()
+
+        observation.refresh_from_db()
+        self.assertEqual(observation.numeric_value, 12.5)
+
+        form = ObservationForm(instance=observation, data={**form.data, 'value': 'high'})
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+
+        observation.refresh_from_db()
+        self.assertIsNone(observation.numeric_value)
+
+    def test_saving_value_with_update_fields_updates_numeric_value(self):
+        observation = Observation.objects.create(activity_type=self.activity_type, value='1', observed_property='stress')
+        observation.value = '2'
+        observation.save(update_fields=['value'])
+
+        observation.refresh_from_db()
+        self.assertEqual(observation.numeric_value, 2)
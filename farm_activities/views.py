@@ -1,15 +1,22 @@
+import datetime
 import json
 
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.exceptions import BadRequest
 from django.db.models import CharField
 from django.db.models.functions import Concat
-from django.http import JsonResponse
+from django.http import JsonResponse, Http404
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django.views.generic import ListView, UpdateView
 from django.views import View
 
+from farm_calendar.utils.url_templates import get_url_template
+
+from .cache import activity_type_cache
 from .models import (
     FarmCalendarActivity,
     FarmCalendarActivityType,
@@ -18,6 +25,7 @@ from .forms import (
     FarmCalendarActivityTypeSelectionForm,
     FarmCalendarActivityTypeForm,
     get_generic_farm_calendar_activity_form,
+    get_farm_calendar_activity_form_for_model,
 )
 
 class CalendarView(LoginRequiredMixin, View):
@@ -114,8 +122,8 @@ class FarmCalendarActivityCreateByTypeView(LoginRequiredMixin, View):
     def get(self, request, activity_type):
         GenericActivityForm = get_generic_farm_calendar_activity_form(activity_type=activity_type)
         if GenericActivityForm is None:
-            redirect('pre_register_calendar_activity')
-        activity_type_instance = FarmCalendarActivityType.objects.get(name=activity_type)
+            return redirect('pre_register_calendar_activity')
+        activity_type_instance = activity_type_cache.get_by_name(activity_type)
         form = GenericActivityForm(initial={'activity_type': activity_type_instance, 'title': activity_type_instance.name})
         return render(request, self.template_name, {'form': form})
 
@@ -129,9 +137,33 @@ class FarmCalendarActivityCreateByTypeView(LoginRequiredMixin, View):
 
 
 class FarmCalendarActivityListView(LoginRequiredMixin, View):
+
+    def get_period_bound(self, request, param_name):
+        # FullCalendar sends the visible period as ISO8601 'start' and 'end' query parameters
+        value = request.GET.get(param_name)
+        if not value:
+            return None
+        try:
+            bound = parse_datetime(value)
+            if bound is None:
+                date_value = parse_date(value)
+                if date_value is None:
+                    raise ValueError(value)
+                bound = datetime.datetime.combine(date_value, datetime.time.min)
+        except ValueError:
+            raise BadRequest(f'Invalid {param_name} datetime: {value}')
+        if timezone.is_naive(bound):
+            bound = timezone.make_aware(bound)
+        return bound
+
     def get(self, request):
+        start = self.get_period_bound(request, 'start')
+        end = self.get_period_bound(request, 'end')
+        activities = FarmCalendarActivity.objects.overlapping(start, end).select_related('activity_type')
+
+        detail_url_template = get_url_template('calendar_activity_edit', kwarg_names=['pk'])
         activities_json_data = []
-        for activity in FarmCalendarActivity.objects.select_related('activity_type').all():
+        for activity in activities:
             end_time = activity.end_datetime.isoformat() if activity.end_datetime else None
             activities_json_data.append({
                 'title': activity.title,
@@ -141,7 +173,7 @@ class FarmCalendarActivityListView(LoginRequiredMixin, View):
                 'backgroundColor': activity.activity_type.background_color,
                 'borderColor': activity.activity_type.border_color,
                 'textColor': activity.activity_type.text_color,
-                'detail_url': reverse('calendar_activity_edit', kwargs={'pk': activity.pk})
+                'detail_url': detail_url_template.format(pk=activity.pk)
             })
         return JsonResponse(activities_json_data, safe=False)
 
@@ -150,9 +182,12 @@ class FarmCalendarActivityEdit(LoginRequiredMixin, View):
     template_name = 'farm_activities/activities/activity_form.html'
 
     def get_specific_activity_object_and_form(self, pk):
-        base_object = get_object_or_404(FarmCalendarActivity, pk=pk)
-        GenericActivityForm = get_generic_farm_calendar_activity_form(activity_type=base_object.activity_type.name)
-        main_object = get_object_or_404(GenericActivityForm.Meta.model.objects.prefetch_related('activity_type', 'nested_activities'), pk=pk)
+        concrete_models = FarmCalendarActivity.objects.filter(pk=pk).resolve_concrete_models()
+        if pk not in concrete_models:
+            raise Http404('No FarmCalendarActivity matches the given query.')
+        ActivityModel = concrete_models[pk]
+        GenericActivityForm = get_farm_calendar_activity_form_for_model(ActivityModel)
+        main_object = get_object_or_404(ActivityModel.objects.prefetch_related('activity_type', 'nested_activities'), pk=pk)
         return main_object, GenericActivityForm
 
     def get_asset_delete_api_url(self, model_name, pk):
@@ -1,3 +1,4 @@
+import importlib.util
 import json
 import os
 from pathlib import Path
@@ -99,6 +100,12 @@ if GATEKEEPER_LOGIN_URL is not None:
     FARMCALENDAR_GATEKEEPER_USER = config('FARMCALENDAR_GATEKEEPER_USER')
     FARMCALENDAR_GATEKEEPER_PASSWORD = config('FARMCALENDAR_GATEKEEPER_PASSWORD')
 
+GATEKEEPER_REGISTRATION_WORKERS = config('GATEKEEPER_REGISTRATION_WORKERS', default=8, cast=int)
+# hashes of the endpoints already registered, so that they are not registered again on every start
+GATEKEEPER_REGISTRATION_STATE_FILE = config(
+    'GATEKEEPER_REGISTRATION_STATE_FILE', default=str(BASE_DIR / 'logs' / 'gatekeeper_registration_state.json')
+)
+
 none_if_empty_cast = lambda x: None if x == '' else x
 AGSTACK_ASSET_REGISTY_API_URL = config('AGSTACK_ASSET_REGISTY_API_URL', default=None, cast=none_if_empty_cast)
 
@@ -111,6 +118,16 @@ if AGSTACK_ASSET_REGISTY_API_URL is not None:
         'register_field_boundary': config('AGSTACK_ENDPOINT_REGISTER_FIELD_BOUNDARY', default='/register-field-boundary'),
     }
 
+# geo ids are registered in the background, by the agstack_registration_worker command
+AGSTACK_REQUEST_TIMEOUT = config('AGSTACK_REQUEST_TIMEOUT', default=10, cast=float)
+AGSTACK_POOL_MAXSIZE = config('AGSTACK_POOL_MAXSIZE', default=10, cast=int)
+AGSTACK_REGISTRATION_MAX_ATTEMPTS = config('AGSTACK_REGISTRATION_MAX_ATTEMPTS', default=10, cast=int)
+# seconds before the first retry, doubled after each failed attempt (up to the max delay)
+AGSTACK_REGISTRATION_RETRY_DELAY = config('AGSTACK_REGISTRATION_RETRY_DELAY', default=30, cast=int)
+AGSTACK_REGISTRATION_MAX_RETRY_DELAY = config('AGSTACK_REGISTRATION_MAX_RETRY_DELAY', default=3600, cast=int)
+# seconds a task is claimed by a worker while it is registered (should be longer than the request timeout)
+AGSTACK_REGISTRATION_CLAIM_TIMEOUT = config('AGSTACK_REGISTRATION_CLAIM_TIMEOUT', default=300, cast=int)
+
 
 
 REPORTING_API_ROOT = config('REPORTING_API_ROOT', default='http://localhost:8011/api/v1/')
@@ -155,6 +172,12 @@ JWT_COOKIE_NAME = config('JWT_COOKIE_NAME')
 JWT_LOCAL_USER_ID_FIELD = config('JWT_LOCAL_USER_ID_FIELD', default='username')
 AUTO_CREATE_AUTH_USER = config('AUTO_CREATE_AUTH_USER', default=True, cast=bool)
 POST_AUTH_TOKEN_ATTRIBUTE = config('POST_AUTH_TOKEN_ATTRIBUTE', default='access_token')
+# verified tokens (and their users) are cached until they expire, for at most this many seconds
+JWT_VERIFICATION_CACHE_TTL = config('JWT_VERIFICATION_CACHE_TTL', default=300, cast=int)
+JWT_VERIFICATION_CACHE_SIZE = config('JWT_VERIFICATION_CACHE_SIZE', default=10000, cast=int)
+
+# max number of memoized URNs of the objects identified by a hash of their values (e.g., quantity values)
+HASHED_URN_CACHE_SIZE = config('HASHED_URN_CACHE_SIZE', default=10000, cast=int)
 
 #lets igore RSA-based signing for now...
 # with open(str(BASE_DIR / 'public.pem'), 'r') as f:
@@ -167,12 +190,16 @@ SHORT_API_VERSION = f'v{DEFAULT_API_VERSION.split(".")[0]}'
 
 API_SCHEMA_FILE_PATH = BASE_DIR / 'schema.yml'
 
+# hashes of the inputs of the startup steps (e.g., schema generation), so that they are skipped when unchanged
+STARTUP_STATE_FILE = config('STARTUP_STATE_FILE', default=str(BASE_DIR / 'logs' / 'startup_state.json'))
+
 REST_FRAMEWORK = {
     'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.URLPathVersioning',
     'DEFAULT_VERSION': SHORT_API_VERSION,
     'ALLOWED_VERSIONS': ['v1',],
     'VERSION_PARAM': 'version',
-    'DEFAULT_PAGINATION_CLASS': None,
+    # opt-in: only paginates when the request sends 'cursor' or 'page_size'
+    'DEFAULT_PAGINATION_CLASS': 'apis.pagination.KeysetPagination',
     # 'PAGE_SIZE': 99999999,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 
@@ -270,9 +297,29 @@ DATABASES = {
         'PASSWORD': config('POSTGRES_PASSWORD'),
         'HOST': config('POSTGRES_HOST'),
         'PORT': config('POSTGRES_PORT', default=5432, cast=int),
+        # seconds a connection is kept open for the next requests of the same worker thread (0 closes it after
+        # each request, None keeps it forever), checking that it still works before reusing it
+        'CONN_MAX_AGE': config('POSTGRES_CONN_MAX_AGE', default=60, cast=lambda x: None if x in ('', 'None') else int(x)),
+        'CONN_HEALTH_CHECKS': config('POSTGRES_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        'OPTIONS': {
+            'connect_timeout': config('POSTGRES_CONNECT_TIMEOUT', default=10, cast=int),
+        },
     }
 }
 
+# connection pool shared by the threads of each worker process, only supported with psycopg 3
+# (persistent connections are used instead with psycopg2)
+POSTGRES_POOL = config('POSTGRES_POOL', default=False, cast=bool)
+if POSTGRES_POOL:
+    if importlib.util.find_spec('psycopg') is None or importlib.util.find_spec('psycopg_pool') is None:
+        raise ImproperlyConfigured('POSTGRES_POOL requires the "psycopg[pool]" package (psycopg 3)')
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': config('POSTGRES_POOL_MIN_SIZE', default=1, cast=int),
+        'max_size': config('POSTGRES_POOL_MAX_SIZE', default=4, cast=int),
+        'timeout': config('POSTGRES_POOL_TIMEOUT', default=10, cast=int),
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
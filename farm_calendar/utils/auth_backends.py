@@ -1,21 +1,27 @@
 from django.conf import settings
 from django.contrib.auth.backends import BaseBackend
 from django.contrib.auth import get_user_model
-from django.contrib.auth import authenticate
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
-from farm_calendar.utils.jwt_utils import get_user_id_from_token, get_token_from_jwt_request
+from farm_calendar.utils.auth_middlewares import get_jwt_user
+from farm_calendar.utils.jwt_utils import get_user_id_from_token, get_token_from_jwt_request, verified_token_cache
 
 
 class CustomJWTAuthenticationBackend(BaseBackend):
-    def authenticate(self, request, token, **kwargs):
+    def authenticate(self, request, token=None, **kwargs):
         user_id = get_user_id_from_token(token)
         if not user_id:
             return None
 
+        # the local user of an already verified token is cached along with it
+        user = verified_token_cache.get_user(token)
+        if user is not None:
+            return user
+
         user = self.get_user(user_id)
         if user is not None:
+            verified_token_cache.set_user(token, user)
             return user
 
     def get_user(self, user_id):
@@ -43,7 +49,8 @@ class CustomJWTAuthentication(BaseAuthentication):
         token = get_token_from_jwt_request(request)
         if not token:
             return None  # No authentication token, let other authenticators try
-        user = authenticate(request, token=token)
+        # the same user as the one (lazily) set by JWTAuthenticationMiddleware
+        user = get_jwt_user(request._request)
         if user is None:
             raise AuthenticationFailed('Invalid or expired token')
 
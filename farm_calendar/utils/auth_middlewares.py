@@ -1,16 +1,28 @@
 from django.contrib.auth import authenticate
+from django.contrib.auth.middleware import get_user
+from django.utils.functional import SimpleLazyObject
 
 from farm_calendar.utils.jwt_utils import get_token_from_jwt_request
 
+
+def get_jwt_user(request):
+    """
+    Returns the user of the JWT of the request, or None if there is no (valid) token.
+    It is only resolved once per request, and reused by the API authentication.
+    """
+    if not hasattr(request, '_cached_jwt_user'):
+        token = get_token_from_jwt_request(request)
+        request._cached_jwt_user = authenticate(request, token=token) if token else None
+    return request._cached_jwt_user
+
+
 class JWTAuthenticationMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
-        token = get_token_from_jwt_request(request)
-        user = authenticate(request, token=token)
-        if user:
-            request.user = user
+        # resolved when first used, so requests that never use it (e.g., static files) do not pay for it
+        request.user = SimpleLazyObject(lambda: get_jwt_user(request) or get_user(request))
 
         response = self.get_response(request)
         return response
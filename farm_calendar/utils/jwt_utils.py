@@ -1,16 +1,101 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
 from django.conf import settings
 
 import jwt
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
 
+
+class VerifiedTokenCache:
+    """
+    Bounded (least recently used) process-local cache of the claims of the already verified
+    tokens, and of their local users, keyed by the token hash.
+    An entry expires with its token, or after JWT_VERIFICATION_CACHE_TTL seconds.
+    The users are forgotten when they are saved or deleted (see farm_management/signals.py)
+    in this process, changes done by other processes are picked up when the entry expires.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def _get_key(self, token):
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token):
+        """Returns the cached entry (a dict with the 'claims' and 'user') of the token, if any."""
+        key = self._get_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry['expires_at'] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, token, claims):
+        expires_at = time.time() + settings.JWT_VERIFICATION_CACHE_TTL
+        if isinstance(claims.get('exp'), (int, float)):
+            expires_at = min(expires_at, claims['exp'])
+        entry = {'claims': claims, 'user': None, 'expires_at': expires_at}
+        key = self._get_key(token)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.JWT_VERIFICATION_CACHE_SIZE:
+                self._entries.popitem(last=False)
+        return entry
+
+    def get_user(self, token):
+        """Returns a copy of the cached local user of the token (so that it can be modified), if any."""
+        entry = self.get(token)
+        if entry is None or entry['user'] is None:
+            return None
+        return copy.copy(entry['user'])
+
+    def set_user(self, token, user):
+        entry = self.get(token)
+        if entry is not None:
+            entry['user'] = copy.copy(user)
+
+    def forget_user(self, user_pk):
+        with self._lock:
+            for entry in self._entries.values():
+                if entry['user'] is not None and entry['user'].pk == user_pk:
+                    entry['user'] = None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+verified_token_cache = VerifiedTokenCache()
+
+
 def decode_jwt(token):
+    """
+    Returns the claims of the token, or None if it is invalid or has expired.
+    Verified tokens are cached, so the returned claims should not be modified.
+    """
+    if not token:
+        return None
+    entry = verified_token_cache.get(token)
+    if entry is not None:
+        return entry['claims']
     try:
         decoded_token = jwt.decode(token, settings.JWT_SIGNING_KEY, algorithms=[settings.JWT_ALG])
-        return decoded_token
     except ExpiredSignatureError:
         return None  # Token has expired
     except InvalidTokenError:
         return None  # Invalid token
+    verified_token_cache.set(token, decoded_token)
+    return decoded_token
 
 def get_token_from_header(request):
     auth_header = request.headers.get('Authorization')
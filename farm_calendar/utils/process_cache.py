@@ -0,0 +1,94 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db import connection
+
+
+class ProcessLocalCache:
+    """
+    Base for caches of data derived from the database that is kept in memory in each process.
+    Subclasses implement `load`, whose result is returned by `get` while it is fresh.
+    Since each (gunicorn) worker has its own copy, the data can have a version shared by every
+    process, kept under `version_key` by `version_model` (the label of a model with the
+    `get_version(key)` and `increase(key)` class methods, e.g. `ProcessCacheVersion`), that
+    `invalidate` increases (e.g., from a model signal) within the transaction that changes the data.
+    `get` reads that version (a single row) at most every `version_check_interval` seconds, and
+    reloads the data if it changed, so the changes done by other processes are picked up shortly
+    after they are committed (and right away by the process that did them). The data also expires
+    after `timeout` seconds, in case it is changed without invalidating it (e.g., with `QuerySet.update`).
+    Without a `version_model`, only the process that invalidates it reloads the data before it expires.
+    """
+    timeout = 300
+    version_model = None
+    version_key = None
+    version_check_interval = 5
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.clear()
+
+    def load(self):
+        raise NotImplementedError
+
+    def clear(self):
+        with self._lock:
+            self._value = None
+            self._version = None
+            self._expires_at = 0
+            self._version_checked_at = 0
+
+    def get_version(self):
+        if self.version_model is None:
+            return None
+        return apps.get_model(self.version_model).get_version(self.version_key)
+
+    def invalidate(self):
+        if self.version_model is not None:
+            # committed (or rolled back) along with the change of the data
+            apps.get_model(self.version_model).increase(self.version_key)
+        self.clear()
+
+    @contextmanager
+    def snapshot(self):
+        """
+        Within this context, `get` (in this thread) returns the data read (or loaded) once when
+        it starts, without checking its version again, e.g. for the many lookups of a bulk operation
+        (even in a transaction, where the data is not cached). Changes are picked up after it ends.
+        """
+        previous_snapshot = getattr(self._local, 'snapshot', None)
+        self._local.snapshot = self.get()
+        try:
+            yield
+        finally:
+            self._local.snapshot = previous_snapshot
+
+    def get(self):
+        snapshot = getattr(self._local, 'snapshot', None)
+        if snapshot is not None:
+            return snapshot
+
+        now = time.monotonic()
+        value = self._value
+        if value is not None and now <= self._expires_at:
+            if now <= self._version_checked_at + self.version_check_interval:
+                return value
+            # read before loading, so that data changed in between is reloaded on the next check
+            version = self.get_version()
+            if version == self._version:
+                self._version_checked_at = now
+                return value
+        else:
+            version = self.get_version()
+
+        value = self.load()
+        # rows read inside a transaction may still be rolled back, so only cache committed data
+        if not connection.in_atomic_block:
+            with self._lock:
+                self._value = value
+                self._version = version
+                self._expires_at = now + self.timeout
+                self._version_checked_at = now
+        return value
@@ -5,3 +5,5 @@ class FarmManagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'farm_management'
 
+    def ready(self):
+        from . import signals  # noqa: F401
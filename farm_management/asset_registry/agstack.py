@@ -2,15 +2,26 @@ from urllib.parse import urljoin
 from django.conf import settings
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 class AgstackClient:
     """
     A simple client for interacting with the AgStack API.
+    Requests go through a `requests.Session`, so connections are reused
+    when the same client is used for many requests (e.g., by the registration worker).
     """
 
-    def __init__(self):
+    def __init__(self, session=None, timeout=None, pool_maxsize=None):
         self.api_url = settings.AGSTACK_ASSET_REGISTY_API_URL
+        self.timeout = timeout if timeout is not None else settings.AGSTACK_REQUEST_TIMEOUT
+        if session is None:
+            # should be at least the number of threads sharing this client
+            pool_maxsize = pool_maxsize or settings.AGSTACK_POOL_MAXSIZE
+            session = requests.Session()
+            session.mount('http://', HTTPAdapter(pool_maxsize=pool_maxsize))
+            session.mount('https://', HTTPAdapter(pool_maxsize=pool_maxsize))
+        self.session = session
 
     def register_field_boundary(self, wkt_geometry, threshold=95, s2_index=(8, 13)):
         # s2_index_str = ",".join(map(str, s2_index))
@@ -29,7 +40,7 @@ class AgstackClient:
             # "s2_index": s2_index_str  # Optional: comma-separated S2 indices if needed
         }
         endpoint_url = urljoin(self.api_url, settings.AGSTACK_ENDPOINTS['register_field_boundary'])
-        resp = requests.post(endpoint_url, json=data, headers=headers)
+        resp = self.session.post(endpoint_url, json=data, headers=headers, timeout=self.timeout)
 
         geo_id = None
         try:
@@ -51,4 +62,3 @@ if __name__ == '__main__':
 
     wkt_geometry = "POLYGON((5.714800882907841 50.83967331197391,5.714729694830028 50.839206943235155,5.716022320453463 50.839169065366434,5.715939892152838 50.83967094463168,5.714800882907841 50.83967331197391))"
     print(client.register_field_boundary(wkt_geometry))
-
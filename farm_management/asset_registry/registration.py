@@ -0,0 +1,223 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from farm_management.models import GeoIdRegistrationTask, LocationBaseModel
+
+from .agstack import AgstackClient
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_retry_delay(attempts):
+    """Exponential backoff (in seconds) after the given number of failed attempts."""
+    delay = settings.AGSTACK_REGISTRATION_RETRY_DELAY * 2 ** max(attempts - 1, 0)
+    return min(delay, settings.AGSTACK_REGISTRATION_MAX_RETRY_DELAY)
+
+
+def _set_object_geo_id(task, geo_id, geo_id_status):
+    model = task.content_type.model_class()
+    # only if the geometry was not changed since the task was created (it would have a newer task then)
+    updated_objects = model.objects.filter(pk=task.object_id, geometry=task.geometry)
+    with transaction.atomic():
+        return updated_objects.update(geo_id=geo_id, geo_id_status=geo_id_status)
+
+
+def claim_due_task():
+    """
+    Claims the next due task (pending, or whose previous claim expired) in a short transaction,
+    marking it in progress until `AGSTACK_REGISTRATION_CLAIM_TIMEOUT` seconds later, so that other
+    workers (and `bulk_register_geo_ids`) skip it while it is registered without holding a lock.
+    If the worker dies meanwhile, it is claimed again after that. Returns None if there is none.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        task = GeoIdRegistrationTask.objects.select_for_update(skip_locked=True, of=('self',)).select_related(
+            'content_type'
+        ).filter(
+            status__in=[GeoIdRegistrationTask.TaskStatus.PENDING, GeoIdRegistrationTask.TaskStatus.IN_PROGRESS],
+            next_attempt_at__lte=now,
+        ).order_by('next_attempt_at').first()
+        if task is None:
+            return None
+        task.status = GeoIdRegistrationTask.TaskStatus.IN_PROGRESS
+        task.attempts += 1
+        task.next_attempt_at = now + timedelta(seconds=settings.AGSTACK_REGISTRATION_CLAIM_TIMEOUT)
+        task.save(update_fields=['status', 'attempts', 'next_attempt_at', 'updated_at'])
+    return task
+
+
+def _fail_task(task, error, retry=True):
+    logger.warning(f'Failed to register geo id of {task} (attempt {task.attempts}): {error}')
+    task.last_error = str(error)
+    if retry and task.attempts < settings.AGSTACK_REGISTRATION_MAX_ATTEMPTS:
+        task.status = GeoIdRegistrationTask.TaskStatus.PENDING
+        task.next_attempt_at = timezone.now() + timedelta(seconds=get_retry_delay(task.attempts))
+    else:
+        task.status = GeoIdRegistrationTask.TaskStatus.FAILED
+        _set_object_geo_id(task, None, LocationBaseModel.GeoIdStatus.FAILED)
+    task.save(update_fields=['last_error', 'status', 'next_attempt_at', 'updated_at'])
+
+
+def process_task(task, client):
+    """
+    Registers the geometry of one (claimed) task, outside of any transaction, then updates the task and
+    its object with the result. Returns True if it was registered.
+    """
+    try:
+        geo_id = client.register_field_boundary(task.geometry)
+    except (ValueError, OSError) as e:
+        _fail_task(task, e)
+        return False
+
+    try:
+        with transaction.atomic():
+            _set_object_geo_id(task, geo_id, LocationBaseModel.GeoIdStatus.REGISTERED)
+            task.status = GeoIdRegistrationTask.TaskStatus.DONE
+            task.last_error = ''
+            task.save(update_fields=['last_error', 'status', 'updated_at'])
+    except IntegrityError as e:
+        # the geo id is already used by another object (e.g., with the same geometry), retrying would not change it
+        _fail_task(task, e, retry=False)
+        return False
+    return True
+
+
+def process_due_tasks(client=None, batch_size=100):
+    """
+    Processes up to `batch_size` tasks that are due, claiming each one before registering it.
+    Tasks claimed by other workers are skipped, so many workers can run at the same time.
+    Returns the number of (registered, failed) tasks.
+    """
+    client = client or AgstackClient()
+    registered = failed = 0
+    for _ in range(batch_size):
+        task = claim_due_task()
+        if task is None:
+            break
+        if process_task(task, client):
+            registered += 1
+        else:
+            failed += 1
+    return registered, failed
+
+
+def register_geometries(geometries, client, max_workers=None):
+    """
+    Registers the (distinct) `geometries` concurrently, with up to `max_workers` threads
+    sharing `client`. Returns a dict of geometry -> geo id and a dict of geometry -> error.
+    """
+    geo_ids = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers or settings.AGSTACK_POOL_MAXSIZE) as executor:
+        futures = {
+            executor.submit(client.register_field_boundary, geometry): geometry
+            for geometry in geometries
+        }
+        for future in as_completed(futures):
+            geometry = futures[future]
+            try:
+                geo_ids[geometry] = future.result()
+            except (ValueError, OSError) as e:
+                errors[geometry] = str(e)
+    return geo_ids, errors
+
+
+def _claim_object_tasks(model, objs):
+    """
+    Claims the due tasks of `objs`, as done by `claim_due_task`. Returns the ids of the claimed
+    tasks, and the ids of the objects whose tasks are claimed (or locked) by a worker.
+    """
+    now = timezone.now()
+    tasks = GeoIdRegistrationTask.objects.filter(
+        content_type=ContentType.objects.get_for_model(model), object_id__in=[obj.pk for obj in objs],
+        status__in=[GeoIdRegistrationTask.TaskStatus.PENDING, GeoIdRegistrationTask.TaskStatus.IN_PROGRESS],
+    )
+    with transaction.atomic():
+        claimed_task_ids = list(
+            tasks.select_for_update(skip_locked=True).filter(
+                Q(status=GeoIdRegistrationTask.TaskStatus.PENDING) | Q(next_attempt_at__lte=now)
+            ).values_list('pk', flat=True)
+        )
+        GeoIdRegistrationTask.objects.filter(pk__in=claimed_task_ids).update(
+            status=GeoIdRegistrationTask.TaskStatus.IN_PROGRESS,
+            next_attempt_at=now + timedelta(seconds=settings.AGSTACK_REGISTRATION_CLAIM_TIMEOUT),
+            updated_at=now,
+        )
+    busy_object_ids = set(tasks.exclude(pk__in=claimed_task_ids).values_list('object_id', flat=True))
+    return claimed_task_ids, busy_object_ids
+
+
+def bulk_register_geo_ids(objs, client=None, max_workers=None, batch_size=500):
+    """
+    Registers the geometries of many objects of the same location model (e.g., after
+    importing parcels), sending each distinct geometry only once, and saves their geo ids
+    with a single `bulk_update`. Their pending registration tasks are claimed first, so the
+    objects being registered by the worker are skipped (as failed), and then marked as done.
+    Since geo ids are unique, when several objects get the same geo id (e.g., with the same
+    geometry) only the first one gets it, and the others are marked as failed.
+    Returns the list of registered objects and a dict of object -> error of the rest.
+    """
+    objs = [obj for obj in objs if obj.geometry]
+    if not objs:
+        return [], {}
+    model = type(objs[0])
+    claimed_task_ids, busy_object_ids = _claim_object_tasks(model, objs)
+    failed = {obj: 'It is being registered by the registration worker' for obj in objs if obj.pk in busy_object_ids}
+    objs = [obj for obj in objs if obj.pk not in busy_object_ids]
+    objs_by_geometry = {}
+    for obj in objs:
+        objs_by_geometry.setdefault(obj.geometry, []).append(obj)
+
+    client = client or AgstackClient(pool_maxsize=max_workers)
+    geo_ids, errors = register_geometries(objs_by_geometry, client, max_workers=max_workers)
+    failed.update({obj: errors[geometry] for geometry in errors for obj in objs_by_geometry[geometry]})
+
+    # AgStack may also return the same geo id for different geometries
+    objs_by_geo_id = {}
+    for obj in objs:
+        if obj.geometry in geo_ids:
+            objs_by_geo_id.setdefault(geo_ids[obj.geometry], []).append(obj)
+    used_geo_ids = set(
+        model.objects.filter(geo_id__in=objs_by_geo_id).exclude(
+            pk__in=[obj.pk for obj in objs]
+        ).values_list('geo_id', flat=True)
+    )
+    registered = []
+    duplicated = []
+    for geo_id, geo_id_objs in objs_by_geo_id.items():
+        obj, *duplicated_objs = geo_id_objs
+        if geo_id in used_geo_ids:
+            duplicated_objs.insert(0, obj)
+        else:
+            obj.geo_id = geo_id
+            obj.geo_id_status = model.GeoIdStatus.REGISTERED
+            registered.append(obj)
+        for duplicated_obj in duplicated_objs:
+            duplicated_obj.geo_id = None
+            duplicated_obj.geo_id_status = model.GeoIdStatus.FAILED
+            duplicated.append(duplicated_obj)
+            failed[duplicated_obj] = f'Geo id {geo_id} is already used by another {model._meta.verbose_name}'
+
+    updated_objs = registered + duplicated
+    updated_object_ids = [obj.pk for obj in updated_objs]
+    with transaction.atomic():
+        # cleared first, in case some of them had (and are now changing) the geo ids of the others
+        model.objects.filter(pk__in=updated_object_ids).exclude(geo_id=None).update(geo_id=None)
+        model.objects.bulk_update(updated_objs, ['geo_id', 'geo_id_status'], batch_size=batch_size)
+        claimed_tasks = GeoIdRegistrationTask.objects.filter(pk__in=claimed_task_ids)
+        claimed_tasks.filter(object_id__in=updated_object_ids).update(
+            status=GeoIdRegistrationTask.TaskStatus.DONE, updated_at=timezone.now()
+        )
+        # the ones that could not be registered are left to the worker
+        claimed_tasks.exclude(object_id__in=updated_object_ids).update(
+            status=GeoIdRegistrationTask.TaskStatus.PENDING, next_attempt_at=timezone.now(), updated_at=timezone.now()
+        )
+    return registered, failed
@@ -0,0 +1,62 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from farm_management.asset_registry.registration import bulk_register_geo_ids
+from farm_management.models import FarmParcel
+
+
+class Command(BaseCommand):
+    help = (
+        "Registers the geometries of many farm parcels (e.g., after an import) in the AgStack asset "
+        "registry at once, sending concurrent requests, and saves their geo ids."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--farm', help='Only register the parcels of the farm with this id.')
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Also register the parcels that already have a geo id (by default only the pending or failed ones).'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=settings.AGSTACK_POOL_MAXSIZE,
+            help='Number of concurrent requests to the AgStack API.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Number of parcels loaded and saved at a time.'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.AGSTACK_ASSET_REGISTY_API_URL:
+            raise CommandError('AGSTACK_ASSET_REGISTY_API_URL is not set')
+
+        parcels = FarmParcel.objects.exclude(geometry='').exclude(geometry__isnull=True).order_by('pk')
+        if options['farm']:
+            parcels = parcels.filter(farm_id=options['farm'])
+        if not options['all']:
+            parcels = parcels.filter(geo_id__isnull=True)
+
+        chunk_size = options['chunk_size']
+        total_registered = total_failed = 0
+        start = time.perf_counter()
+        last_pk = None
+        while True:
+            chunk = parcels if last_pk is None else parcels.filter(pk__gt=last_pk)
+            chunk = list(chunk[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1].pk
+            registered, failed = bulk_register_geo_ids(chunk, max_workers=options['workers'])
+            total_registered += len(registered)
+            total_failed += len(failed)
+            for parcel, error in failed.items():
+                self.stderr.write(f'Failed to register parcel {parcel.pk}: {error}')
+
+        elapsed = time.perf_counter() - start
+        total = total_registered + total_failed
+        self.stdout.write(self.style.SUCCESS(
+            f'Registered {total_registered} of {total} parcels ({total_failed} failed) '
+            f'in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.1f} parcels/s)'
+        ))
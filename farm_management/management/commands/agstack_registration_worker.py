@@ -0,0 +1,48 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from farm_management.asset_registry.agstack import AgstackClient
+from farm_management.asset_registry.registration import process_due_tasks
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Registers the pending geometries (e.g., of farm parcels) in the AgStack asset registry "
+        "and sets their geo ids, retrying failed registrations with an exponential backoff."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process the due tasks and exit.')
+        parser.add_argument(
+            '--poll-interval', type=float, default=5,
+            help='Seconds to wait before checking for new tasks, when there are none.'
+        )
+        parser.add_argument('--batch-size', type=int, default=100, help='Max number of tasks processed per check.')
+
+    def handle(self, *args, **options):
+        if not settings.AGSTACK_ASSET_REGISTY_API_URL:
+            # no geometries are registered then (they get a local geo id), e.g. when run by docker compose
+            self.stdout.write('The AgStack asset registry is not configured, there is nothing to register.')
+            return
+        # a single client (and its connection pool) is used for all the registrations
+        client = AgstackClient()
+        while True:
+            # as done for each request, so that a broken or too old (CONN_MAX_AGE) connection is replaced
+            # (unless running within a transaction, e.g. in the tests)
+            if not connection.in_atomic_block:
+                close_old_connections()
+            registered, failed = process_due_tasks(client=client, batch_size=options['batch_size'])
+            if registered or failed:
+                logger.info(f'Registered {registered} geo ids, {failed} failed attempts')
+            if options['once']:
+                self.stdout.write(f'Registered {registered} geo ids, {failed} failed attempts')
+                return
+            if registered + failed < options['batch_size']:
+                time.sleep(options['poll_interval'])
@@ -0,0 +1,68 @@
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+
+def run_client(url, headers, duration):
+    """Sends requests to `url`, one at a time, for `duration` seconds. Returns the latencies and errors count."""
+    session = requests.Session()
+    latencies = []
+    errors = 0
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        try:
+            response = session.get(url, headers=headers)
+            response.content
+            if response.status_code >= 400:
+                errors += 1
+        except requests.RequestException:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+    return latencies, errors
+
+
+class Command(BaseCommand):
+    help = (
+        "Load benchmark of a running server (e.g., started with a different APP_WORKERS each time, "
+        "to check how the throughput scales with the number of worker processes)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help='URL to request, e.g. http://localhost:8002/api/v1/FarmParcels/')
+        parser.add_argument(
+            '--concurrency', type=int, default=8,
+            help='Number of concurrent clients (each one in its own process, so the client is not the bottleneck).'
+        )
+        parser.add_argument('--duration', type=float, default=10, help='Seconds to run the benchmark for.')
+        parser.add_argument(
+            '--header', action='append', default=[], help='Request header, as "Name: value" (can be repeated).'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            headers = dict(header.split(':', 1) for header in options['header'])
+        except ValueError:
+            raise CommandError('Headers should be given as "Name: value"')
+        headers = {name.strip(): value.strip() for name, value in headers.items()}
+
+        concurrency = options['concurrency']
+        duration = options['duration']
+        with ProcessPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(
+                run_client, *zip(*[(options['url'], headers, duration)] * concurrency)
+            ))
+
+        latencies = sorted(latency for client_latencies, _ in results for latency in client_latencies)
+        errors = sum(client_errors for _, client_errors in results)
+        if not latencies:
+            raise CommandError('No requests were made')
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if len(latencies) >= 20 else latencies[-1]
+        self.stdout.write(
+            f'{len(latencies)} requests in {duration:.1f}s with {concurrency} clients ({errors} errors)\n'
+            f'throughput: {len(latencies) / duration:.1f} req/s\n'
+            f'latency: median {statistics.median(latencies) * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms'
+        )
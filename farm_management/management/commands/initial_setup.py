@@ -32,8 +32,9 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('Setting up FarmCalendarActivityType data...'))
         for def_operation_type in settings.DEFAULT_CALENDAR_ACTIVITY_TYPES.values():
             pk = def_operation_type['id']
-            def_operation_type.pop('built_in_class', None)
-            FarmCalendarActivityType.objects.update_or_create(id=pk, defaults=def_operation_type)
+            # copied, since the settings are still used by the rest of the process (e.g., by the startup command)
+            defaults = {key: value for key, value in def_operation_type.items() if key != 'built_in_class'}
+            FarmCalendarActivityType.objects.update_or_create(id=pk, defaults=defaults)
 
     # Check for pending migrations
     def check_pending_migrations(self):
@@ -53,6 +54,12 @@ class Command(BaseCommand):
         logger.info('No pending migrations detected.')
         return False
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--skip-collectstatic', action='store_true',
+            help='Do not collect the static files (e.g., when done separately by the startup command).'
+        )
+
     def handle(self, *args, **options):
         # Check for migration changes
         self.stdout.write(self.style.SUCCESS('Checking for migration changes...'))
@@ -63,9 +70,10 @@ class Command(BaseCommand):
             call_command('migrate')
 
         # Collect static files
-        self.stdout.write(self.style.SUCCESS('Collecting static files...'))
-        logger.info('Collecting static files...')
-        call_command('collectstatic', '--noinput')
+        if not options['skip_collectstatic']:
+            self.stdout.write(self.style.SUCCESS('Collecting static files...'))
+            logger.info('Collecting static files...')
+            call_command('collectstatic', '--noinput')
 
         # Check and set up initial data if necessary
         self.stdout.write(self.style.SUCCESS('Checking for initial data setup...'))
@@ -1,4 +1,7 @@
+import hashlib
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from yaml import load, dump
 try:
     from yaml import CLoader as Loader, CDumper as Dumper
@@ -15,6 +18,7 @@ from django.db.migrations.recorder import MigrationRecorder
 from django.conf import settings
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from farm_activities.models import FarmCalendarActivityType
 
@@ -26,12 +30,25 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 class Command(BaseCommand):
     help = "Register all endpoints for Swagger's API schema into gatekeeper, if gatekeeper is present"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Register all the endpoints, even the ones that did not change since the last registration.'
+        )
+
+    def get_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=settings.GATEKEEPER_REGISTRATION_WORKERS)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
     def login_to_gatekeeper(self):
         data = {
             "username": f"{settings.FARMCALENDAR_GATEKEEPER_USER}",
             "password": f"{settings.FARMCALENDAR_GATEKEEPER_PASSWORD}"
         }
-        response = requests.post(settings.GATEKEEPER_API_LOGIN_URL, data=data)
+        response = self.session.post(settings.GATEKEEPER_API_LOGIN_URL, data=data)
         if response.status_code != 200:
             raise Exception(
                 (
@@ -45,24 +62,59 @@ class Command(BaseCommand):
         token = resp_data.get('access')
         return token
 
+    def get_endpoint_hash(self, endpoint_data):
+        return hashlib.sha256(json.dumps(endpoint_data, sort_keys=True).encode()).hexdigest()
+
+    def load_registration_state(self):
+        """
+        Returns the hashes of the endpoints (by endpoint) that were successfully registered
+        in the current gatekeeper, by previous runs of this command.
+        """
+        try:
+            with open(settings.GATEKEEPER_REGISTRATION_STATE_FILE, 'r') as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if state.get('gatekeeper') != settings.GATEKEEPER_ENDPOINT_REG_URL:
+            return {}
+        return state.get('endpoints', {})
+
+    def save_registration_state(self, endpoint_hashes):
+        state = {'gatekeeper': settings.GATEKEEPER_ENDPOINT_REG_URL, 'endpoints': endpoint_hashes}
+        tmp_path = f'{settings.GATEKEEPER_REGISTRATION_STATE_FILE}.tmp'
+        try:
+            with open(tmp_path, 'w') as file:
+                json.dump(state, file, indent=2, sort_keys=True)
+            os.replace(tmp_path, settings.GATEKEEPER_REGISTRATION_STATE_FILE)
+        except OSError as e:
+            logger.warning(f'Could not save the endpoints registration state: {e}')
+
+    def register_endpoint(self, endpoint_data):
+        endpoint = endpoint_data['endpoint']
+        logger.debug(f'Will try to register endpoint with data: {endpoint_data}')
+        req_headers = {'Authorization': f'Bearer {self.token}'}
+        try:
+            response = self.session.post(settings.GATEKEEPER_ENDPOINT_REG_URL, json=endpoint_data, headers=req_headers)
+        except requests.RequestException as e:
+            logger.error(f'Failed to register endpoint: {endpoint} ({e})')
+            return False
+        if response.status_code in [200, 201]:
+            logger.info(f'Successfully registered endpoint: {endpoint}')
+            return True
+        logger.error(f'Failed to register endpoint: {endpoint}')
+        return False
+
     def register_endpoints(self, endpoints):
+        """
+        Registers the endpoints concurrently (with GATEKEEPER_REGISTRATION_WORKERS threads),
+        and returns the ones that were successfully registered.
+        """
         total_endpoints = len(endpoints)
         logger.info(f'Registering {total_endpoints} endpoints ...')
 
-        failed_endpoints_reg = {}
-        for endpoint_data in endpoints:
-            endpoint = endpoint_data['endpoint']
-            logger.debug(f'Will try to register endpoint with data: {endpoint_data}')
-            req_headers = {'Authorization': f'Bearer {self.token}'}
-            response = requests.post(settings.GATEKEEPER_ENDPOINT_REG_URL, json=endpoint_data, headers=req_headers)
-            if response.status_code in [200, 201]:
-                logger.info(f'Successfully registered endpoint: {endpoint}')
-            else:
-                logger.error(f'Failed to register endpoint: {endpoint}')
-                failed_endpoints_reg[endpoint] = endpoint_data
-        if len(failed_endpoints_reg) > 0:
-            raise Exception(f'Failed to register {len(failed_endpoints_reg.keys())} endpoints: {list(failed_endpoints_reg.keys())}')
-
+        with ThreadPoolExecutor(max_workers=settings.GATEKEEPER_REGISTRATION_WORKERS) as executor:
+            results = list(executor.map(self.register_endpoint, endpoints))
+        return [endpoint_data for endpoint_data, registered in zip(endpoints, results) if registered]
 
     def extract_params(self, method_data):
         params = []
@@ -103,7 +155,8 @@ class Command(BaseCommand):
                 "version": settings.SHORT_API_VERSION,
             }
             if len(combined_params) > 0:
-                data['params'] = "&".join(combined_params)
+                # sorted, so that the data (and its hash) is the same in every run
+                data['params'] = "&".join(sorted(combined_params))
 
             endpoint_data.append(data)
 
@@ -115,9 +168,39 @@ class Command(BaseCommand):
             logger.info('No GATEKEEPER_ENDPOINT_REG_URL defined. Ignoring service endpoint registration...')
             return
 
-        self.token = self.login_to_gatekeeper()
         endpoints = self.parse_endpoints()
+        registered_hashes = {} if options['force'] else self.load_registration_state()
+        endpoint_hashes = {
+            endpoint_data['endpoint']: self.get_endpoint_hash(endpoint_data) for endpoint_data in endpoints
+        }
+        changed_endpoints = [
+            endpoint_data for endpoint_data in endpoints
+            if registered_hashes.get(endpoint_data['endpoint']) != endpoint_hashes[endpoint_data['endpoint']]
+        ]
+        if not changed_endpoints:
+            logger.info(f'All {len(endpoints)} endpoints are already registered.')
+            return
+        logger.info(f'Skipping {len(endpoints) - len(changed_endpoints)} unchanged endpoints.')
+
+        self.session = self.get_session()
+        self.token = self.login_to_gatekeeper()
+        registered_endpoints = self.register_endpoints(changed_endpoints)
 
-        self.register_endpoints(endpoints)
+        # endpoints no longer in the schema are dropped from the state
+        new_registered_hashes = {
+            endpoint: endpoint_hash for endpoint, endpoint_hash in registered_hashes.items()
+            if endpoint_hashes.get(endpoint) == endpoint_hash
+        }
+        for endpoint_data in registered_endpoints:
+            endpoint = endpoint_data['endpoint']
+            new_registered_hashes[endpoint] = endpoint_hashes[endpoint]
+        self.save_registration_state(new_registered_hashes)
+
+        failed_endpoints_reg = [
+            endpoint_data['endpoint'] for endpoint_data in changed_endpoints
+            if endpoint_data not in registered_endpoints
+        ]
+        if len(failed_endpoints_reg) > 0:
+            raise Exception(f'Failed to register {len(failed_endpoints_reg)} endpoints: {failed_endpoints_reg}')
 
-        logger.info('Finished registering endpoints.')
\ No newline at end of file
+        logger.info('Finished registering endpoints.')
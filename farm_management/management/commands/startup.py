@@ -0,0 +1,152 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from importlib.metadata import version
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import get_finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+
+logger = logging.getLogger(__name__)
+
+
+def hash_files(paths, base_dir):
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(os.path.relpath(path, base_dir).encode())
+        with open(path, 'rb') as file:
+            digest.update(hashlib.sha256(file.read()).digest())
+    return digest.hexdigest()
+
+
+def hash_file(path):
+    try:
+        with open(path, 'rb') as file:
+            return hashlib.sha256(file.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs every step needed before starting the server (API schema generation, gatekeeper "
+        "registration, migrations, collectstatic and initial data) in a single process, skipping "
+        "the steps whose inputs did not change since they last ran."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true', help='Run all the steps, even if their inputs did not change.'
+        )
+
+    def load_state(self):
+        try:
+            with open(settings.STARTUP_STATE_FILE, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self):
+        tmp_path = f'{settings.STARTUP_STATE_FILE}.tmp'
+        try:
+            with open(tmp_path, 'w') as file:
+                json.dump(self.state, file, indent=2, sort_keys=True)
+            os.replace(tmp_path, settings.STARTUP_STATE_FILE)
+        except OSError as e:
+            logger.warning(f'Could not save the startup state: {e}')
+
+    def get_schema_inputs_hash(self):
+        """
+        Hash of everything the API schema is generated from: the source of the project apps
+        (serializers, views, models and URL confs) and settings, and the schema generator version.
+        """
+        source_dirs = {
+            Path(settings.BASE_DIR) / module.split('.')[0] for module in settings.LOCAL_APPS + [settings.ROOT_URLCONF]
+        }
+        source_files = [
+            path for source_dir in source_dirs for path in source_dir.rglob('*.py')
+            if not ({'migrations', 'tests'} & set(path.relative_to(source_dir).parts) or path.name == 'tests.py')
+        ]
+        digest = hashlib.sha256(hash_files(source_files, settings.BASE_DIR).encode())
+        digest.update(settings.DEFAULT_API_VERSION.encode())
+        for package in ['drf-spectacular', 'djangorestframework', 'Django']:
+            digest.update(version(package).encode())
+        return digest.hexdigest()
+
+    def get_static_files(self):
+        static_files = {}
+        for finder in get_finders():
+            for path, storage in finder.list(['CVS', '.*', '*~']):
+                # the first one found is the one collected
+                static_files.setdefault(path, storage.path(path))
+        return static_files
+
+    def get_static_inputs_hash(self):
+        static_files = self.get_static_files()
+        digest = hashlib.sha256()
+        for path in sorted(static_files):
+            digest.update(path.encode())
+            digest.update(hash_file(static_files[path]).encode())
+        return digest.hexdigest()
+
+    def call_command(self, name, *args, **options):
+        return call_command(name, *args, stdout=self.stdout, stderr=self.stderr, **options)
+
+    def run_cached_step(self, name, get_inputs_hash, run, get_output_hash=lambda: None):
+        """
+        Runs the `run` step, unless its inputs and output are the same as when it last ran.
+        """
+        inputs_hash = get_inputs_hash()
+        step_state = {'inputs': inputs_hash, 'output': get_output_hash()}
+        if not self.force and self.state.get(name) == step_state:
+            return False
+        run()
+        self.state[name] = {'inputs': inputs_hash, 'output': get_output_hash()}
+        self.save_state()
+        return True
+
+    def generate_schema(self):
+        return self.run_cached_step(
+            'schema',
+            self.get_schema_inputs_hash,
+            lambda: self.call_command('spectacular', '--validate', '--color', '--file', str(settings.API_SCHEMA_FILE_PATH)),
+            lambda: hash_file(settings.API_SCHEMA_FILE_PATH),
+        )
+
+    def collect_static(self):
+        return self.run_cached_step(
+            'collectstatic',
+            self.get_static_inputs_hash,
+            lambda: self.call_command('collectstatic', '--noinput', verbosity=0),
+            # every file was collected (STATIC_ROOT itself is in the repository, with a .gitkeep)
+            lambda: all(
+                os.path.exists(os.path.join(settings.STATIC_ROOT, path)) for path in self.get_static_files()
+            ) or None,
+        )
+
+    def handle(self, *args, **options):
+        self.force = options['force']
+        self.state = self.load_state()
+        steps = [
+            ('schema', self.generate_schema),
+            ('service registration', lambda: self.call_command('service_registration')),
+            ('collectstatic', self.collect_static),
+            ('initial setup', lambda: self.call_command('initial_setup', '--skip-collectstatic')),
+        ]
+
+        timings = []
+        for name, step in steps:
+            self.stdout.write(f'Running {name}...')
+            start = time.perf_counter()
+            ran = step()
+            timings.append((name, time.perf_counter() - start, ran is not False))
+
+        self.stdout.write('Startup time breakdown:')
+        for name, elapsed, ran in timings:
+            self.stdout.write(f'  {name:<22} {elapsed * 1000:9.1f} ms{"" if ran else " (skipped, unchanged)"}')
+        self.stdout.write(self.style.SUCCESS(f'  {"total":<22} {sum(t[1] for t in timings) * 1000:9.1f} ms'))
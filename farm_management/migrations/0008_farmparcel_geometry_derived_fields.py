@@ -0,0 +1,87 @@
+# Generated by Django 5.1.2 on 2026-10-16 22:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farm_management', '0007_alter_farmparcel_geo_id_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='farmparcel',
+            name='bbox_max_x',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Bounding Box Max X'),
+        ),
+        migrations.AddField(
+            model_name='farmparcel',
+            name='bbox_max_y',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Bounding Box Max Y'),
+        ),
+        migrations.AddField(
+            model_name='farmparcel',
+            name='bbox_min_x',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Bounding Box Min X'),
+        ),
+        migrations.AddField(
+            model_name='farmparcel',
+            name='bbox_min_y',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Bounding Box Min Y'),
+        ),
+        migrations.AddField(
+            model_name='farmparcel',
+            name='centroid_x',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Centroid X'),
+        ),
+        migrations.AddField(
+            model_name='farmparcel',
+            name='centroid_y',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Centroid Y'),
+        ),
+        migrations.AddField(
+            model_name='farmparcel',
+            name='geometry_wkb',
+            field=models.BinaryField(blank=True, null=True, verbose_name='Geometry (WKB EPSG:4326)'),
+        ),
+        migrations.AddField(
+            model_name='historicalfarmparcel',
+            name='bbox_max_x',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Bounding Box Max X'),
+        ),
+        migrations.AddField(
+            model_name='historicalfarmparcel',
+            name='bbox_max_y',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Bounding Box Max Y'),
+        ),
+        migrations.AddField(
+            model_name='historicalfarmparcel',
+            name='bbox_min_x',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Bounding Box Min X'),
+        ),
+        migrations.AddField(
+            model_name='historicalfarmparcel',
+            name='bbox_min_y',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Bounding Box Min Y'),
+        ),
+        migrations.AddField(
+            model_name='historicalfarmparcel',
+            name='centroid_x',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Centroid X'),
+        ),
+        migrations.AddField(
+            model_name='historicalfarmparcel',
+            name='centroid_y',
+            field=models.FloatField(blank=True, editable=False, null=True, verbose_name='Centroid Y'),
+        ),
+        migrations.AddField(
+            model_name='historicalfarmparcel',
+            name='geometry_wkb',
+            field=models.BinaryField(blank=True, null=True, verbose_name='Geometry (WKB EPSG:4326)'),
+        ),
+        migrations.AddIndex(
+            model_name='farmparcel',
+            index=models.Index(fields=['bbox_min_x', 'bbox_max_x', 'bbox_min_y', 'bbox_max_y'], name='farmparcel_bbox_idx'),
+        ),
+    ]
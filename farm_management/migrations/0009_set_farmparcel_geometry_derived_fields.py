@@ -0,0 +1,36 @@
+import shapely
+from django.db import migrations
+
+
+GEOMETRY_DERIVED_FIELDS = [
+    'geometry_wkb',
+    'bbox_min_x', 'bbox_min_y', 'bbox_max_x', 'bbox_max_y',
+    'centroid_x', 'centroid_y',
+]
+
+
+def operation(apps, schema_editor):
+    FarmParcel = apps.get_model('farm_management', 'FarmParcel')
+
+    parcels = []
+    for parcel in FarmParcel.objects.exclude(geometry__isnull=True).exclude(geometry='').only('id', 'geometry'):
+        geometry = shapely.from_wkt(parcel.geometry, on_invalid='ignore')
+        if geometry is None or geometry.is_empty:
+            continue
+        parcel.geometry_wkb = shapely.to_wkb(geometry)
+        parcel.bbox_min_x, parcel.bbox_min_y, parcel.bbox_max_x, parcel.bbox_max_y = geometry.bounds
+        parcel.centroid_x, parcel.centroid_y = geometry.centroid.x, geometry.centroid.y
+        parcels.append(parcel)
+
+    FarmParcel.objects.bulk_update(parcels, GEOMETRY_DERIVED_FIELDS, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farm_management', '0008_farmparcel_geometry_derived_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(operation, migrations.RunPython.noop),
+    ]
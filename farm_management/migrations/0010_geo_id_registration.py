@@ -0,0 +1,46 @@
+# Generated by Django 5.1.2 on 2026-10-16 22:55
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('farm_management', '0009_set_farmparcel_geometry_derived_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='farmparcel',
+            name='geo_id_status',
+            field=models.CharField(blank=True, choices=[('local', 'Local'), ('pending', 'Pending Registration'), ('registered', 'Registered'), ('failed', 'Registration Failed')], editable=False, max_length=20, null=True, verbose_name='Geographic Data ID Status'),
+        ),
+        migrations.AddField(
+            model_name='historicalfarmparcel',
+            name='geo_id_status',
+            field=models.CharField(blank=True, choices=[('local', 'Local'), ('pending', 'Pending Registration'), ('registered', 'Registered'), ('failed', 'Registration Failed')], editable=False, max_length=20, null=True, verbose_name='Geographic Data ID Status'),
+        ),
+        migrations.CreateModel(
+            name='GeoIdRegistrationTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.UUIDField()),
+                ('geometry', models.TextField(verbose_name='Geometry (WKT EPSG:4326)')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Geo ID Registration Task',
+                'verbose_name_plural': 'Geo ID Registration Tasks',
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='geoid_task_due_idx'), models.Index(fields=['content_type', 'object_id'], name='geoid_task_object_idx')],
+            },
+        ),
+    ]
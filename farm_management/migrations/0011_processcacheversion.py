@@ -0,0 +1,25 @@
+# Generated by Django 5.1.2 on 2026-10-16 23:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farm_management', '0010_geo_id_registration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessCacheVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100, unique=True)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Process Cache Version',
+                'verbose_name_plural': 'Process Cache Versions',
+            },
+        ),
+    ]
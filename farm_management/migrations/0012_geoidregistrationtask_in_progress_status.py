@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-16 23:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('farm_management', '0011_processcacheversion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='geoidregistrationtask',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+    ]
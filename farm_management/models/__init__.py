@@ -1,3 +1,5 @@
 from .farm_parcels import *
 from .farm_assets import *
-from .farm_materials import *
\ No newline at end of file
+from .farm_materials import *
+from .asset_registry import *
+from .process_cache import *
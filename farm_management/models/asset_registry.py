@@ -0,0 +1,57 @@
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class GeoIdRegistrationTask(models.Model):
+    """
+    A pending (or finished) registration of the geometry of some location model
+    in the AgStack asset registry. These are processed in the background by the
+    `agstack_registration_worker` command, which then sets the object geo id.
+    """
+    class TaskStatus(models.TextChoices):
+        PENDING = 'pending', _('Pending')
+        # claimed by a worker until `next_attempt_at`, then it can be claimed again
+        IN_PROGRESS = 'in_progress', _('In Progress')
+        DONE = 'done', _('Done')
+        FAILED = 'failed', _('Failed')
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.UUIDField()
+    content_object = GenericForeignKey('content_type', 'object_id')
+
+    # the geometry (WKT) at the time of the request, the object may have been changed since
+    geometry = models.TextField(_('Geometry (WKT EPSG:4326)'))
+
+    status = models.CharField(max_length=20, choices=TaskStatus.choices, default=TaskStatus.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Created At')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Updated At')
+
+    class Meta:
+        verbose_name = "Geo ID Registration Task"
+        verbose_name_plural = "Geo ID Registration Tasks"
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='geoid_task_due_idx'),
+            models.Index(fields=['content_type', 'object_id'], name='geoid_task_object_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type.model} {self.object_id} ({self.status})"
+
+    @classmethod
+    def enqueue(cls, obj):
+        """
+        Adds a task for registering the current geometry of `obj`,
+        replacing any pending task for an older geometry of it.
+        """
+        content_type = ContentType.objects.get_for_model(obj)
+        cls.objects.filter(
+            content_type=content_type, object_id=obj.pk, status=cls.TaskStatus.PENDING
+        ).delete()
+        return cls.objects.create(content_type=content_type, object_id=obj.pk, geometry=obj.geometry)
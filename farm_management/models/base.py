@@ -1,14 +1,13 @@
 import uuid
 
+import shapely
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from simple_history.models import HistoricalRecords
 
-
-
-from farm_management.asset_registry.agstack import AgstackClient
+from .asset_registry import GeoIdRegistrationTask
 
 
 class BaseModel(models.Model):
@@ -44,31 +43,96 @@ class LocationBaseModel(models.Model):
     geometry = models.TextField(_('Geometry (WKT EPSG:4326)'), blank=True, null=True)
     geo_id = models.CharField(_('Geographic Data ID'), unique=True, blank=True, null=True)
 
+    class GeoIdStatus(models.TextChoices):
+        LOCAL = 'local', _('Local')
+        PENDING = 'pending', _('Pending Registration')
+        REGISTERED = 'registered', _('Registered')
+        FAILED = 'failed', _('Registration Failed')
+
+    geo_id_status = models.CharField(
+        _('Geographic Data ID Status'), max_length=20, choices=GeoIdStatus.choices,
+        blank=True, null=True, editable=False
+    )
+
+    # derived from the geometry on save, so that it does not need to be parsed again for
+    # spatial operations, and so that rows can be pre-filtered by location (subclasses
+    # should add an index on the bounding box fields to their Meta)
+    geometry_wkb = models.BinaryField(_('Geometry (WKB EPSG:4326)'), blank=True, null=True, editable=False)
+    bbox_min_x = models.FloatField(_('Bounding Box Min X'), blank=True, null=True, editable=False)
+    bbox_min_y = models.FloatField(_('Bounding Box Min Y'), blank=True, null=True, editable=False)
+    bbox_max_x = models.FloatField(_('Bounding Box Max X'), blank=True, null=True, editable=False)
+    bbox_max_y = models.FloatField(_('Bounding Box Max Y'), blank=True, null=True, editable=False)
+    centroid_x = models.FloatField(_('Centroid X'), blank=True, null=True, editable=False)
+    centroid_y = models.FloatField(_('Centroid Y'), blank=True, null=True, editable=False)
+
     class Meta:
         abstract = True
 
+    # the geometry when it was loaded or last saved, if known (see `geometry_changed`)
+    _saved_geometry = models.DEFERRED
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_geometry = instance.__dict__.get('geometry', models.DEFERRED)
+        return instance
+
     def _check_geometry_is_new(self, geometry):
         if self.pk is None:
             return True
 
-        query = self.__class__.objects.filter(pk=self.pk).values('geometry')
-        if not query.exists():
-            return True
-        prev_geometry = query.get()['geometry']
-        return prev_geometry != geometry
+        prev_geometries = self.__class__.objects.filter(pk=self.pk).values_list('geometry', flat=True)
+        for prev_geometry in prev_geometries:
+            return prev_geometry != geometry
+        return True
+
+    def _set_geometry_derived_fields(self):
+        geometry = None
+        if self.geometry:
+            geometry = shapely.from_wkt(self.geometry, on_invalid='ignore')
+        if geometry is None or geometry.is_empty:
+            self.geometry_wkb = None
+            self.bbox_min_x = self.bbox_min_y = self.bbox_max_x = self.bbox_max_y = None
+            self.centroid_x = self.centroid_y = None
+            return
+
+        self.geometry_wkb = shapely.to_wkb(geometry)
+        self.bbox_min_x, self.bbox_min_y, self.bbox_max_x, self.bbox_max_y = geometry.bounds
+        centroid = geometry.centroid
+        self.centroid_x, self.centroid_y = centroid.x, centroid.y
 
     def save(self, *args, **kwargs):
+        self._set_geometry_derived_fields()
+        # whether this save changes the geometry (unknown if it was not loaded), e.g. for the post_save signals
+        update_fields = kwargs.get('update_fields')
+        saves_geometry = update_fields is None or 'geometry' in update_fields
+        self.geometry_changed = saves_geometry and (
+            self._saved_geometry is models.DEFERRED or self._saved_geometry != self.geometry
+        )
+        register_geo_id = False
         if self.geometry:
             if settings.AGSTACK_ASSET_REGISTY_API_URL:
                 if self._check_geometry_is_new(self.geometry):
-                    agstack_client = AgstackClient()
-                    self.geo_id = agstack_client.register_field_boundary(self.geometry)
+                    # registered in the background by the agstack_registration_worker command
+                    self.geo_id = None
+                    self.geo_id_status = self.GeoIdStatus.PENDING
+                    register_geo_id = True
             else:
                 # Generate UUID based on the geometry string
                 self.geo_id = uuid.uuid5(uuid.NAMESPACE_DNS, self.geometry)
+                self.geo_id_status = self.GeoIdStatus.LOCAL
         elif not self.geometry:
             self.geo_id = None
-        super().save(*args, **kwargs)
+            self.geo_id_status = None
+
+        if not register_geo_id:
+            super().save(*args, **kwargs)
+        else:
+            with transaction.atomic(using=kwargs.get('using')):
+                super().save(*args, **kwargs)
+                GeoIdRegistrationTask.enqueue(self)
+        if saves_geometry:
+            self._saved_geometry = self.geometry
 
     @property
     def coordinates(self):
@@ -68,6 +68,9 @@ class FarmParcel(BaseModel, LocationBaseModel):
     class Meta:
         verbose_name = "Farm Parcel"
         verbose_name_plural = "Farm Parcels"
+        indexes = [
+            models.Index(fields=['bbox_min_x', 'bbox_max_x', 'bbox_min_y', 'bbox_max_y'], name='farmparcel_bbox_idx'),
+        ]
 
     def __str__(self):
         return f"{self.farm} - {self.identifier} - ({self.parcel_type})"
@@ -0,0 +1,29 @@
+from django.db import models
+from django.db.models import F
+
+
+class ProcessCacheVersion(models.Model):
+    """
+    Version of the data kept by a process-local cache (see `ProcessLocalCache`), shared by
+    every process. It is increased whenever the cached data changes, so that the processes
+    that did not make the change know that their copy is stale.
+    """
+    key = models.CharField(max_length=100, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Process Cache Version"
+        verbose_name_plural = "Process Cache Versions"
+
+    def __str__(self):
+        return f'{self.key} (v{self.version})'
+
+    @classmethod
+    def get_version(cls, key):
+        return cls.objects.filter(key=key).values_list('version', flat=True).first() or 0
+
+    @classmethod
+    def increase(cls, key):
+        _, created = cls.objects.get_or_create(key=key, defaults={'version': 1})
+        if not created:
+            cls.objects.filter(key=key).update(version=F('version') + 1)
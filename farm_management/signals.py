@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from farm_calendar.utils.jwt_utils import verified_token_cache
+
+from .models import FarmParcel
+from .spatial_index import parcel_spatial_index
+
+
+@receiver(post_save, sender=FarmParcel)
+def invalidate_parcel_spatial_index_on_save(sender, instance, created, **kwargs):
+    # the other fields are not indexed (saved without `save`, e.g. by loaddata, it is not known)
+    if created or getattr(instance, 'geometry_changed', True):
+        parcel_spatial_index.invalidate()
+
+
+@receiver(post_delete, sender=FarmParcel)
+def invalidate_parcel_spatial_index(sender, **kwargs):
+    parcel_spatial_index.invalidate()
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def forget_cached_token_user(sender, instance, **kwargs):
+    verified_token_cache.forget_user(instance.pk)
@@ -0,0 +1,59 @@
+import numpy as np
+import shapely
+from django.apps import apps
+
+from farm_calendar.utils.process_cache import ProcessLocalCache
+
+
+class FarmParcelSpatialIndex(ProcessLocalCache):
+    """
+    Process-local STRtree of the (prepared) farm parcel geometries (from their WKB copy), for
+    finding which parcels contain a point without parsing and testing every parcel geometry.
+    It is invalidated whenever a parcel geometry is saved or a parcel is deleted (see signals.py), in every process.
+    Parcels without a geometry, or with an invalid one, are not indexed.
+    """
+    version_model = 'farm_management.ProcessCacheVersion'
+    version_key = 'farm_parcel_spatial_index'
+
+    def load(self):
+        FarmParcel = apps.get_model('farm_management', 'FarmParcel')
+        parcel_ids, geometries_wkb = [], []
+        for parcel_id, geometry_wkb in FarmParcel.objects.filter(geometry_wkb__isnull=False).values_list('id', 'geometry_wkb'):
+            parcel_ids.append(parcel_id)
+            geometries_wkb.append(bytes(geometry_wkb))
+
+        geometries = shapely.from_wkb(np.array(geometries_wkb, dtype=object), on_invalid='ignore')
+        is_indexable = ~(shapely.is_missing(geometries) | shapely.is_empty(geometries))
+        parcel_ids = np.array(parcel_ids, dtype=object)[is_indexable]
+        geometries = geometries[is_indexable]
+        # prepared geometries make the point-in-polygon tests much faster
+        shapely.prepare(geometries)
+        return parcel_ids, geometries, shapely.STRtree(geometries)
+
+    def get_parcel_ids_containing(self, point):
+        parcel_ids, geometries, tree = self.get()
+        # parcels whose bounding box contains the point, then the actual containment test
+        candidates = tree.query(point)
+        is_containing = shapely.contains_xy(geometries[candidates], point.x, point.y)
+        return list(parcel_ids[candidates[is_containing]])
+
+    def get_parcel_ids_containing_points(self, x, y):
+        """
+        Vectorized version of `get_parcel_ids_containing`, for the points with
+        coordinates `x` and `y` (arrays of the same length).
+        Returns a list with the ids of the parcels containing each point, in the same order.
+        """
+        parcel_ids, geometries, tree = self.get()
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        # (point index, parcel index) pairs whose bounding boxes intersect, then the actual containment test
+        point_indexes, parcel_indexes = tree.query(shapely.points(x, y))
+        is_containing = shapely.contains_xy(geometries[parcel_indexes], x[point_indexes], y[point_indexes])
+
+        parcel_ids_by_point = [[] for _ in range(len(x))]
+        for point_index, parcel_id in zip(point_indexes[is_containing], parcel_ids[parcel_indexes[is_containing]]):
+            parcel_ids_by_point[point_index].append(parcel_id)
+        return parcel_ids_by_point
+
+
+parcel_spatial_index = FarmParcelSpatialIndex()
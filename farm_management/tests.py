@@ -1,3 +1,372 @@
-from django.test import TestCase
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+import shapely
+from django.core.management import call_command
+from django.conf import settings
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from .asset_registry.registration import bulk_register_geo_ids, claim_due_task, process_due_tasks
+from .models import Farm, FarmParcel, GeoIdRegistrationTask, ProcessCacheVersion
+from .spatial_index import parcel_spatial_index
+
+
+class LocationBaseModelTests(TestCase):
+
+    def test_save_stores_geometry_derived_fields(self):
+        parcel = FarmParcel.objects.create(
+            identifier='parcel-1', farm=Farm.objects.create(name='Farm'), parcel_type='vineyard',
+            geometry='POLYGON ((0 0, 4 0, 4 2, 0 2, 0 0))',
+        )
+        parcel.refresh_from_db()
+
+        self.assertEqual(
+            (parcel.bbox_min_x, parcel.bbox_min_y, parcel.bbox_max_x, parcel.bbox_max_y), (0, 0, 4, 2)
+        )
+        self.assertEqual((parcel.centroid_x, parcel.centroid_y), (2, 1))
+        self.assertTrue(shapely.from_wkb(bytes(parcel.geometry_wkb)).equals(shapely.from_wkt(parcel.geometry)))
+        self.assertTrue(FarmParcel.objects.filter(bbox_min_x__lte=1, bbox_max_x__gte=1, bbox_min_y__lte=1, bbox_max_y__gte=1).exists())
+
+        parcel.geometry = 'not a wkt'
+        parcel.save()
+        parcel.refresh_from_db()
+
+        self.assertIsNone(parcel.geometry_wkb)
+        self.assertIsNone(parcel.bbox_min_x)
+        self.assertIsNone(parcel.centroid_x)
+
+
+class StubAgstackHandler(BaseHTTPRequestHandler):
+    responses = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        status, data = self.responses.pop(0)
+        self.server.requests.append(body)
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(data).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class FarmParcelSpatialIndexTests(TransactionTestCase):
+
+    def setUp(self):
+        parcel_spatial_index.clear()
+        self.addCleanup(parcel_spatial_index.clear)
+        self.parcel = FarmParcel.objects.create(
+            identifier='parcel-1', farm=Farm.objects.create(name='Farm'), parcel_type='vineyard',
+            geometry='POLYGON ((0 0, 2 0, 2 2, 0 2, 0 0))',
+        )
+
+    def test_index_is_refreshed_when_invalidated_by_another_process(self):
+        self.assertEqual(parcel_spatial_index.get_parcel_ids_containing(shapely.Point(1, 1)), [self.parcel.pk])
+
+        # moved by another process, whose signals do not clear this process index
+        moved_geometry = shapely.from_wkt('POLYGON ((10 10, 12 10, 12 12, 10 12, 10 10))')
+        FarmParcel.objects.filter(pk=self.parcel.pk).update(geometry_wkb=shapely.to_wkb(moved_geometry))
+        self.assertEqual(parcel_spatial_index.get_parcel_ids_containing(shapely.Point(11, 11)), [])
+        ProcessCacheVersion.increase(parcel_spatial_index.version_key)
+        # the version was just checked
+        self.assertEqual(parcel_spatial_index.get_parcel_ids_containing(shapely.Point(1, 1)), [self.parcel.pk])
+
+        with mock.patch.object(parcel_spatial_index, 'version_check_interval', 0):
+            self.assertEqual(parcel_spatial_index.get_parcel_ids_containing(shapely.Point(1, 1)), [])
+            self.assertEqual(parcel_spatial_index.get_parcel_ids_containing(shapely.Point(11, 11)), [self.parcel.pk])
+
+    def test_index_is_only_invalidated_when_the_geometry_changes(self):
+        version = ProcessCacheVersion.get_version(parcel_spatial_index.version_key)
+
+        parcel = FarmParcel.objects.get(pk=self.parcel.pk)
+        parcel.identifier = 'renamed'
+        parcel.save()
+        self.assertEqual(ProcessCacheVersion.get_version(parcel_spatial_index.version_key), version)
+
+        parcel.geometry = 'POLYGON ((10 10, 12 10, 12 12, 10 12, 10 10))'
+        parcel.save()
+        self.assertEqual(ProcessCacheVersion.get_version(parcel_spatial_index.version_key), version + 1)
+        self.assertEqual(parcel_spatial_index.get_parcel_ids_containing(shapely.Point(11, 11)), [parcel.pk])
+
+        parcel.delete()
+        self.assertEqual(ProcessCacheVersion.get_version(parcel_spatial_index.version_key), version + 2)
+
+    def test_warm_index_is_not_queried(self):
+        parcel_spatial_index.get_parcel_ids_containing(shapely.Point(1, 1))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(parcel_spatial_index.get_parcel_ids_containing(shapely.Point(1, 1)), [self.parcel.pk])
+
+
+class GeoIdRegistrationTests(TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubAgstackHandler)
+        self.server.requests = []
+        StubAgstackHandler.responses = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        settings_override = override_settings(
+            AGSTACK_ASSET_REGISTY_API_URL=f'http://127.0.0.1:{self.server.server_port}',
+            AGSTACK_ENDPOINTS={'register_field_boundary': '/register-field-boundary'},
+            AGSTACK_API_KEY='key', AGSTACK_CLIENT_SECRET='secret',
+            AGSTACK_REGISTRATION_MAX_ATTEMPTS=2,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.parcel = FarmParcel.objects.create(
+            identifier='parcel-1', farm=Farm.objects.create(name='Farm'), parcel_type='vineyard',
+            geometry='POLYGON ((0 0, 4 0, 4 2, 0 2, 0 0))',
+        )
+
+    def test_save_does_not_wait_for_registration(self):
+        self.assertEqual(self.server.requests, [])
+        self.parcel.refresh_from_db()
+        self.assertIsNone(self.parcel.geo_id)
+        self.assertEqual(self.parcel.geo_id_status, FarmParcel.GeoIdStatus.PENDING)
+        task = GeoIdRegistrationTask.objects.get()
+        self.assertEqual((task.object_id, task.geometry), (self.parcel.pk, self.parcel.geometry))
+
+    def test_worker_registers_pending_geometries(self):
+        StubAgstackHandler.responses = [(200, {'Geo Id': 'geo-id-1'})]
+
+        call_command('agstack_registration_worker', '--once', stdout=io.StringIO())
+
+        self.assertEqual(self.server.requests, [{'wkt': self.parcel.geometry}])
+        self.parcel.refresh_from_db()
+        self.assertEqual(self.parcel.geo_id, 'geo-id-1')
+        self.assertEqual(self.parcel.geo_id_status, FarmParcel.GeoIdStatus.REGISTERED)
+        self.assertEqual(GeoIdRegistrationTask.objects.get().status, GeoIdRegistrationTask.TaskStatus.DONE)
+
+    def test_changing_geometry_replaces_pending_task(self):
+        self.parcel.geometry = 'POLYGON ((0 0, 5 0, 5 2, 0 2, 0 0))'
+        self.parcel.save()
+
+        task = GeoIdRegistrationTask.objects.get()
+        self.assertEqual(task.geometry, self.parcel.geometry)
+
+    def test_bulk_registration_sends_each_geometry_once(self):
+        other_geometry = 'POLYGON ((0 0, 5 0, 5 2, 0 2, 0 0))'
+        farm = self.parcel.farm
+        parcels = [self.parcel] + [
+            FarmParcel.objects.create(identifier=f'parcel-{i}', farm=farm, parcel_type='vineyard', geometry=geometry)
+            for i, geometry in enumerate([other_geometry, self.parcel.geometry], start=2)
+        ]
+        StubAgstackHandler.responses = [(200, {'Geo Id': 'geo-id-a'}), (200, {'Geo Id': 'geo-id-b'})]
+
+        out = io.StringIO()
+        call_command('agstack_bulk_registration', '--workers', '2', stdout=out, stderr=io.StringIO())
+
+        self.assertEqual(
+            sorted(request['wkt'] for request in self.server.requests), sorted([self.parcel.geometry, other_geometry])
+        )
+        for parcel in parcels:
+            parcel.refresh_from_db()
+        self.assertEqual({parcel.geo_id for parcel in parcels}, {'geo-id-a', 'geo-id-b', None})
+        # the first and third ones have the same geometry, but geo ids are unique
+        self.assertEqual(
+            sorted([parcels[0].geo_id_status, parcels[2].geo_id_status]),
+            [FarmParcel.GeoIdStatus.FAILED, FarmParcel.GeoIdStatus.REGISTERED]
+        )
+        self.assertFalse(GeoIdRegistrationTask.objects.filter(status=GeoIdRegistrationTask.TaskStatus.PENDING).exists())
+        self.assertIn('Registered 2 of 3 parcels (1 failed)', out.getvalue())
+
+    def test_bulk_registration_fails_objects_with_the_same_geo_id(self):
+        other_parcel = FarmParcel.objects.create(
+            identifier='parcel-2', farm=self.parcel.farm, parcel_type='vineyard',
+            geometry='POLYGON ((0 0, 5 0, 5 2, 0 2, 0 0))',
+        )
+        # for both geometries
+        StubAgstackHandler.responses = [(200, {'Geo Id': 'geo-id-1'}), (200, {'Geo Id': 'geo-id-1'})]
+
+        registered, failed = bulk_register_geo_ids([self.parcel, other_parcel])
+
+        self.assertEqual(registered, [self.parcel])
+        self.assertEqual(list(failed), [other_parcel])
+        self.parcel.refresh_from_db()
+        other_parcel.refresh_from_db()
+        self.assertEqual((self.parcel.geo_id, self.parcel.geo_id_status), ('geo-id-1', FarmParcel.GeoIdStatus.REGISTERED))
+        self.assertEqual((other_parcel.geo_id, other_parcel.geo_id_status), (None, FarmParcel.GeoIdStatus.FAILED))
+
+    def test_bulk_registration_skips_objects_claimed_by_the_worker(self):
+        other_parcel = FarmParcel.objects.create(
+            identifier='parcel-2', farm=self.parcel.farm, parcel_type='vineyard',
+            geometry='POLYGON ((0 0, 5 0, 5 2, 0 2, 0 0))',
+        )
+        # the task of the first parcel, the oldest one
+        claimed_task = claim_due_task()
+        self.assertEqual(claimed_task.object_id, self.parcel.pk)
+        StubAgstackHandler.responses = [(200, {'Geo Id': 'geo-id-2'}), (200, {'Geo Id': 'geo-id-3'})]
+
+        registered, failed = bulk_register_geo_ids([self.parcel, other_parcel])
+
+        self.assertEqual((registered, list(failed)), ([other_parcel], [self.parcel]))
+        self.assertEqual(self.server.requests, [{'wkt': other_parcel.geometry}])
+        claimed_task.refresh_from_db()
+        self.assertEqual(claimed_task.status, GeoIdRegistrationTask.TaskStatus.IN_PROGRESS)
+        self.assertEqual(
+            GeoIdRegistrationTask.objects.exclude(pk=claimed_task.pk).get().status, GeoIdRegistrationTask.TaskStatus.DONE
+        )
+
+    def test_failed_registration_is_retried_with_backoff(self):
+        StubAgstackHandler.responses = [(500, {'detail': 'error'}), (500, {'detail': 'error'})]
+
+        call_command('agstack_registration_worker', '--once', stdout=io.StringIO())
+
+        task = GeoIdRegistrationTask.objects.get()
+        self.assertEqual((task.status, task.attempts), (GeoIdRegistrationTask.TaskStatus.PENDING, 1))
+        self.assertGreater(task.next_attempt_at, task.updated_at)
+        self.parcel.refresh_from_db()
+        self.assertEqual(self.parcel.geo_id_status, FarmParcel.GeoIdStatus.PENDING)
+
+        GeoIdRegistrationTask.objects.update(next_attempt_at=task.created_at)
+        call_command('agstack_registration_worker', '--once', stdout=io.StringIO())
+
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (GeoIdRegistrationTask.TaskStatus.FAILED, 2))
+        self.parcel.refresh_from_db()
+        self.assertEqual(self.parcel.geo_id_status, FarmParcel.GeoIdStatus.FAILED)
+
+
+    def test_used_geo_id_fails_without_retry(self):
+        other_parcel = FarmParcel.objects.create(identifier='parcel-2', farm=self.parcel.farm, parcel_type='vineyard')
+        FarmParcel.objects.filter(pk=other_parcel.pk).update(geo_id='geo-id-1')
+        StubAgstackHandler.responses = [(200, {'Geo Id': 'geo-id-1'})]
+
+        call_command('agstack_registration_worker', '--once', stdout=io.StringIO())
+
+        task = GeoIdRegistrationTask.objects.get()
+        self.assertEqual((task.status, task.attempts), (GeoIdRegistrationTask.TaskStatus.FAILED, 1))
+        self.parcel.refresh_from_db()
+        self.assertEqual((self.parcel.geo_id, self.parcel.geo_id_status), (None, FarmParcel.GeoIdStatus.FAILED))
+
+    def test_claimed_task_is_skipped_until_the_claim_expires(self):
+        StubAgstackHandler.responses = [(200, {'Geo Id': 'geo-id-1'})]
+        task = claim_due_task()
+        self.assertEqual((task.status, task.attempts), (GeoIdRegistrationTask.TaskStatus.IN_PROGRESS, 1))
+
+        self.assertEqual(process_due_tasks(), (0, 0))
+        self.assertEqual(self.server.requests, [])
+
+        # e.g., the worker that claimed it died
+        GeoIdRegistrationTask.objects.update(next_attempt_at=task.created_at)
+        self.assertEqual(process_due_tasks(), (1, 0))
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (GeoIdRegistrationTask.TaskStatus.DONE, 2))
+
+class StubGatekeeperHandler(BaseHTTPRequestHandler):
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.path == '/api/login/':
+            data = {'access': 'token'}
+        else:
+            self.server.registered.append(json.loads(body)['endpoint'])
+            data = {}
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(json.dumps(data).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+class ServiceRegistrationTests(TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubGatekeeperHandler)
+        self.server.registered = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        state_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(state_dir.cleanup)
+        self.state_file = os.path.join(state_dir.name, 'state.json')
+        gatekeeper_url = f'http://127.0.0.1:{self.server.server_port}'
+        settings_override = override_settings(
+            GATEKEEPER_API_LOGIN_URL=f'{gatekeeper_url}/api/login/',
+            GATEKEEPER_ENDPOINT_REG_URL=f'{gatekeeper_url}/api/register_service/',
+            GATEKEEPER_REGISTRATION_STATE_FILE=self.state_file,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_unchanged_endpoints_are_not_registered_again(self):
+        call_command('service_registration')
+
+        with open(settings.API_SCHEMA_FILE_PATH) as file:
+            endpoints_count = file.read().count('\n  /api/')
+        self.assertEqual(len(self.server.registered), endpoints_count)
+        self.assertEqual(len(set(self.server.registered)), endpoints_count)
+
+        self.server.registered.clear()
+        call_command('service_registration')
+        self.assertEqual(self.server.registered, [])
+
+        with open(self.state_file) as file:
+            state = json.load(file)
+        changed_endpoint = next(iter(state['endpoints']))
+        state['endpoints'][changed_endpoint] = 'outdated'
+        with open(self.state_file, 'w') as file:
+            json.dump(state, file)
+        call_command('service_registration')
+        self.assertEqual(self.server.registered, [changed_endpoint])
+
+
+class StartupCommandTests(TestCase):
+
+    def setUp(self):
+        output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(output_dir.cleanup)
+        self.schema_path = os.path.join(output_dir.name, 'schema.yml')
+        settings_override = override_settings(
+            API_SCHEMA_FILE_PATH=self.schema_path,
+            STATIC_ROOT=os.path.join(output_dir.name, 'static_root'),
+            STARTUP_STATE_FILE=os.path.join(output_dir.name, 'startup_state.json'),
+            GATEKEEPER_ENDPOINT_REG_URL=None,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def call_startup(self):
+        out = io.StringIO()
+        # the schema generation warnings
+        with contextlib.redirect_stderr(io.StringIO()):
+            call_command('startup', stdout=out, stderr=io.StringIO())
+        return out.getvalue()
+
+    def test_unchanged_steps_are_skipped(self):
+        out = self.call_startup()
+        self.assertNotIn('skipped', out)
+        self.assertTrue(os.path.exists(self.schema_path))
+        self.assertTrue(os.path.isdir(settings.STATIC_ROOT))
+
+        out = self.call_startup()
+        self.assertRegex(out, r'schema .* \(skipped, unchanged\)')
+        self.assertRegex(out, r'collectstatic .* \(skipped, unchanged\)')
+
+        # the collected files were removed, while keeping the directory
+        shutil.rmtree(os.path.join(settings.STATIC_ROOT, 'admin'))
+        out = self.call_startup()
+        self.assertNotRegex(out, r'collectstatic .* \(skipped, unchanged\)')
+        self.assertTrue(os.path.isdir(os.path.join(settings.STATIC_ROOT, 'admin')))
+
+        # the output was changed, so it is generated again
+        with open(self.schema_path, 'a') as file:
+            file.write('\n')
+        out = self.call_startup()
+        self.assertNotRegex(out, r'schema .* \(skipped, unchanged\)')
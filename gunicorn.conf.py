@@ -0,0 +1,40 @@
+# Gunicorn settings, used by entrypoint.sh when APP_SERVER=gunicorn (the default).
+# Preforked worker processes share the listening socket, so CPU-bound work (e.g., JSON-LD
+# serialization, geometries parsing) runs in parallel instead of being serialized by the GIL.
+# Send SIGHUP to the master process to gracefully reload the workers.
+import multiprocessing
+import os
+
+bind = f"{os.getenv('APP_HOST', '0.0.0.0')}:{os.getenv('APP_PORT', '8002')}"
+wsgi_app = 'farm_calendar.wsgi:application'
+
+threads = int(os.getenv('APP_THREADS', '4'))
+
+# each worker thread keeps its own database connection open (see POSTGRES_CONN_MAX_AGE), or each worker
+# uses a pool of up to POSTGRES_POOL_MAX_SIZE connections (with POSTGRES_POOL), which should all fit within
+# APP_DB_MAX_CONNECTIONS (by default 80, below the max_connections=100 of PostgreSQL, leaving some
+# for the registration worker and the management commands)
+db_max_connections = int(os.getenv('APP_DB_MAX_CONNECTIONS', '80'))
+if os.getenv('POSTGRES_POOL', '').lower() in ('true', 'yes', 'on', '1'):
+    db_connections_per_worker = int(os.getenv('POSTGRES_POOL_MAX_SIZE', '4'))
+else:
+    db_connections_per_worker = threads
+
+# defaults to one worker per core (+1 for the ones waiting on I/O), as long as their connections fit
+workers = int(
+    os.getenv('APP_WORKERS')
+    or max(min(multiprocessing.cpu_count() + 1, db_max_connections // db_connections_per_worker), 1)
+)
+worker_class = 'gthread'
+
+# recycle the workers after some requests (with some jitter, so they are not all restarted at once)
+max_requests = int(os.getenv('APP_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('APP_MAX_REQUESTS_JITTER', '100'))
+
+timeout = int(os.getenv('APP_TIMEOUT', '60'))
+graceful_timeout = int(os.getenv('APP_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('APP_KEEPALIVE', '5'))
+
+loglevel = os.getenv('LOGGING_LEVEL', 'DEBUG').lower()
+errorlog = 'logs/gunicorn.log'
+accesslog = os.getenv('APP_ACCESS_LOG') or None
@@ -8,6 +8,7 @@ from farm_calendar.wsgi import application
 
 host = os.getenv('APP_HOST', '0.0.0.0')
 port = int(os.getenv('APP_PORT', '8002'))
+threads = int(os.getenv('APP_THREADS', '4'))
 LOGGING_LEVEL = os.getenv('LOGGING_LEVEL', 'DEBUG')
 
 
@@ -15,4 +16,4 @@ logging.basicConfig(filename='logs/waitress.log', level=getattr(logging, LOGGING
 
 warnings.filterwarnings("ignore")
 
-serve(application, host=host, port=port)
+serve(application, host=host, port=port, threads=threads)